@@ -3,61 +3,109 @@ import logging
 import time
 import uuid
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from infra.request_context import request_id_ctx_var
 
 logger = logging.getLogger("api.middleware")
 
 
-class TraceIdMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        request_id = request.headers.get("X-Request-ID", str(uuid.uuid4()))
+def _header(scope: Scope, name: bytes) -> str | None:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
 
-        # Set ContextVar and Request State
-        token = request_id_ctx_var.set(request_id)
-        request.state.request_id = request_id
 
-        try:
-            response = await call_next(request)
-            response.headers["X-Request-ID"] = request_id
-            return response
-        finally:
-            request_id_ctx_var.reset(token)
+class RequestContextMiddleware:
+    """Pure ASGI middleware: request ID propagation and request logging in one pass.
+
+    Unlike `BaseHTTPMiddleware`, this runs in the request's own task and wraps
+    `send` directly, so there is no extra task or response-stream plumbing.
+    """
+
+    trace_id = True
+    log_requests = True
+
+    def __init__(self, app: ASGIApp, slow_request_ms: float = 1000.0):
+        self.app = app
+        # Successful requests faster than this are tagged for log sampling;
+        # errors and slow requests are always logged.
+        self.slow_request_ms = slow_request_ms
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = None
+        request_id = request_id_ctx_var.get()
+        if self.trace_id:
+            request_id = _header(scope, b"x-request-id") or str(uuid.uuid4())
+            # Set ContextVar and Request State
+            token = request_id_ctx_var.set(request_id)
+            scope.setdefault("state", {})["request_id"] = request_id
 
+        start_time = time.perf_counter()
+        status_code = None
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        start_time = time.time()
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.trace_id:
+                    MutableHeaders(scope=message)["X-Request-ID"] = request_id
+            await send(message)
 
         try:
-            response = await call_next(request)
-            process_time = (time.time() - start_time) * 1000
-
-            log_data = {
-                "message": "Request processed",
-                "path": request.url.path,
-                "method": request.method,
-                "status_code": response.status_code,
-                "duration_ms": round(process_time, 2),
-                # request_id is now automatically added by the formatter via ContextVar
-                # we can keep it here for redundancy or remove it.
-                # Let's keep it in the message object for direct readability in this specific log.
-                "request_id": request_id_ctx_var.get(),
-            }
-            logger.info(json.dumps(log_data))
-
-            return response
+            await self.app(scope, receive, send_wrapper)
         except Exception as e:
-            process_time = (time.time() - start_time) * 1000
-            log_data = {
-                "message": "Request failed",
-                "path": request.url.path,
-                "method": request.method,
-                "duration_ms": round(process_time, 2),
-                "request_id": request_id_ctx_var.get(),
-                "error": str(e),
-            }
-            logger.error(json.dumps(log_data))
-            raise e
+            if self.log_requests:
+                process_time = (time.perf_counter() - start_time) * 1000
+                log_data = {
+                    "message": "Request failed",
+                    "path": scope["path"],
+                    "method": scope["method"],
+                    "duration_ms": round(process_time, 2),
+                    "request_id": request_id_ctx_var.get(),
+                    "error": str(e),
+                }
+                logger.error(json.dumps(log_data))
+            raise
+        else:
+            if self.log_requests:
+                process_time = (time.perf_counter() - start_time) * 1000
+                log_data = {
+                    "message": "Request processed",
+                    "path": scope["path"],
+                    "method": scope["method"],
+                    "status_code": status_code,
+                    "duration_ms": round(process_time, 2),
+                    # request_id is also added by the formatter via ContextVar; kept
+                    # here for direct readability of this specific log line.
+                    "request_id": request_id_ctx_var.get(),
+                }
+                sampled = (
+                    status_code is not None
+                    and status_code < 500
+                    and process_time < self.slow_request_ms
+                )
+                logger.info(
+                    json.dumps(log_data), extra={"sample_key": "request"} if sampled else None
+                )
+        finally:
+            if token is not None:
+                request_id_ctx_var.reset(token)
+
+
+class TraceIdMiddleware(RequestContextMiddleware):
+    """Request ID propagation only (`X-Request-ID` header and ContextVar)."""
+
+    log_requests = False
+
+
+class RequestLoggingMiddleware(RequestContextMiddleware):
+    """Request logging only; relies on an outer `TraceIdMiddleware` for the ID."""
+
+    trace_id = False
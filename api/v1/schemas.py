@@ -1,9 +1,26 @@
-from pydantic import BaseModel
+from typing import Annotated
+
+from pydantic import BaseModel, Field, model_serializer
+
+# Upper bound for the `hours` query parameter; responses are also capped by the
+# horizon the provider fetches (FORECAST_HOURS).
+MAX_FORECAST_HOURS = 384
+DEFAULT_FORECAST_HOURS = 5
+DEFAULT_FORECAST_VARIABLES = ("temperature",)
 
 
 class ForecastItem(BaseModel):
+    """One forecast hour; only the variables the client asked for are serialized."""
+
     time: str
-    temperature: float
+    temperature: float | None = None
+    humidity: float | None = None
+    precipitation: float | None = None
+    wind_speed: float | None = None
+
+    @model_serializer(mode="wrap")
+    def _requested_only(self, handler):
+        return {key: value for key, value in handler(self).items() if key in self.model_fields_set}
 
 
 class WeatherResponse(BaseModel):
@@ -11,3 +28,24 @@ class WeatherResponse(BaseModel):
     current_temperature: float
     current_humidity: float
     hourly_forecast: list[ForecastItem]
+
+
+MAX_BATCH_CITIES = 100
+
+
+class BatchWeatherRequest(BaseModel):
+    cities: list[Annotated[str, Field(min_length=1)]] = Field(
+        ..., min_length=1, max_length=MAX_BATCH_CITIES
+    )
+
+
+class BatchWeatherItem(BaseModel):
+    city: str
+    status: int
+    data: WeatherResponse | None = None
+    error: str | None = None
+    degraded: bool = False
+
+
+class BatchWeatherResponse(BaseModel):
+    results: list[BatchWeatherItem]
@@ -0,0 +1,134 @@
+"""Local stand-in for the Open-Meteo geocoding and forecast APIs.
+
+Serves `/v1/search` and `/v1/forecast` with the same response shapes the
+provider parses, plus configurable latency, error rate and rate limiting.
+Used in-process by `benchmarks/load.py`; it can also be run on its own:
+
+    uv run uvicorn benchmarks.fake_open_meteo:app --port 8081
+"""
+
+import asyncio
+import random
+import time
+from collections import Counter
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+
+def city_name(index: int) -> str:
+    return f"City{index:05d}"
+
+
+class FakeOpenMeteo:
+    """ASGI app emulating Open-Meteo; known cities are `City00000`..`City{n-1}`."""
+
+    def __init__(
+        self,
+        cities: int = 1000,
+        latency: float = 0.05,
+        jitter: float = 0.01,
+        error_rate: float = 0.0,
+        rate_limit: float = 0.0,
+        seed: int | None = None,
+    ):
+        self.cities = cities
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        # Requests per second across both endpoints; 0 disables limiting.
+        self.rate_limit = rate_limit
+        self.random = random.Random(seed)
+        self.calls: Counter[str] = Counter()
+        self._tokens = rate_limit
+        self._refilled_at = time.monotonic()
+        self.app = Starlette(
+            routes=[
+                Route("/v1/search", self.search),
+                Route("/v1/forecast", self.forecast),
+            ]
+        )
+
+    async def __call__(self, scope, receive, send):
+        await self.app(scope, receive, send)
+
+    def _allow(self) -> bool:
+        if self.rate_limit <= 0:
+            return True
+        now = time.monotonic()
+        self._tokens = min(
+            self.rate_limit, self._tokens + (now - self._refilled_at) * self.rate_limit
+        )
+        self._refilled_at = now
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+    async def _simulate(self, endpoint: str) -> JSONResponse | None:
+        """Apply rate limiting, latency and random failures; returns an error response or None."""
+        self.calls[endpoint] += 1
+        if not self._allow():
+            self.calls["rate_limited"] += 1
+            return JSONResponse({"error": True, "reason": "Too many requests"}, status_code=429)
+        await asyncio.sleep(max(0.0, self.random.gauss(self.latency, self.jitter)))
+        if self.random.random() < self.error_rate:
+            self.calls["errors"] += 1
+            return JSONResponse({"error": True, "reason": "Simulated failure"}, status_code=500)
+        return None
+
+    def _index(self, name: str) -> int | None:
+        if not name.lower().startswith("city"):
+            return None
+        try:
+            index = int(name[4:])
+        except ValueError:
+            return None
+        return index if 0 <= index < self.cities else None
+
+    async def search(self, request: Request) -> JSONResponse:
+        if (error := await self._simulate("geocoding")) is not None:
+            return error
+        index = self._index(request.query_params.get("name", ""))
+        if index is None:
+            return JSONResponse({"generationtime_ms": 0.1})
+        return JSONResponse(
+            {
+                "results": [
+                    {
+                        "name": city_name(index),
+                        "latitude": round(-60 + (index * 7.31) % 120, 4),
+                        "longitude": round(-180 + (index * 13.7) % 360, 4),
+                        "timezone": "UTC",
+                    }
+                ]
+            }
+        )
+
+    async def forecast(self, request: Request) -> JSONResponse:
+        if (error := await self._simulate("forecast")) is not None:
+            return error
+        latitudes = request.query_params.get("latitude", "").split(",")
+        hours = int(request.query_params.get("forecast_hours", "24"))
+        variables = request.query_params.getlist("hourly")
+        items = [self._forecast_item(float(latitude), hours, variables) for latitude in latitudes]
+        return JSONResponse(items if len(items) > 1 else items[0])
+
+    @staticmethod
+    def _forecast_item(latitude: float, hours: int, variables: list[str]) -> dict:
+        base = round(30 - abs(latitude) / 3, 1)
+        hourly = {
+            "time": [f"2026-01-{9 + hour // 24:02d}T{hour % 24:02d}:00" for hour in range(hours)]
+        }
+        for variable in variables or ["temperature_2m"]:
+            hourly[variable] = [round(base + (hour % 12) * 0.2, 1) for hour in range(hours)]
+        return {
+            "latitude": latitude,
+            "current": {"temperature_2m": base, "relative_humidity_2m": 60},
+            "hourly": hourly,
+        }
+
+
+app = FakeOpenMeteo()
@@ -0,0 +1,243 @@
+"""End-to-end load test of /weather against a local Open-Meteo stand-in.
+
+The real app (middleware, service, coalescing, provider) runs in-process via
+httpx's ASGI transport. Upstream calls go to `FakeOpenMeteo`, the cache is an
+in-memory `CachePort` (or Redis with `--redis-url`), and city popularity
+follows a Zipf distribution. Results are printed and saved as JSON; pass an
+earlier result file to `--compare` to see the change.
+
+Usage:
+    uv run python benchmarks/load.py [--requests 20000] [--concurrency 100]
+        [--cities 1000] [--zipf 1.1] [--latency-ms 50] [--error-rate 0.01]
+        [--rate-limit 0] [--redis-url redis://localhost:6379/0]
+        [--output benchmarks/results/run.json] [--compare baseline.json]
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import random
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from datetime import UTC, datetime
+from pathlib import Path
+
+import httpx
+
+# Add project root to sys.path to allow imports from core/infra/api
+sys.path.append(str(Path(__file__).parent.parent))
+
+import main
+from benchmarks.fake_open_meteo import FakeOpenMeteo, city_name
+from core.domain.models import WeatherEntity
+from core.domain.ports import CachePort
+from core.services import WeatherService
+from infra.cache import RedisCacheAdapter
+from infra.coalescing import SingleFlight
+from infra.geocode_cache import LRUGeocodeCache
+from infra.open_meteo import OpenMeteoProvider
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+class InMemoryCache(CachePort):
+    """Dict-backed cache with a TTL, standing in for Redis."""
+
+    def __init__(self, ttl: float = 3600):
+        self.ttl = ttl
+        self._entries: dict[str, tuple[float, WeatherEntity]] = {}
+
+    async def get_weather(self, city_name: str) -> WeatherEntity | None:
+        entry = self._entries.get(city_name.lower())
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        return entry[1]
+
+    async def set_weather(self, city_name: str, weather: WeatherEntity):
+        self._entries[city_name.lower()] = (time.monotonic() + self.ttl, weather)
+
+    async def delete_many(self, city_names: list[str]):
+        for name in city_names:
+            self._entries.pop(name.lower(), None)
+
+
+class CountingCache(CachePort):
+    """Counts hits and misses of the wrapped cache."""
+
+    def __init__(self, backend: CachePort):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+
+    async def get_weather(self, city_name: str) -> WeatherEntity | None:
+        weather = await self.backend.get_weather(city_name)
+        if weather is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return weather
+
+    async def set_weather(self, city_name: str, weather: WeatherEntity):
+        await self.backend.set_weather(city_name, weather)
+
+    async def delete_many(self, city_names: list[str]):
+        await self.backend.delete_many(city_names)
+
+
+def zipf_cities(count: int, exponent: float, requests: int, rng: random.Random) -> list[str]:
+    """City names drawn with popularity proportional to 1 / rank**exponent."""
+    weights = list(itertools.accumulate(1 / rank**exponent for rank in range(1, count + 1)))
+    return [city_name(i) for i in rng.choices(range(count), cum_weights=weights, k=requests)]
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args) -> dict:
+    rng = random.Random(args.seed)
+    upstream = FakeOpenMeteo(
+        cities=args.cities,
+        latency=args.latency_ms / 1000,
+        jitter=args.latency_ms / 5000,
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit,
+        seed=args.seed,
+    )
+    provider = OpenMeteoProvider(
+        client=httpx.AsyncClient(transport=httpx.ASGITransport(app=upstream)),
+        geocode_cache=LRUGeocodeCache(),
+    )
+    if args.redis_url:
+        # A fresh prefix per run so earlier runs never produce warm hits.
+        backend = RedisCacheAdapter(args.redis_url, key_prefix=f"bench:{uuid.uuid4().hex[:8]}")
+    else:
+        backend = InMemoryCache()
+    cache = CountingCache(backend)
+    main.service = WeatherService(
+        provider, cache, coalescer=None if args.no_coalescing else SingleFlight()
+    )
+    main.warmer = None
+
+    cities = iter(zipf_cities(args.cities, args.zipf, args.requests, rng))
+    latencies: list[float] = []
+    statuses: dict[int, int] = {}
+
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def worker():
+            for city in cities:
+                start = time.perf_counter()
+                response = await client.get("/weather", params={"city": city})
+                latencies.append(time.perf_counter() - start)
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - start
+
+    await main.service.close()
+    await provider.close()
+    if args.redis_url:
+        await backend.close()
+
+    latencies.sort()
+    lookups = cache.hits + cache.misses
+    upstream_calls = upstream.calls["geocoding"] + upstream.calls["forecast"]
+    return {
+        "commit": git_commit(),
+        "timestamp": datetime.now(UTC).isoformat(timespec="seconds"),
+        "config": {key: value for key, value in vars(args).items() if key not in ("compare",)},
+        "results": {
+            "requests": args.requests,
+            "duration_s": round(elapsed, 3),
+            "throughput_rps": round(args.requests / elapsed, 1),
+            "latency_p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+            "latency_p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+            "latency_mean_ms": round(statistics.fmean(latencies) * 1000, 2),
+            "cache_hit_ratio": round(cache.hits / lookups, 4) if lookups else 0.0,
+            "upstream_calls": upstream_calls,
+            "upstream_calls_per_request": round(upstream_calls / args.requests, 4),
+            "upstream_rate_limited": upstream.calls["rate_limited"],
+            "upstream_errors": upstream.calls["errors"],
+            "status_codes": {str(code): count for code, count in sorted(statuses.items())},
+        },
+    }
+
+
+def report(result: dict, baseline: dict | None):
+    print(
+        f"{'metric':<28} {'value':>12}" + (f" {'baseline':>12} {'change':>8}" if baseline else "")
+    )
+    for key, value in result["results"].items():
+        if isinstance(value, dict):
+            value = json.dumps(value)
+            print(f"{key:<28} {value:>12}")
+            continue
+        line = f"{key:<28} {value:>12}"
+        previous = (baseline or {}).get("results", {}).get(key)
+        if isinstance(previous, int | float):
+            change = f"{(value - previous) / previous:+.1%}" if previous else "n/a"
+            line += f" {previous:>12} {change:>8}"
+        print(line)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--cities", type=int, default=1000)
+    parser.add_argument("--zipf", type=float, default=1.1, help="Zipf exponent of city popularity")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Mean upstream latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Upstream 5xx probability")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Upstream requests/s (0=off)")
+    parser.add_argument("--redis-url", help="Use Redis instead of the in-memory cache")
+    parser.add_argument("--no-coalescing", action="store_true")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=Path, help="Defaults to benchmarks/results/<time>.json")
+    parser.add_argument("--compare", type=Path, help="Earlier result file to compare against")
+    return parser.parse_args()
+
+
+def cli():
+    args = parse_args()
+    result = asyncio.run(run(args))
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+    report(result, baseline)
+
+    output = args.output
+    if output is None:
+        stamp = datetime.now(UTC).strftime("%Y%m%dT%H%M%S")
+        output = RESULTS_DIR / f"load-{stamp}-{result['commit'] or 'unknown'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, indent=2, default=str) + "\n")
+    print(f"\nSaved to {output}")
+
+
+if __name__ == "__main__":
+    # Log records are still created, just not written anywhere (importing main
+    # installs the stdout JSON handler).
+    logging.getLogger().handlers = [logging.NullHandler()]
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    cli()
@@ -0,0 +1,141 @@
+"""Requests/second of the middleware stack: BaseHTTPMiddleware vs pure ASGI.
+
+Runs in-process through httpx's ASGI transport against /health and a cached
+/weather (stub service, no Redis or upstream), so the numbers isolate
+framework and middleware overhead.
+
+Usage:
+    uv run python benchmarks/middleware.py [--requests 5000] [--concurrency 50]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+import uuid
+from pathlib import Path
+
+import httpx
+from fastapi import FastAPI
+from starlette.middleware.base import BaseHTTPMiddleware
+
+# Add project root to sys.path to allow imports from core/infra/api
+sys.path.append(str(Path(__file__).parent.parent))
+
+import main
+from api.middleware import RequestContextMiddleware
+from api.v1.schemas import WeatherResponse
+from core.domain.models import WeatherEntity
+from infra.request_context import request_id_ctx_var
+
+logger = logging.getLogger("api.middleware")
+
+
+class LegacyTraceIdMiddleware(BaseHTTPMiddleware):
+    """The previous BaseHTTPMiddleware implementation, kept for comparison."""
+
+    async def dispatch(self, request, call_next):
+        request_id = request.headers.get("X-Request-ID", str(uuid.uuid4()))
+        token = request_id_ctx_var.set(request_id)
+        request.state.request_id = request_id
+        try:
+            response = await call_next(request)
+            response.headers["X-Request-ID"] = request_id
+            return response
+        finally:
+            request_id_ctx_var.reset(token)
+
+
+class LegacyRequestLoggingMiddleware(BaseHTTPMiddleware):
+    """The previous BaseHTTPMiddleware implementation, kept for comparison."""
+
+    async def dispatch(self, request, call_next):
+        start_time = time.time()
+        response = await call_next(request)
+        log_data = {
+            "message": "Request processed",
+            "path": request.url.path,
+            "method": request.method,
+            "status_code": response.status_code,
+            "duration_ms": round((time.time() - start_time) * 1000, 2),
+            "request_id": request_id_ctx_var.get(),
+        }
+        logger.info(json.dumps(log_data))
+        return response
+
+
+class CachedService:
+    """Stub service that always hits the cache."""
+
+    def __init__(self):
+        self.weather = WeatherEntity(
+            city="London",
+            temperature=15.2,
+            humidity=60.0,
+            forecast=[{"time": f"2026-01-09T{h:02d}:00", "temperature": 15.0} for h in range(5)],
+        )
+
+    async def get_weather(self, city_name):
+        return self.weather
+
+    async def lookup(self, city_name):
+        return city_name.lower(), self.weather
+
+
+def build_app(middleware: list) -> FastAPI:
+    app = FastAPI()
+    for cls in middleware:
+        app.add_middleware(cls)
+    app.add_api_route("/health", main.health_check)
+    app.add_api_route("/weather", main.get_weather, response_model=WeatherResponse)
+    return app
+
+
+async def measure(app: FastAPI, path: str, requests: int, concurrency: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        queue = iter(range(requests))
+
+        async def worker():
+            for _ in queue:
+                response = await client.get(path)
+                response.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return requests / (time.perf_counter() - start)
+
+
+async def run(args):
+    main.service = CachedService()
+    stacks = {
+        "BaseHTTPMiddleware": [LegacyRequestLoggingMiddleware, LegacyTraceIdMiddleware],
+        "pure ASGI": [RequestContextMiddleware],
+    }
+    results = {}
+    for path in ("/health", "/weather?city=London"):
+        for name, middleware in stacks.items():
+            app = build_app(middleware)
+            await measure(app, path, min(500, args.requests), args.concurrency)  # warm-up
+            results[(path, name)] = await measure(app, path, args.requests, args.concurrency)
+
+    print(f"{'path':<22} {'stack':<20} {'req/s':>10}")
+    for (path, name), rps in results.items():
+        print(f"{path:<22} {name:<20} {rps:>10.0f}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    # Log records are still created, just not written anywhere (importing main
+    # installs the stdout JSON handler).
+    logging.getLogger().handlers = [logging.NullHandler()]
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    asyncio.run(run(parse_args()))
@@ -0,0 +1,57 @@
+"""Micro-benchmark: bytes per entry and encode/decode time of cache serializers.
+
+Usage:
+    uv run python benchmarks/serialization.py [--hours 5] [--number 20000]
+"""
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+# Add project root to sys.path to allow imports from core/infra
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.domain.models import WeatherEntity
+from infra.serialization import SERIALIZERS
+
+
+def make_weather(hours: int) -> WeatherEntity:
+    return WeatherEntity(
+        city="London",
+        temperature=15.2,
+        humidity=60.0,
+        forecast=[
+            {"time": f"2026-01-{9 + h // 24:02d}T{h % 24:02d}:00", "temperature": 15.0 + h * 0.1}
+            for h in range(hours)
+        ],
+        fetched_at=1767960000.0,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hours", type=int, nargs="+", default=[5, 48, 168])
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"{'format':<8} {'hours':>5} {'bytes':>7} {'encode µs':>10} {'decode µs':>10}")
+    for hours in args.hours:
+        weather = make_weather(hours)
+        for name, serializer_cls in SERIALIZERS.items():
+            try:
+                serializer = serializer_cls()
+            except RuntimeError as e:
+                print(f"{name:<8} skipped: {e}")
+                continue
+            data = serializer.dumps(weather)
+            encode = timeit.timeit(lambda s=serializer, w=weather: s.dumps(w), number=args.number)
+            decode = timeit.timeit(lambda s=serializer, d=data: s.loads(d), number=args.number)
+            print(
+                f"{name:<8} {hours:>5} {len(data):>7} "
+                f"{encode / args.number * 1e6:>10.2f} {decode / args.number * 1e6:>10.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Columnar hourly forecast.
+
+Upstream APIs (and the binary cache formats) deliver a forecast as parallel
+arrays: one of times and one per variable. `Forecast` keeps those arrays as
+they are, without copying them, and only builds a `{"time": ..., <variable>: ...}`
+row dict when a row is read. Slices are views over the same arrays.
+
+For existing code it behaves like the list of row dicts it replaces:
+indexing, slicing, `len`, iteration and `==` (also against a plain list) all
+work on rows.
+"""
+
+import math
+from collections.abc import Iterator, Mapping, Sequence
+from typing import Any
+
+
+def _value(value: float | None) -> float | None:
+    # Binary columns store missing values as NaN; rows expose them as None.
+    return None if value is None or math.isnan(value) else value
+
+
+class Forecast(Sequence[dict]):
+    __slots__ = ("times", "columns", "_start", "_stop")
+
+    def __init__(
+        self,
+        times: Sequence[str] = (),
+        columns: Mapping[str, Sequence[float | None]] | None = None,
+        start: int = 0,
+        stop: int | None = None,
+    ):
+        self.times = times
+        self.columns = dict(columns or {})
+        self._start = start
+        self._stop = len(times) if stop is None else min(stop, len(times))
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Mapping[str, Any]]) -> "Forecast":
+        """Columnar copy of a list of row dicts (the original entity format)."""
+        names = dict.fromkeys(key for row in rows for key in row)
+        names.pop("time", None)
+        return cls(
+            [row["time"] for row in rows],
+            {name: [row.get(name) for row in rows] for name in names},
+        )
+
+    @classmethod
+    def of(cls, forecast: "Sequence[Mapping[str, Any]]") -> "Forecast":
+        """`forecast` itself if already columnar, otherwise a columnar copy."""
+        return forecast if isinstance(forecast, Forecast) else cls.from_rows(forecast)
+
+    @property
+    def variables(self) -> tuple[str, ...]:
+        return tuple(self.columns)
+
+    def time_values(self) -> Sequence[str]:
+        return self._window(self.times)
+
+    def column(self, name: str) -> Sequence[float | None]:
+        """Raw values of one variable (NaN may stand for missing), or Nones if absent."""
+        values = self.columns.get(name)
+        if values is None:
+            return [None] * len(self)
+        if len(values) < self._stop:  # short upstream array: pad the missing hours
+            window = list(values[self._start : self._stop])
+            return window + [None] * (len(self) - len(window))
+        return self._window(values)
+
+    def _window(self, values: Sequence) -> Sequence:
+        if self._start == 0 and self._stop == len(values):
+            return values  # whole array: no copy
+        return values[self._start : self._stop]
+
+    def rows(self, variables: Sequence[str] | None = None) -> list[dict]:
+        """Row dicts with `variables` (default: all), None where a variable is missing."""
+        names = self.variables if variables is None else variables
+        columns = [(name, self.columns.get(name, ())) for name in names]
+        return [self._row(i, columns) for i in range(self._start, self._stop)]
+
+    def _row(self, i: int, columns: list[tuple[str, Sequence]]) -> dict:
+        row = {"time": self.times[i]}
+        for name, values in columns:
+            row[name] = _value(values[i]) if i < len(values) else None
+        return row
+
+    def __len__(self) -> int:
+        return max(0, self._stop - self._start)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            indices = range(self._start, self._stop)[index]
+            if indices.step != 1:
+                return Forecast.from_rows([self[i] for i in range(len(self))[index]])
+            return Forecast(self.times, self.columns, indices.start, indices.stop)
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("forecast index out of range")
+        return self._row(self._start + index, list(self.columns.items()))
+
+    def __iter__(self) -> Iterator[dict]:
+        return iter(self.rows())
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Sequence) or isinstance(other, str | bytes):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other, strict=True))
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"Forecast({len(self)} hours, variables={list(self.columns)})"
@@ -1,9 +1,26 @@
+from collections.abc import Sequence
 from dataclasses import dataclass
 
+# Hourly forecast variables, as named in `WeatherEntity.forecast` rows. Providers
+# fetch all of them so every client shape is served from the same cache entry.
+FORECAST_VARIABLES = ("temperature", "humidity", "precipitation", "wind_speed")
+
 
 @dataclass
 class WeatherEntity:
     city: str
     temperature: float
     humidity: float
-    forecast: list[dict]  # List of dictionaries for next 5 hours
+    # Hourly rows {"time", <variable>: value, ...}: a columnar `Forecast` from
+    # providers and cache decoders, though a plain list of dicts works as well.
+    forecast: Sequence[dict]
+    fetched_at: float | None = None  # Unix time of the upstream fetch (None = unknown)
+    degraded: bool = False  # Served from the last-known-good store during an outage
+
+
+@dataclass
+class GeoLocation:
+    name: str
+    latitude: float
+    longitude: float
+    timezone: str
@@ -0,0 +1,11 @@
+import unicodedata
+
+
+def normalize_city(city_name: str) -> str:
+    """Canonical form of a user-supplied city string, used for every cache key.
+
+    NFKC folds compatibility variants (full-width letters, ligatures), casefold
+    handles non-ASCII case ("STRASSE" vs "straße"), and runs of whitespace
+    collapse to one space, so " London", "LONDON" and "ｌｏｎｄｏｎ" share a key.
+    """
+    return " ".join(unicodedata.normalize("NFKC", city_name).casefold().split())
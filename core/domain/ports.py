@@ -1,6 +1,8 @@
+import asyncio
 from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable
 
-from core.domain.models import WeatherEntity
+from core.domain.models import GeoLocation, WeatherEntity
 
 
 class WeatherProviderPort(ABC):
@@ -8,6 +10,37 @@ class WeatherProviderPort(ABC):
     async def get_weather(self, city_name: str) -> WeatherEntity:
         pass
 
+    async def get_weather_many(self, city_names: list[str]) -> dict[str, WeatherEntity | Exception]:
+        """Fetch several cities; per-city failures are returned as exception values.
+
+        Providers that can fetch multiple locations per upstream call override this.
+        """
+        outcomes = await asyncio.gather(
+            *(self.get_weather(city_name) for city_name in city_names), return_exceptions=True
+        )
+        return dict(zip(city_names, outcomes, strict=True))
+
+    async def get_weather_at_many(
+        self, locations: list[GeoLocation]
+    ) -> list[WeatherEntity | Exception]:
+        """Fetch several locations; outcomes are in input order, failures as exception values.
+
+        Providers that can fetch multiple locations per upstream call override this.
+        """
+        return await asyncio.gather(
+            *(self.get_weather_at(location) for location in locations), return_exceptions=True
+        )
+
+    @abstractmethod
+    async def geocode(self, city_name: str) -> GeoLocation:
+        """Resolve a city name to coordinates (raises `CityNotFound`)."""
+        pass
+
+    @abstractmethod
+    async def get_weather_at(self, location: GeoLocation) -> WeatherEntity:
+        """Fetch weather for coordinates; the entity is named after `location.name`."""
+        pass
+
 
 class CachePort(ABC):
     @abstractmethod
@@ -17,3 +50,66 @@ class CachePort(ABC):
     @abstractmethod
     async def set_weather(self, city_name: str, weather: WeatherEntity):
         pass
+
+    async def get_many(self, city_names: list[str]) -> dict[str, WeatherEntity | None]:
+        """Bulk lookup; adapters override this to use a single round trip."""
+        return {city_name: await self.get_weather(city_name) for city_name in city_names}
+
+    async def set_many(self, items: dict[str, WeatherEntity]):
+        """Bulk write; adapters override this to use a single round trip."""
+        for city_name, weather in items.items():
+            await self.set_weather(city_name, weather)
+
+    @abstractmethod
+    async def delete_many(self, city_names: list[str]):
+        """Drop entries so the next read goes upstream."""
+        pass
+
+
+class GeocodeCachePort(ABC):
+    @abstractmethod
+    async def get_location(self, city_name: str) -> GeoLocation | None:
+        pass
+
+    @abstractmethod
+    async def set_location(self, city_name: str, location: GeoLocation):
+        pass
+
+    async def get_locations(self, city_names: list[str]) -> dict[str, GeoLocation | None]:
+        """Bulk lookup; adapters override this to use a single round trip."""
+        return {city_name: await self.get_location(city_name) for city_name in city_names}
+
+    async def set_locations(self, items: dict[str, GeoLocation]):
+        """Bulk write; adapters override this to use a single round trip."""
+        for city_name, location in items.items():
+            await self.set_location(city_name, location)
+
+
+class GeocoderPort(ABC):
+    """Resolves place names without calling the provider (e.g. a local index)."""
+
+    @abstractmethod
+    async def lookup(self, city_name: str) -> GeoLocation | None:
+        """Best exact match (most populous on ties), or None when unknown."""
+        pass
+
+    @abstractmethod
+    async def search(self, prefix: str, limit: int = 10) -> list[GeoLocation]:
+        """Places whose name starts with `prefix`, most populous first."""
+        pass
+
+
+class RequestCoalescerPort(ABC):
+    @abstractmethod
+    async def run[T](
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[T]],
+        recheck: Callable[[], Awaitable[T | None]] | None = None,
+    ) -> T:
+        """Run `fn` once per key for all concurrent callers.
+
+        `recheck` is awaited by callers that waited on a fetch owned by another
+        process; a non-None result is returned instead of calling `fn`.
+        """
+        pass
@@ -1,25 +1,290 @@
-from core.domain.models import WeatherEntity
-from core.domain.ports import CachePort, WeatherProviderPort
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import replace
+
+from core.domain import geohash
+from core.domain.exceptions import ServiceUnavailable
+from core.domain.models import GeoLocation, WeatherEntity
+from core.domain.normalization import normalize_city
+from core.domain.ports import CachePort, RequestCoalescerPort, WeatherProviderPort
+
+logger = logging.getLogger(__name__)
+
+CITY_KEYS = ("name", "location", "cell")
 
 
 class WeatherService:
-    def __init__(self, provider: WeatherProviderPort, cache: CachePort):
+    def __init__(
+        self,
+        provider: WeatherProviderPort,
+        cache: CachePort,
+        coalescer: RequestCoalescerPort | None = None,
+        soft_ttl: float | None = None,
+        fallback_cache: CachePort | None = None,
+        batch_concurrency: int = 8,
+        grid_precision: int = 5,
+        city_keys: str = "name",
+    ):
         self.provider = provider
         self.cache = cache
+        self.coalescer = coalescer
+        # Entries older than soft_ttl are served stale while a background refresh
+        # runs; the cache's own (hard) TTL decides when they disappear entirely.
+        self.soft_ttl = soft_ttl
+        self._refreshing: dict[str, asyncio.Task] = {}
+        self._geocoding: dict[str, asyncio.Task] = {}
+        # Long-lived "last-known-good" copies, used only when the provider is down.
+        self.fallback_cache = fallback_cache
+        self.batch_concurrency = batch_concurrency
+        # Coordinate lookups are cached per geohash cell of this precision.
+        self.grid_precision = grid_precision
+        # How city lookups are keyed: by normalized "name"; by the geocoded
+        # "location", so every alias of a place shares one entry; or by its
+        # grid "cell", which also merges nearby places.
+        if city_keys not in CITY_KEYS:
+            raise ValueError(f"Unknown city_keys: {city_keys} (expected one of {CITY_KEYS})")
+        self.city_keys = city_keys
 
     async def get_weather(self, city_name: str) -> WeatherEntity:
+        _, weather = await self.lookup(city_name)
+        return weather
+
+    async def get_weather_at(self, latitude: float, longitude: float) -> WeatherEntity:
+        """Weather for the grid cell containing the coordinates (named after the cell)."""
+        _, weather = await self.lookup_at(latitude, longitude)
+        return weather
+
+    async def lookup(self, city_name: str) -> tuple[str, WeatherEntity]:
+        """`get_weather` plus the cache key the entry is stored under.
+
+        The key identifies the place: unlike the entity's display name, it
+        differs for distinct places that share a name.
+        """
+        key, fetch, location = await self._route(city_name)
+        weather = await self._get(key, fetch)
+        if location is None:
+            return key, weather
+        return key, replace(weather, city=location.name)
+
+    async def lookup_at(self, latitude: float, longitude: float) -> tuple[str, WeatherEntity]:
+        """`get_weather_at` plus the cache key the entry is stored under."""
+        cell = geohash.encode(latitude, longitude, self.grid_precision)
+        key = f"cell:{cell}"
+        return key, await self._get(key, self._cell_fetcher(cell))
+
+    async def _get(self, key: str, fetch: Callable[[], Awaitable[WeatherEntity]]) -> WeatherEntity:
         # 1. Try Cache
-        cached = await self.cache.get_weather(city_name)
+        cached = await self.cache.get_weather(key)
         if cached:
+            if self._is_stale(cached):
+                self._schedule_refresh(key, fetch)
             return cached
 
-        # 2. Fetch from Provider
-        weather = await self.provider.get_weather(city_name)
+        # 2. Fetch from Provider (blocks only when there is no value at all)
+        try:
+            return await self._load(key, fetch)
+        except ServiceUnavailable:
+            fallback = await self._last_known_good(key)
+            if fallback is None:
+                raise
+            logger.warning(f"Provider unavailable, serving last-known-good for {key}")
+            return fallback
+
+    async def _route(
+        self, city_name: str
+    ) -> tuple[str, Callable[[], Awaitable[WeatherEntity]], GeoLocation | None]:
+        """Cache key, upstream fetch and (if geocoded) location for a city lookup."""
+        if self.city_keys == "name":
+            return city_name, self._city_fetcher(city_name), None
+
+        # The geocode cache doubles as the alias index: every spelling ever
+        # queried maps to the location geocoding returned for it, so only a new
+        # spelling costs a geocoding call and none costs an extra forecast.
+        location = await self._geocode(city_name)
+        if self.city_keys == "cell":
+            cell = geohash.encode(location.latitude, location.longitude, self.grid_precision)
+            return f"cell:{cell}", self._cell_fetcher(cell), location
+
+        key = f"loc:{location.name}:{location.latitude:.3f},{location.longitude:.3f}"
+        return key, lambda: self.provider.get_weather_at(location), location
+
+    async def _geocode(self, city_name: str) -> GeoLocation:
+        # Concurrent lookups of one spelling share a geocoding call. This is
+        # in-process only: the provider's geocode cache covers other replicas.
+        key = self._key(city_name)
+        task = self._geocoding.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self.provider.geocode(city_name))
+            self._geocoding[key] = task
+            task.add_done_callback(lambda _: self._geocoding.pop(key, None))
+        return await asyncio.shield(task)
+
+    def _city_fetcher(self, city_name: str) -> Callable[[], Awaitable[WeatherEntity]]:
+        return lambda: self.provider.get_weather(city_name)
+
+    def _cell_fetcher(self, cell: str) -> Callable[[], Awaitable[WeatherEntity]]:
+        latitude, longitude = geohash.cell_center(cell)
+        location = GeoLocation(name=cell, latitude=latitude, longitude=longitude, timezone="auto")
+        return lambda: self.provider.get_weather_at(location)
+
+    async def get_weather_many(self, city_names: list[str]) -> dict[str, WeatherEntity | Exception]:
+        """Resolve many cities at once.
+
+        Cities are keyed as in `get_weather`, so batch and single lookups share
+        cache entries. Cache lookups are batched, only misses go
+        upstream (at most `batch_concurrency` geocoding or forecast calls at a
+        time), and per-city failures are returned as exception values instead
+        of failing the whole batch.
+        """
+        # One lookup per normalized city, reported back under every spelling.
+        unique: dict[str, str] = {}
+        for city_name in city_names:
+            unique.setdefault(self._key(city_name), city_name)
+        semaphore = asyncio.Semaphore(self.batch_concurrency)
+
+        async def bounded[T](fn: Callable[[], Awaitable[T]]) -> T:
+            async with semaphore:
+                return await fn()
+
+        results: dict[str, WeatherEntity | Exception] = {}
+        routes = {}
+        outcomes = await asyncio.gather(
+            *(bounded(lambda c=c: self._route(c)) for c in unique.values()),
+            return_exceptions=True,
+        )
+        for city_name, outcome in zip(unique.values(), outcomes, strict=True):
+            if isinstance(outcome, BaseException):
+                results[city_name] = outcome
+            else:
+                routes[city_name] = outcome
+
+        # Aliases of one place share a cache key: it is read and fetched once.
+        fetchers = {key: fetch for key, fetch, _ in routes.values()}
+        entries: dict[str, WeatherEntity | Exception] = {}
+        misses = []
+        for key, cached in (await self.cache.get_many(list(fetchers))).items():
+            if cached:
+                if self._is_stale(cached):
+                    self._schedule_refresh(key, fetchers[key])
+                entries[key] = cached
+            else:
+                misses.append(key)
+
+        if misses:
+            # Each miss is cached inside its coalesced fetch, as in `get_weather`,
+            # so the entry exists before a distributed lock on it is released.
+            outcomes = await asyncio.gather(
+                *(bounded(lambda k=k: self._load(k, fetchers[k])) for k in misses),
+                return_exceptions=True,
+            )
+            for key, outcome in zip(misses, outcomes, strict=True):
+                if isinstance(outcome, ServiceUnavailable):
+                    outcome = await self._last_known_good(key) or outcome
+                entries[key] = outcome
+
+        for city_name, (key, _, location) in routes.items():
+            outcome = entries[key]
+            if location is not None and isinstance(outcome, WeatherEntity):
+                outcome = replace(outcome, city=location.name)
+            results[city_name] = outcome
+
+        return {city_name: results[unique[self._key(city_name)]] for city_name in city_names}
+
+    async def peek_many(self, city_names: list[str]) -> dict[str, WeatherEntity | None]:
+        """Cached entries for the cities, without fetching any forecast."""
+        if self.city_keys == "name":
+            return await self.cache.get_many(city_names)
+
+        keys: dict[str, str] = {}
+        for city_name in city_names:
+            try:
+                keys[city_name], _, _ = await self._route(city_name)
+            except Exception as e:
+                logger.debug(f"Could not resolve {city_name} for cache lookup: {e}")
+        cached = await self.cache.get_many(list(dict.fromkeys(keys.values())))
+        return {city_name: cached.get(keys.get(city_name)) for city_name in city_names}
+
+    async def refresh(self, city_name: str) -> WeatherEntity:
+        """Fetch from the provider and update the cache regardless of cache state."""
+        key, fetch, _ = await self._route(city_name)
+        return await self._load(key, fetch)
+
+    async def _load(self, key: str, fetch: Callable[[], Awaitable[WeatherEntity]]) -> WeatherEntity:
+        return await self._coalesce(key, lambda: self._fetch_and_cache(key, fetch))
+
+    async def _coalesce(
+        self, city_name: str, fn: Callable[[], Awaitable[WeatherEntity]]
+    ) -> WeatherEntity:
+        # Concurrent misses for the same city share a single upstream fetch.
+        if self.coalescer is None:
+            return await fn()
+
+        return await self.coalescer.run(
+            self._key(city_name),
+            fn,
+            recheck=lambda: self._fresh_from_cache(city_name),
+        )
+
+    async def _fetch_and_cache(
+        self, city_name: str, fetch: Callable[[], Awaitable[WeatherEntity]]
+    ) -> WeatherEntity:
+        weather = await fetch()
 
         # 3. Update Cache
-        # We perform this asynchronously/concurrently in a real app,
-        # but for now we await to ensure it's written.
-        # Errors in cache writing are swallowed by the adapter to prevent crashing the request.
+        # With a write-behind cache (infra.write_behind) these calls only queue
+        # the write; otherwise they wait for the backend. Either way, write
+        # errors are swallowed by the adapter rather than failing the request.
         await self.cache.set_weather(city_name, weather)
+        if self.fallback_cache is not None:
+            await self.fallback_cache.set_weather(city_name, weather)
 
         return weather
+
+    async def _last_known_good(self, city_name: str) -> WeatherEntity | None:
+        if self.fallback_cache is None:
+            return None
+        weather = await self.fallback_cache.get_weather(city_name)
+        if weather is None:
+            return None
+        return replace(weather, degraded=True)
+
+    async def _fresh_from_cache(self, city_name: str) -> WeatherEntity | None:
+        cached = await self.cache.get_weather(city_name)
+        if cached and not self._is_stale(cached):
+            return cached
+        return None
+
+    def _is_stale(self, weather: WeatherEntity) -> bool:
+        if self.soft_ttl is None or weather.fetched_at is None:
+            return False
+        return time.time() - weather.fetched_at > self.soft_ttl
+
+    def _schedule_refresh(self, city_name: str, fetch: Callable[[], Awaitable[WeatherEntity]]):
+        key = self._key(city_name)
+        if key in self._refreshing:
+            return
+
+        task = asyncio.create_task(self._refresh(city_name, fetch))
+        self._refreshing[key] = task
+        task.add_done_callback(lambda _: self._refreshing.pop(key, None))
+
+    async def _refresh(self, city_name: str, fetch: Callable[[], Awaitable[WeatherEntity]]):
+        try:
+            await self._load(city_name, fetch)
+            logger.debug(f"Background refresh completed for {city_name}")
+        except Exception as e:
+            # The stale value keeps being served until the hard TTL lapses.
+            logger.warning(f"Background refresh failed for {city_name}: {e}")
+
+    @staticmethod
+    def _key(city_name: str) -> str:
+        return normalize_city(city_name)
+
+    async def close(self):
+        """Cancel background refreshes that are still running."""
+        tasks = list(self._refreshing.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,118 @@
+import asyncio
+import logging
+
+from core.domain.models import GeoLocation, WeatherEntity
+from core.domain.ports import WeatherProviderPort
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatchingProvider(WeatherProviderPort):
+    """Groups concurrent provider calls into bulk calls.
+
+    `get_weather` calls are flushed into one `get_weather_many` call and
+    `get_weather_at` calls into one `get_weather_at_many` call. Calls arriving
+    within `window` seconds of the first pending call (or until
+    `max_batch_size` cities or locations are pending) are flushed together, so
+    a burst of cache misses costs one multi-location forecast request instead
+    of many.
+    """
+
+    def __init__(
+        self, provider: WeatherProviderPort, window: float = 0.01, max_batch_size: int = 50
+    ):
+        self.provider = provider
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self._pending: dict[str, asyncio.Future] = {}
+        # Locations by (name, coordinates, timezone): GeoLocation is not hashable.
+        self._pending_at: dict[tuple, tuple[GeoLocation, asyncio.Future]] = {}
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._flushes: set[asyncio.Task] = set()
+
+    async def get_weather(self, city_name: str) -> WeatherEntity:
+        future = self._pending.get(city_name)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._pending[city_name] = future
+            self._schedule(len(self._pending))
+        return await asyncio.shield(future)
+
+    async def get_weather_at(self, location: GeoLocation) -> WeatherEntity:
+        key = (location.name, location.latitude, location.longitude, location.timezone)
+        pending = self._pending_at.get(key)
+        if pending is None:
+            pending = self._pending_at[key] = (location, asyncio.get_running_loop().create_future())
+            self._schedule(len(self._pending_at))
+        return await asyncio.shield(pending[1])
+
+    async def get_weather_many(self, city_names: list[str]) -> dict[str, WeatherEntity | Exception]:
+        return await self.provider.get_weather_many(city_names)
+
+    async def get_weather_at_many(
+        self, locations: list[GeoLocation]
+    ) -> list[WeatherEntity | Exception]:
+        return await self.provider.get_weather_at_many(locations)
+
+    async def geocode(self, city_name: str) -> GeoLocation:
+        return await self.provider.geocode(city_name)
+
+    def _schedule(self, pending: int):
+        if pending >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(self.window, self._flush)
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, {}
+        batch_at, self._pending_at = self._pending_at, {}
+        if batch:
+            self._start(self._run_batch(batch))
+        if batch_at:
+            self._start(self._run_location_batch(list(batch_at.values())))
+
+    def _start(self, coro):
+        task = asyncio.create_task(coro)
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _run_batch(self, batch: dict[str, asyncio.Future]):
+        logger.debug(f"Flushing micro-batch of {len(batch)} cities")
+        try:
+            results = await self.provider.get_weather_many(list(batch))
+        except Exception as e:
+            results = dict.fromkeys(batch, e)
+
+        for city_name, future in batch.items():
+            self._resolve(future, results.get(city_name), city_name)
+
+    async def _run_location_batch(self, batch: list[tuple[GeoLocation, asyncio.Future]]):
+        logger.debug(f"Flushing micro-batch of {len(batch)} locations")
+        try:
+            results = await self.provider.get_weather_at_many([location for location, _ in batch])
+        except Exception as e:
+            results = [e] * len(batch)
+
+        for i, (location, future) in enumerate(batch):
+            self._resolve(future, results[i] if i < len(results) else None, location.name)
+
+    @staticmethod
+    def _resolve(future: asyncio.Future, outcome, name: str):
+        if future.done():
+            return
+        if isinstance(outcome, WeatherEntity):
+            future.set_result(outcome)
+        elif isinstance(outcome, Exception):
+            future.set_exception(outcome)
+        else:
+            future.set_exception(RuntimeError(f"No result for {name} in batch"))
+
+    async def close(self):
+        """Flush pending calls, wait for in-flight batches and close the wrapped provider."""
+        self._flush()
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+        await self.provider.close()
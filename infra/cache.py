@@ -1,62 +1,324 @@
-import json
+import asyncio
 import logging
-from dataclasses import asdict
+import uuid
 
 import redis.asyncio as redis
 from circuitbreaker import CircuitBreakerError, circuit
 
 from core.domain.models import WeatherEntity
+from core.domain.normalization import normalize_city
 from core.domain.ports import CachePort
+from infra.lru import LRUCache
+from infra.metrics import CACHE_EVICTIONS, CACHE_REQUESTS, REDIS_COMMAND_DURATION
+from infra.serialization import JsonSerializer, WeatherSerializer
 
 logger = logging.getLogger(__name__)
 
 
 class RedisCacheAdapter(CachePort):
-    def __init__(self, redis_url: str):
-        self.redis = redis.from_url(redis_url, decode_responses=True)
-        self.ttl = 3600  # 1 hour
+    def __init__(
+        self,
+        redis_url: str,
+        ttl: int = 3600,
+        key_prefix: str = "weather",
+        client=None,
+        serializer: WeatherSerializer | None = None,
+        tier: str = "redis",
+        read_client=None,
+        cluster: bool = False,
+        raise_write_errors: bool = False,
+    ):
+        # Pass `client` to share one connection pool between adapters.
+        # Responses stay as bytes so binary serializers can be used.
+        self.redis = client or redis.from_url(redis_url, decode_responses=False)
+        # Reads may go to a replica; writes always go to `self.redis`.
+        self.read_redis = read_client or self.redis
+        self.ttl = ttl  # Hard TTL, 1 hour by default
+        self.key_prefix = key_prefix
+        self.serializer = serializer or JsonSerializer()
+        self.tier = tier  # `tier` label on cache metrics
+        # Cluster mode hash-tags the city so every key for it shares a slot,
+        # and splits multi-key reads by slot.
+        self.cluster = cluster
+        # Writes normally fail open; a caller that accounts for failed writes
+        # itself (such as `WriteBehindCache`) sets this to get the exception.
+        self.raise_write_errors = raise_write_errors
 
-    @circuit(failure_threshold=3, recovery_timeout=30)
+    def _record(self, result: str, amount: int = 1):
+        CACHE_REQUESTS.labels(tier=self.tier, result=result).inc(amount)
+
+    def _key(self, city_name: str) -> str:
+        if self.cluster:
+            return f"{self.key_prefix}:{{{normalize_city(city_name)}}}"
+        return f"{self.key_prefix}:{normalize_city(city_name)}"
+
+    @circuit(failure_threshold=3, recovery_timeout=30, name="redis_cache_get")
     async def _get_weather_impl(self, city_name: str) -> WeatherEntity | None:
-        key = f"weather:{city_name.lower()}"
-        data = await self.redis.get(key)
+        key = self._key(city_name)
+        with REDIS_COMMAND_DURATION.labels(command="get").time():
+            data = await self.read_redis.get(key)
         if data:
-            logger.info(f"Cache HIT for {city_name}")
-            json_data = json.loads(data)
-            return WeatherEntity(**json_data)
-        logger.info(f"Cache MISS for {city_name}")
+            logger.info(f"Cache HIT for {city_name}", extra={"sample_key": "cache_hit"})
+            self._record("hit")
+            return self.serializer.loads(data)
+        logger.info(f"Cache MISS for {city_name}", extra={"sample_key": "cache_miss"})
+        self._record("miss")
         return None
 
     async def get_weather(self, city_name: str) -> WeatherEntity | None:
         try:
             return await self._get_weather_impl(city_name)
         except CircuitBreakerError:
-            logger.warning(f"Cache Circuit Breaker OPEN for {city_name}. Treating as MISS.")
-            return None
+            logger.warning(
+                f"Cache Circuit Breaker OPEN for {city_name}. Treating as MISS.",
+                extra={"throttle_key": "cache_circuit_open"},
+            )
+        except Exception as e:
+            logger.warning(f"Cache READ error: {e}", extra={"throttle_key": "cache_read_error"})
+        self._record("error")
+        return None
+
+    @circuit(failure_threshold=3, recovery_timeout=30, name="redis_cache_mget")
+    async def _get_many_impl(self, city_names: list[str]) -> dict[str, WeatherEntity | None]:
+        with REDIS_COMMAND_DURATION.labels(command="mget").time():
+            keys = [self._key(city_name) for city_name in city_names]
+            if self.cluster:
+                values = await self.read_redis.mget_nonatomic(keys)
+            else:
+                values = await self.read_redis.mget(keys)
+        results = {}
+        for city_name, data in zip(city_names, values, strict=True):
+            try:
+                results[city_name] = self.serializer.loads(data) if data else None
+            except Exception as e:
+                logger.warning(f"Cache READ error for {city_name}: {e}")
+                results[city_name] = None
+        hits = sum(1 for weather in results.values() if weather is not None)
+        logger.info(f"Cache MGET {hits}/{len(city_names)} hits")
+        self._record("hit", hits)
+        self._record("miss", len(city_names) - hits)
+        return results
+
+    async def get_many(self, city_names: list[str]) -> dict[str, WeatherEntity | None]:
+        if not city_names:
+            return {}
+        try:
+            return await self._get_many_impl(city_names)
+        except CircuitBreakerError:
+            logger.warning(
+                "Cache Circuit Breaker OPEN for MGET. Treating as MISS.",
+                extra={"throttle_key": "cache_circuit_open"},
+            )
         except Exception as e:
-            logger.warning(f"Cache READ error: {e}")
-            return None
+            logger.warning(f"Cache READ error: {e}", extra={"throttle_key": "cache_read_error"})
+        self._record("error", len(city_names))
+        return dict.fromkeys(city_names)
 
-    @circuit(failure_threshold=3, recovery_timeout=30)
+    @circuit(failure_threshold=3, recovery_timeout=30, name="redis_cache_set")
     async def _set_weather_impl(self, city_name: str, weather: WeatherEntity):
-        key = f"weather:{city_name.lower()}"
-        # We use asdict to serialize the dataclass
-        data = json.dumps(asdict(weather))
-        await self.redis.set(key, data, ex=self.ttl)
+        key = self._key(city_name)
+        data = self.serializer.dumps(weather)
+        with REDIS_COMMAND_DURATION.labels(command="set").time():
+            await self.redis.set(key, data, ex=self.ttl)
         logger.debug(f"Cache SET for {city_name}")
 
     async def set_weather(self, city_name: str, weather: WeatherEntity):
         try:
             await self._set_weather_impl(city_name, weather)
         except CircuitBreakerError:
-            logger.warning(f"Cache Circuit Breaker OPEN for {city_name}. skipping write.")
+            if self.raise_write_errors:
+                raise
+            logger.warning(
+                f"Cache Circuit Breaker OPEN for {city_name}. skipping write.",
+                extra={"throttle_key": "cache_circuit_open"},
+            )
+        except Exception as e:
+            if self.raise_write_errors:
+                raise
+            logger.warning(f"Cache WRITE error: {e}", extra={"throttle_key": "cache_write_error"})
+
+    @circuit(failure_threshold=3, recovery_timeout=30, name="redis_cache_set_many")
+    async def _set_many_impl(self, items: dict[str, WeatherEntity]):
+        # One round trip for all writes; no MULTI/EXEC needed since keys are independent.
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for city_name, weather in items.items():
+                pipe.set(self._key(city_name), self.serializer.dumps(weather), ex=self.ttl)
+            with REDIS_COMMAND_DURATION.labels(command="pipeline").time():
+                await pipe.execute()
+        logger.debug(f"Cache SET (pipelined) for {len(items)} entries")
+
+    async def set_many(self, items: dict[str, WeatherEntity]):
+        if not items:
+            return
+        try:
+            await self._set_many_impl(items)
+        except CircuitBreakerError:
+            if self.raise_write_errors:
+                raise
+            logger.warning(
+                "Cache Circuit Breaker OPEN for pipelined SET. skipping write.",
+                extra={"throttle_key": "cache_circuit_open"},
+            )
+        except Exception as e:
+            if self.raise_write_errors:
+                raise
+            logger.warning(f"Cache WRITE error: {e}", extra={"throttle_key": "cache_write_error"})
+
+    @circuit(failure_threshold=3, recovery_timeout=30, name="redis_cache_delete")
+    async def _delete_many_impl(self, city_names: list[str]):
+        with REDIS_COMMAND_DURATION.labels(command="delete").time():
+            await self.redis.delete(*(self._key(city_name) for city_name in city_names))
+        logger.debug(f"Cache DEL for {len(city_names)} entries")
+
+    async def delete_many(self, city_names: list[str]):
+        if not city_names:
+            return
+        try:
+            await self._delete_many_impl(city_names)
+        except CircuitBreakerError:
+            logger.warning(
+                "Cache Circuit Breaker OPEN for DEL. skipping delete.",
+                extra={"throttle_key": "cache_circuit_open"},
+            )
         except Exception as e:
-            logger.warning(f"Cache WRITE error: {e}")
+            logger.warning(f"Cache DELETE error: {e}", extra={"throttle_key": "cache_write_error"})
 
     async def close(self):
         """Close Redis connection pool gracefully."""
         try:
             await self.redis.aclose()
+            if self.read_redis is not self.redis:
+                await self.read_redis.aclose()
             logger.info("Redis connection closed successfully")
         except Exception as e:
             logger.warning(f"Error closing Redis connection: {e}")
+
+
+class TieredCacheAdapter(CachePort):
+    """In-process LRU/TTL tier (L1) in front of a shared cache such as Redis (L2).
+
+    L1 hits skip the network round trip and deserialization entirely. The L1
+    TTL bounds how stale a replica can be; when a Redis client is given, writes
+    are also announced on a pub/sub channel so other replicas drop their copy.
+    """
+
+    def __init__(
+        self,
+        backend: CachePort,
+        maxsize: int = 512,
+        ttl: float = 60.0,
+        redis_client=None,
+        invalidation_channel: str = "weather:invalidate",
+    ):
+        self.backend = backend
+        self.l1 = LRUCache(
+            maxsize=maxsize,
+            ttl=ttl,
+            on_evict=lambda key: CACHE_EVICTIONS.labels(tier="l1").inc(),
+        )
+        self.redis = redis_client
+        self.invalidation_channel = invalidation_channel
+        self.instance_id = uuid.uuid4().hex
+        self._listener: asyncio.Task | None = None
+
+    async def get_weather(self, city_name: str) -> WeatherEntity | None:
+        key = normalize_city(city_name)
+        weather = self.l1.get(key)
+        if weather is not None:
+            CACHE_REQUESTS.labels(tier="l1", result="hit").inc()
+            return weather
+        CACHE_REQUESTS.labels(tier="l1", result="miss").inc()
+
+        weather = await self.backend.get_weather(city_name)
+        if weather is not None:
+            self.l1.set(key, weather)
+        return weather
+
+    async def get_many(self, city_names: list[str]) -> dict[str, WeatherEntity | None]:
+        results: dict[str, WeatherEntity | None] = {}
+        misses = []
+        for city_name in city_names:
+            weather = self.l1.get(normalize_city(city_name))
+            results[city_name] = weather
+            if weather is None:
+                misses.append(city_name)
+        CACHE_REQUESTS.labels(tier="l1", result="hit").inc(len(city_names) - len(misses))
+        CACHE_REQUESTS.labels(tier="l1", result="miss").inc(len(misses))
+
+        if misses:
+            for city_name, weather in (await self.backend.get_many(misses)).items():
+                results[city_name] = weather
+                if weather is not None:
+                    self.l1.set(normalize_city(city_name), weather)
+        return results
+
+    async def set_weather(self, city_name: str, weather: WeatherEntity):
+        key = normalize_city(city_name)
+        self.l1.set(key, weather)
+        await self.backend.set_weather(city_name, weather)
+        await self._publish_invalidation([key])
+
+    async def set_many(self, items: dict[str, WeatherEntity]):
+        for city_name, weather in items.items():
+            self.l1.set(normalize_city(city_name), weather)
+        await self.backend.set_many(items)
+        await self._publish_invalidation([normalize_city(city_name) for city_name in items])
+
+    async def delete_many(self, city_names: list[str]):
+        keys = [normalize_city(city_name) for city_name in city_names]
+        for key in keys:
+            self.l1.pop(key)
+        await self.backend.delete_many(city_names)
+        await self._publish_invalidation(keys)
+
+    async def _publish_invalidation(self, keys: list[str]):
+        if self.redis is None or not keys:
+            return
+        # One message per write batch: "<instance id>:<key>[\n<key>...]".
+        message = f"{self.instance_id}:" + "\n".join(keys)
+        try:
+            await self.redis.publish(self.invalidation_channel, message)
+        except Exception as e:
+            logger.warning(f"Cache invalidation publish error: {e}")
+
+    def _handle_invalidation(self, data: str | bytes):
+        if isinstance(data, bytes):
+            data = data.decode()
+        origin, _, keys = data.partition(":")
+        if origin != self.instance_id:
+            for key in keys.split("\n"):
+                self.l1.pop(key)
+            logger.debug(f"L1 invalidated {keys!r}")
+
+    async def _listen(self):
+        while True:
+            pubsub = self.redis.pubsub()
+            try:
+                await pubsub.subscribe(self.invalidation_channel)
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self._handle_invalidation(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Missed invalidations are bounded by the L1 TTL; retry later.
+                logger.warning(f"Cache invalidation listener error: {e}")
+                await asyncio.sleep(1.0)
+            finally:
+                await pubsub.aclose()
+
+    def start_invalidation_listener(self):
+        """Subscribe to invalidations from other replicas (no-op without Redis)."""
+        if self.redis is not None and self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def close(self):
+        """Stop the invalidation listener and close the backing cache."""
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        await self.backend.close()
@@ -0,0 +1,112 @@
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+
+from core.domain.ports import RequestCoalescerPort
+from infra.metrics import COALESCED_REQUESTS, COALESCING_INFLIGHT
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight(RequestCoalescerPort):
+    """In-process request coalescing: concurrent callers share one task per key."""
+
+    def __init__(self):
+        self._inflight: dict[str, asyncio.Task] = {}
+
+    async def run[T](
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[T]],
+        recheck: Callable[[], Awaitable[T | None]] | None = None,
+    ) -> T:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._execute(key, fn, recheck))
+            self._inflight[key] = task
+            COALESCING_INFLIGHT.inc()
+            task.add_done_callback(lambda t: self._forget(key, t))
+        else:
+            COALESCED_REQUESTS.labels(scope="local").inc()
+            logger.debug(f"Coalesced request for {key}")
+
+        # Shield the shared task so one cancelled caller (e.g. a client
+        # disconnect) does not cancel the fetch for everybody else.
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: asyncio.Task):
+        COALESCING_INFLIGHT.dec()
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    async def _execute[T](
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[T]],
+        recheck: Callable[[], Awaitable[T | None]] | None,
+    ) -> T:
+        return await fn()
+
+
+class RedisLockCoalescer(SingleFlight):
+    """Coalescing across workers and replicas using a Redis lock per key.
+
+    Callers are first coalesced in-process; the local leader then takes a Redis
+    lock so only one process fetches upstream. Processes that had to wait for
+    the lock call `recheck` (typically a cache read) before fetching themselves.
+    Lock errors fail open: the fetch proceeds without distributed coalescing.
+    """
+
+    def __init__(
+        self,
+        redis_client,
+        key_prefix: str = "lock:weather",
+        lock_timeout: float = 10.0,
+        wait_timeout: float = 5.0,
+        poll_interval: float = 0.05,
+    ):
+        super().__init__()
+        self.redis = redis_client
+        self.key_prefix = key_prefix
+        self.lock_timeout = lock_timeout
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+
+    async def _execute[T](
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[T]],
+        recheck: Callable[[], Awaitable[T | None]] | None,
+    ) -> T:
+        lock = self.redis.lock(
+            f"{self.key_prefix}:{key}",
+            timeout=self.lock_timeout,
+            sleep=self.poll_interval,
+        )
+        acquired = False
+        contended = False
+        try:
+            acquired = await lock.acquire(blocking=False)
+            if not acquired:
+                contended = True
+                acquired = await lock.acquire(blocking=True, blocking_timeout=self.wait_timeout)
+        except Exception as e:
+            logger.warning(f"Coalescing lock error for {key}: {e}. Fetching without lock.")
+
+        try:
+            if contended:
+                COALESCED_REQUESTS.labels(scope="distributed").inc()
+                if not acquired:
+                    logger.warning(f"Timed out waiting for coalescing lock on {key}")
+                if recheck is not None:
+                    result = await recheck()
+                    if result is not None:
+                        return result
+            return await fn()
+        finally:
+            if acquired:
+                try:
+                    await lock.release()
+                except Exception as e:
+                    # The lock may have expired while fetching; nothing to undo.
+                    logger.warning(f"Coalescing lock release error for {key}: {e}")
@@ -0,0 +1,188 @@
+import json
+import logging
+from dataclasses import asdict
+
+from circuitbreaker import CircuitBreakerError, circuit
+
+from core.domain.models import GeoLocation
+from core.domain.normalization import normalize_city
+from core.domain.ports import GeocodeCachePort
+from infra.lru import LRUCache
+from infra.metrics import CACHE_REQUESTS, REDIS_COMMAND_DURATION
+
+logger = logging.getLogger(__name__)
+
+
+class RedisGeocodeCache(GeocodeCachePort):
+    """Redis store for city -> location lookups.
+
+    Geocoding results are effectively static, so they live far longer than
+    weather entries (`ttl=None` disables expiry entirely).
+    """
+
+    def __init__(
+        self,
+        redis_client,
+        ttl: int | None = 30 * 24 * 3600,
+        read_client=None,
+        cluster: bool = False,
+    ):
+        self.redis = redis_client
+        self.read_redis = read_client or redis_client
+        self.ttl = ttl
+        self.cluster = cluster
+
+    def _key(self, city_name: str) -> str:
+        if self.cluster:
+            return f"geo:{{{normalize_city(city_name)}}}"
+        return f"geo:{normalize_city(city_name)}"
+
+    @circuit(failure_threshold=3, recovery_timeout=30, name="geocode_cache_get")
+    async def _get_location_impl(self, city_name: str) -> GeoLocation | None:
+        with REDIS_COMMAND_DURATION.labels(command="get").time():
+            data = await self.read_redis.get(self._key(city_name))
+        if data:
+            CACHE_REQUESTS.labels(tier="geocode_redis", result="hit").inc()
+            return GeoLocation(**json.loads(data))
+        CACHE_REQUESTS.labels(tier="geocode_redis", result="miss").inc()
+        return None
+
+    async def get_location(self, city_name: str) -> GeoLocation | None:
+        try:
+            return await self._get_location_impl(city_name)
+        except CircuitBreakerError:
+            logger.warning(
+                f"Geocode cache Circuit Breaker OPEN for {city_name}. Treating as MISS.",
+                extra={"throttle_key": "geocode_cache_circuit_open"},
+            )
+        except Exception as e:
+            logger.warning(
+                f"Geocode cache READ error: {e}", extra={"throttle_key": "geocode_cache_error"}
+            )
+        CACHE_REQUESTS.labels(tier="geocode_redis", result="error").inc()
+        return None
+
+    @circuit(failure_threshold=3, recovery_timeout=30, name="geocode_cache_set")
+    async def _set_location_impl(self, city_name: str, location: GeoLocation):
+        data = json.dumps(asdict(location))
+        with REDIS_COMMAND_DURATION.labels(command="set").time():
+            await self.redis.set(self._key(city_name), data, ex=self.ttl)
+
+    async def set_location(self, city_name: str, location: GeoLocation):
+        try:
+            await self._set_location_impl(city_name, location)
+        except CircuitBreakerError:
+            logger.warning(
+                f"Geocode cache Circuit Breaker OPEN for {city_name}. skipping write.",
+                extra={"throttle_key": "geocode_cache_circuit_open"},
+            )
+        except Exception as e:
+            logger.warning(
+                f"Geocode cache WRITE error: {e}", extra={"throttle_key": "geocode_cache_error"}
+            )
+
+    @circuit(failure_threshold=3, recovery_timeout=30, name="geocode_cache_mget")
+    async def _get_locations_impl(self, city_names: list[str]) -> dict[str, GeoLocation | None]:
+        with REDIS_COMMAND_DURATION.labels(command="mget").time():
+            keys = [self._key(city_name) for city_name in city_names]
+            if self.cluster:
+                values = await self.read_redis.mget_nonatomic(keys)
+            else:
+                values = await self.read_redis.mget(keys)
+        results = {
+            city_name: GeoLocation(**json.loads(data)) if data else None
+            for city_name, data in zip(city_names, values, strict=True)
+        }
+        hits = sum(1 for location in results.values() if location is not None)
+        CACHE_REQUESTS.labels(tier="geocode_redis", result="hit").inc(hits)
+        CACHE_REQUESTS.labels(tier="geocode_redis", result="miss").inc(len(city_names) - hits)
+        return results
+
+    async def get_locations(self, city_names: list[str]) -> dict[str, GeoLocation | None]:
+        if not city_names:
+            return {}
+        try:
+            return await self._get_locations_impl(city_names)
+        except CircuitBreakerError:
+            logger.warning(
+                "Geocode cache Circuit Breaker OPEN for MGET. Treating as MISS.",
+                extra={"throttle_key": "geocode_cache_circuit_open"},
+            )
+        except Exception as e:
+            logger.warning(
+                f"Geocode cache READ error: {e}", extra={"throttle_key": "geocode_cache_error"}
+            )
+        CACHE_REQUESTS.labels(tier="geocode_redis", result="error").inc(len(city_names))
+        return dict.fromkeys(city_names)
+
+    @circuit(failure_threshold=3, recovery_timeout=30, name="geocode_cache_set_many")
+    async def _set_locations_impl(self, items: dict[str, GeoLocation]):
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for city_name, location in items.items():
+                pipe.set(self._key(city_name), json.dumps(asdict(location)), ex=self.ttl)
+            with REDIS_COMMAND_DURATION.labels(command="pipeline").time():
+                await pipe.execute()
+
+    async def set_locations(self, items: dict[str, GeoLocation]):
+        if not items:
+            return
+        try:
+            await self._set_locations_impl(items)
+        except CircuitBreakerError:
+            logger.warning(
+                "Geocode cache Circuit Breaker OPEN for pipelined SET. skipping write.",
+                extra={"throttle_key": "geocode_cache_circuit_open"},
+            )
+        except Exception as e:
+            logger.warning(
+                f"Geocode cache WRITE error: {e}", extra={"throttle_key": "geocode_cache_error"}
+            )
+
+
+class LRUGeocodeCache(GeocodeCachePort):
+    """In-process LRU tier, optionally backed by a shared (Redis) geocode cache."""
+
+    def __init__(self, backend: GeocodeCachePort | None = None, maxsize: int = 10_000):
+        self.backend = backend
+        self.lru = LRUCache(maxsize=maxsize)
+
+    async def get_location(self, city_name: str) -> GeoLocation | None:
+        key = normalize_city(city_name)
+        location = self.lru.get(key)
+        CACHE_REQUESTS.labels(tier="geocode_l1", result="miss" if location is None else "hit").inc()
+        if location is not None or self.backend is None:
+            return location
+
+        location = await self.backend.get_location(city_name)
+        if location is not None:
+            self.lru.set(key, location)
+        return location
+
+    async def set_location(self, city_name: str, location: GeoLocation):
+        self.lru.set(normalize_city(city_name), location)
+        if self.backend is not None:
+            await self.backend.set_location(city_name, location)
+
+    async def get_locations(self, city_names: list[str]) -> dict[str, GeoLocation | None]:
+        results: dict[str, GeoLocation | None] = {}
+        misses = []
+        for city_name in city_names:
+            location = self.lru.get(normalize_city(city_name))
+            results[city_name] = location
+            if location is None:
+                misses.append(city_name)
+        CACHE_REQUESTS.labels(tier="geocode_l1", result="hit").inc(len(city_names) - len(misses))
+        CACHE_REQUESTS.labels(tier="geocode_l1", result="miss").inc(len(misses))
+
+        if misses and self.backend is not None:
+            for city_name, location in (await self.backend.get_locations(misses)).items():
+                results[city_name] = location
+                if location is not None:
+                    self.lru.set(normalize_city(city_name), location)
+        return results
+
+    async def set_locations(self, items: dict[str, GeoLocation]):
+        for city_name, location in items.items():
+            self.lru.set(normalize_city(city_name), location)
+        if self.backend is not None:
+            await self.backend.set_locations(items)
@@ -0,0 +1,177 @@
+import bisect
+import heapq
+import logging
+import mmap
+import struct
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+
+from core.domain.models import GeoLocation
+from core.domain.normalization import normalize_city
+from core.domain.ports import GeocoderPort
+
+logger = logging.getLogger(__name__)
+
+# File layout (little-endian):
+#   header   magic, record count, offset of the string table
+#   records  fixed-size, sorted by (normalized key bytes, population desc)
+#   strings  u16 length + UTF-8 bytes, deduplicated (timezones, display names)
+MAGIC = b"WPGEO001"
+_HEADER = struct.Struct("<8sII")
+# key offset, display name offset, timezone offset, latitude, longitude, population
+_RECORD = struct.Struct("<IIIffI")
+_LENGTH = struct.Struct("<H")
+
+# GeoNames dump columns (tab-separated, no header)
+_NAME, _ASCIINAME, _ALTERNATES, _LAT, _LON, _POPULATION, _TIMEZONE = 1, 2, 3, 4, 5, 14, 17
+
+
+@dataclass(frozen=True)
+class Place:
+    name: str
+    latitude: float
+    longitude: float
+    timezone: str
+    population: int
+    aliases: tuple[str, ...] = ()
+
+
+def read_geonames(
+    path: str | Path, min_population: int = 0, alternate_names: bool = False
+) -> Iterable[Place]:
+    """Places from a GeoNames dump such as cities15000.txt."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            columns = line.rstrip("\n").split("\t")
+            if len(columns) <= _TIMEZONE:
+                continue
+            population = int(columns[_POPULATION] or 0)
+            if population < min_population:
+                continue
+            aliases = [columns[_ASCIINAME]]
+            if alternate_names and columns[_ALTERNATES]:
+                aliases.extend(columns[_ALTERNATES].split(","))
+            yield Place(
+                name=columns[_NAME],
+                latitude=float(columns[_LAT]),
+                longitude=float(columns[_LON]),
+                timezone=columns[_TIMEZONE] or "UTC",
+                population=population,
+                aliases=tuple(aliases),
+            )
+
+
+def build_index(places: Iterable[Place], path: str | Path) -> int:
+    """Write a geocoding index; every name and alias becomes a key. Returns the key count."""
+    entries = []
+    for place in places:
+        keys = {normalize_city(name).encode() for name in (place.name, *place.aliases)}
+        keys.discard(b"")
+        entries.extend((key, place) for key in keys)
+    entries.sort(key=lambda entry: (entry[0], -entry[1].population))
+
+    strings = bytearray()
+    offsets: dict[bytes, int] = {}
+
+    def intern(value: bytes) -> int:
+        offset = offsets.get(value)
+        if offset is None:
+            offset = offsets[value] = len(strings)
+            strings.extend(_LENGTH.pack(len(value)))
+            strings.extend(value)
+        return offset
+
+    records = bytearray()
+    for key, place in entries:
+        records.extend(
+            _RECORD.pack(
+                intern(key),
+                intern(place.name.encode()),
+                intern(place.timezone.encode()),
+                place.latitude,
+                place.longitude,
+                min(place.population, 0xFFFFFFFF),
+            )
+        )
+
+    strings_offset = _HEADER.size + len(records)
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, len(entries), strings_offset))
+        f.write(records)
+        f.write(strings)
+    return len(entries)
+
+
+class LocalGeocoder(GeocoderPort):
+    """Offline geocoder over a memory-mapped index built by `build_index`.
+
+    Lookups binary-search the sorted records straight from the mapping, so the
+    index costs page cache rather than Python heap and loads instantly.
+    """
+
+    def __init__(self, path: str | Path):
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._count, self._strings = _HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a geocoding index")
+        logger.info(f"Loaded local geocoding index with {self._count} names from {path}")
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _string(self, offset: int) -> bytes:
+        start = self._strings + offset
+        (length,) = _LENGTH.unpack_from(self._map, start)
+        return self._map[start + _LENGTH.size : start + _LENGTH.size + length]
+
+    def _record(self, index: int) -> tuple:
+        return _RECORD.unpack_from(self._map, _HEADER.size + index * _RECORD.size)
+
+    def _key(self, index: int) -> bytes:
+        return self._string(self._record(index)[0])
+
+    def _location(self, index: int) -> GeoLocation:
+        _, name, timezone, latitude, longitude, _ = self._record(index)
+        return GeoLocation(
+            name=self._string(name).decode(),
+            latitude=round(latitude, 4),
+            longitude=round(longitude, 4),
+            timezone=self._string(timezone).decode(),
+        )
+
+    def _first_at_or_after(self, key: bytes) -> int:
+        return bisect.bisect_left(range(self._count), key, key=self._key)
+
+    async def lookup(self, city_name: str) -> GeoLocation | None:
+        key = normalize_city(city_name).encode()
+        index = self._first_at_or_after(key)
+        # Records with equal keys are ordered by population, largest first.
+        if index < self._count and self._key(index) == key:
+            return self._location(index)
+        return None
+
+    async def search(self, prefix: str, limit: int = 10) -> list[GeoLocation]:
+        key = normalize_city(prefix).encode()
+        matches = []
+        index = self._first_at_or_after(key)
+        while index < self._count and self._key(index).startswith(key):
+            matches.append((self._record(index)[5], index))
+            index += 1
+
+        results, seen = [], set()
+        for _, index in heapq.nlargest(len(matches), matches):
+            # A place indexed under several matching aliases is listed once.
+            place = self._record(index)[1:5]
+            if place not in seen:
+                seen.add(place)
+                results.append(self._location(index))
+                if len(results) == limit:
+                    break
+        return results
+
+    def close(self):
+        self._map.close()
+        self._file.close()
@@ -1,6 +1,26 @@
+import atexit
 import json
 import logging
+import queue
+import random
 import sys
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+
+from infra.metrics import DROPPED_LOG_RECORDS, SUPPRESSED_LOG_RECORDS
+from infra.request_context import request_id_ctx_var
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def _dumps(log_record: dict) -> str:
+    if orjson is not None:
+        return orjson.dumps(log_record, default=str).decode()
+    return json.dumps(log_record, default=str)
 
 
 class JsonFormatter(logging.Formatter):
@@ -14,17 +34,121 @@ class JsonFormatter(logging.Formatter):
         if record.exc_info:
             log_record["exception"] = self.formatException(record.exc_info)
 
-        # Inject Request ID if available
-        from infra.request_context import request_id_ctx_var
-
-        req_id = request_id_ctx_var.get()
+        # Inject Request ID if available. Queued records carry the ID captured
+        # on the emitting task, since the listener thread has no request context.
+        req_id = getattr(record, "request_id", None) or request_id_ctx_var.get()
         if req_id:
             log_record["request_id"] = req_id
 
-        return json.dumps(log_record)
+        return _dumps(log_record)
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """Hands records to a bounded queue; formatting and I/O happen on the listener thread.
+
+    When the queue is full, records are dropped (and counted) unless `block` is
+    set, in which case the caller waits for space.
+    """
+
+    def __init__(self, log_queue: queue.Queue, block: bool = False):
+        super().__init__(log_queue)
+        self.block = block
+
+    def prepare(self, record):
+        # Capture everything that depends on the emitting task, but leave the
+        # JSON formatting to the listener.
+        record.request_id = request_id_ctx_var.get()
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record):
+        if self.block:
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            DROPPED_LOG_RECORDS.inc()
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps a fraction of hot-path records tagged with `extra={"sample_key": ...}`.
+
+    Untagged records and anything at WARNING or above are always kept; callers
+    leave the tag off for records that must not be sampled (e.g. slow requests).
+    """
+
+    def __init__(self, rates: dict[str, float]):
+        super().__init__()
+        self.rates = rates
+
+    def filter(self, record):
+        key = getattr(record, "sample_key", None)
+        if key is None or record.levelno >= logging.WARNING:
+            return True
+        if random.random() < self.rates.get(key, 1.0):
+            return True
+        SUPPRESSED_LOG_RECORDS.labels(reason="sampled").inc()
+        return False
+
+
+class ThrottleFilter(logging.Filter):
+    """Collapses repeated records tagged with `extra={"throttle_key": ...}`.
+
+    The first record per key is emitted; further ones within `window` seconds
+    are counted and the count is appended to the next record emitted after the
+    window, so a burst becomes one line plus a periodic summary.
+    """
+
+    def __init__(self, window: float = 60.0):
+        super().__init__()
+        self.window = window
+        self._state: dict[str, list] = {}  # key -> [window start, suppressed count]
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        key = getattr(record, "throttle_key", None)
+        if key is None or self.window <= 0:
+            return True
+
+        now = time.monotonic()
+        with self._lock:
+            state = self._state.get(key)
+            if state is not None and now - state[0] < self.window:
+                state[1] += 1
+                SUPPRESSED_LOG_RECORDS.labels(reason="throttled").inc()
+                return False
+            suppressed = state[1] if state is not None else 0
+            self._state[key] = [now, 0]
+
+        if suppressed:
+            record.msg = (
+                f"{record.getMessage()} "
+                f"({suppressed} similar messages suppressed in the last {self.window:.0f}s)"
+            )
+            record.args = None
+        return True
+
+
+def setup_logging(
+    queue_size: int = 10_000,
+    block_when_full: bool = False,
+    sample_rates: dict[str, float] | None = None,
+    throttle_window: float = 60.0,
+) -> QueueListener:
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(JsonFormatter())
 
+    log_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+    listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    listener.start()
+    # Flush whatever is still queued when the process exits.
+    atexit.register(listener.stop)
 
-def setup_logging():
-    handler = logging.StreamHandler(sys.stdout)
-    handler.setFormatter(JsonFormatter())
+    # Filters run before enqueueing, so dropped records cost no formatting at all.
+    handler = NonBlockingQueueHandler(log_queue, block=block_when_full)
+    handler.addFilter(SamplingFilter(sample_rates or {}))
+    handler.addFilter(ThrottleFilter(throttle_window))
     logging.basicConfig(level=logging.INFO, handlers=[handler])
+    return listener
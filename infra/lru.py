@@ -0,0 +1,62 @@
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+
+class LRUCache:
+    """Bounded in-process LRU map with optional per-entry TTL.
+
+    Not thread-safe; intended for use from a single event loop.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float | None = None,
+        on_evict: Callable[[str], None] | None = None,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.on_evict = on_evict
+        self._data: OrderedDict[str, tuple[float | None, Any]] = OrderedDict()
+
+    def get(self, key: str) -> Any | None:
+        item = self._data.get(key)
+        if item is None:
+            return None
+
+        expires_at, value = item
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            self._evicted(key)
+            return None
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl: float | None = None):
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            evicted_key, _ = self._data.popitem(last=False)
+            self._evicted(evicted_key)
+
+    def _evicted(self, key: str):
+        if self.on_evict is not None:
+            self.on_evict(key)
+
+    def pop(self, key: str) -> Any | None:
+        item = self._data.pop(key, None)
+        return item[1] if item is not None else None
+
+    def clear(self):
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._data
@@ -0,0 +1,98 @@
+from circuitbreaker import STATE_CLOSED, STATE_HALF_OPEN, STATE_OPEN, CircuitBreakerMonitor
+from prometheus_client import REGISTRY, Counter, Gauge, Histogram
+from prometheus_client.core import GaugeMetricFamily
+
+# Metrics are registered on the default registry, which is what the
+# Instrumentator exposes on /metrics.
+
+COALESCED_REQUESTS = Counter(
+    "weather_coalesced_requests_total",
+    "Callers that reused an in-flight upstream fetch instead of starting their own",
+    ["scope"],
+)
+
+COALESCING_INFLIGHT = Gauge(
+    "weather_coalescing_inflight",
+    "Upstream fetches currently in flight in the request coalescer",
+)
+
+CACHE_REQUESTS = Counter(
+    "weather_cache_requests_total",
+    "Cache lookups by tier and result (hit, miss or error)",
+    ["tier", "result"],
+)
+
+REDIS_COMMAND_DURATION = Histogram(
+    "redis_command_duration_seconds",
+    "Latency of Redis commands issued by the cache adapters",
+    ["command"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+
+UPSTREAM_REQUEST_DURATION = Histogram(
+    "weather_upstream_request_duration_seconds",
+    "Latency of Open-Meteo calls by endpoint and HTTP status (0 = no response)",
+    ["endpoint", "status"],
+    buckets=(0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+
+CACHE_WRITE_QUEUE_DEPTH = Gauge(
+    "weather_cache_write_queue_depth",
+    "Cache writes queued for the write-behind worker",
+    ["tier"],
+)
+
+CACHE_WRITES_DROPPED = Counter(
+    "weather_cache_writes_dropped_total",
+    "Queued cache writes that were never written (queue_full, error or shutdown)",
+    ["tier", "reason"],
+)
+
+CACHE_EVICTIONS = Counter(
+    "weather_cache_evictions_total",
+    "Entries evicted from an in-process cache tier (size or TTL)",
+    ["tier"],
+)
+
+DEGRADED_RESPONSES = Counter(
+    "weather_degraded_responses_total",
+    "Responses served from the last-known-good store while the provider was unavailable",
+)
+
+DROPPED_LOG_RECORDS = Counter(
+    "log_records_dropped_total",
+    "Log records dropped because the logging queue was full",
+)
+
+SUPPRESSED_LOG_RECORDS = Counter(
+    "log_records_suppressed_total",
+    "Log records skipped by sampling or collapsed by throttling",
+    ["reason"],
+)
+
+
+class CircuitBreakerCollector:
+    """Exports the state of every registered circuit breaker at scrape time."""
+
+    STATES = (STATE_CLOSED, STATE_OPEN, STATE_HALF_OPEN)
+
+    def collect(self):
+        state = GaugeMetricFamily(
+            "circuit_breaker_state",
+            "1 for the current state of each circuit breaker, 0 otherwise",
+            labels=["name", "state"],
+        )
+        failures = GaugeMetricFamily(
+            "circuit_breaker_failures",
+            "Consecutive failures counted by each circuit breaker",
+            labels=["name"],
+        )
+        for breaker in CircuitBreakerMonitor.get_circuits():
+            for name in self.STATES:
+                state.add_metric([breaker.name, name], 1.0 if breaker.state == name else 0.0)
+            failures.add_metric([breaker.name], breaker.failure_count)
+        yield state
+        yield failures
+
+
+REGISTRY.register(CircuitBreakerCollector())
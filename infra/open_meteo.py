@@ -1,21 +1,69 @@
+import asyncio
+import itertools
 import json
 import logging
 import time
+from collections.abc import Awaitable, Callable
 
 import httpx
 from circuitbreaker import CircuitBreakerError, circuit
 
 from core.domain.exceptions import CityNotFound, ServiceUnavailable
-from core.domain.models import WeatherEntity
-from core.domain.ports import WeatherProviderPort
+from core.domain.forecast import Forecast
+from core.domain.models import FORECAST_VARIABLES, GeoLocation, WeatherEntity
+from core.domain.ports import GeocodeCachePort, GeocoderPort, WeatherProviderPort
+from infra.metrics import UPSTREAM_REQUEST_DURATION
 
 logger = logging.getLogger(__name__)
 
+# One breaker shared by every upstream entry point (single and multi-location).
+open_meteo_circuit = circuit(failure_threshold=5, recovery_timeout=60, name="open_meteo")
+
+# Open-Meteo hourly variable for each forecast variable of the domain model
+HOURLY_VARIABLES = {
+    "temperature": "temperature_2m",
+    "humidity": "relative_humidity_2m",
+    "precipitation": "precipitation",
+    "wind_speed": "wind_speed_10m",
+}
+
 
 class OpenMeteoProvider(WeatherProviderPort):
-    def __init__(self):
+    def __init__(
+        self,
+        client: httpx.AsyncClient | None = None,
+        *,
+        geocode_cache: GeocodeCachePort | None = None,
+        local_geocoder: GeocoderPort | None = None,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 10.0,
+        connect_timeout: float = 5.0,
+        http2: bool = True,
+        max_batch_locations: int = 50,
+        forecast_hours: int = 48,
+    ):
         self.geo_base_url = "https://geocoding-api.open-meteo.com/v1/search"
         self.weather_base_url = "https://api.open-meteo.com/v1/forecast"
+        self.geocode_cache = geocode_cache
+        self.local_geocoder = local_geocoder
+        self.max_batch_locations = max_batch_locations
+        # Every forecast is fetched for the full horizon and all variables;
+        # clients pick their hours and variables from the cached entry.
+        self.forecast_hours = forecast_hours
+
+        # One long-lived client per provider so connections (and TLS sessions)
+        # to the geocoding and forecast hosts are reused across cache misses.
+        self.client = client or httpx.AsyncClient(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(timeout, connect=connect_timeout),
+        )
 
     async def _fetch_with_metrics(
         self, client: httpx.AsyncClient, url: str, params: dict, endpoint_type: str
@@ -26,6 +74,9 @@ class OpenMeteoProvider(WeatherProviderPort):
         try:
             response = await client.get(url, params=params)
             status_code = response.status_code
+            UPSTREAM_REQUEST_DURATION.labels(endpoint=endpoint_type, status=status_code).observe(
+                time.time() - start_time
+            )
             response.raise_for_status()
 
             # Success Log
@@ -38,13 +89,18 @@ class OpenMeteoProvider(WeatherProviderPort):
                 "duration_ms": round(duration_ms, 2),
                 "url": str(response.url),
             }
-            logger.info(json.dumps(log_data))
+            logger.info(json.dumps(log_data), extra={"sample_key": "upstream_call"})
 
             return response.json()
 
         except httpx.HTTPError as e:
             # Failure Log
             duration_ms = (time.time() - start_time) * 1000
+            if not status_code:
+                # No response at all (connect error, timeout): still worth a sample.
+                UPSTREAM_REQUEST_DURATION.labels(endpoint=endpoint_type, status=0).observe(
+                    duration_ms / 1000
+                )
             log_data = {
                 "event": "upstream_call_error",
                 "provider": "open_meteo",
@@ -56,65 +112,228 @@ class OpenMeteoProvider(WeatherProviderPort):
             logger.error(json.dumps(log_data))
             raise
 
-    @circuit(failure_threshold=5, recovery_timeout=60)
-    async def _get_weather_impl(self, city_name: str) -> WeatherEntity:
-        async with httpx.AsyncClient() as client:
-            # 1. Geocoding
-            geo_params = {"name": city_name, "count": 1, "language": "en", "format": "json"}
-            logger.info(f"Geocoding city: {city_name}")
+    async def _lookup_local(self, city_name: str) -> GeoLocation | None:
+        if self.local_geocoder is None:
+            return None
+        return await self.local_geocoder.lookup(city_name)
 
-            data = await self._fetch_with_metrics(
-                client, self.geo_base_url, geo_params, "geocoding"
-            )
+    async def _resolve_locations(
+        self,
+        city_names: list[str],
+        geocode: Callable[[str], Awaitable[GeoLocation]],
+    ) -> dict[str, GeoLocation | BaseException]:
+        """Locations from the local index, then the geocode cache, then `geocode` (the API).
 
-            if not data.get("results"):
-                logger.warning(f"City not found: {city_name}")
-                raise CityNotFound(city_name)
-
-            location = data["results"][0]
-            lat = location["latitude"]
-            lon = location["longitude"]
-            timezone = location.get("timezone", "UTC")
-
-            # 2. Weather Fetch
-            weather_params = {
-                "latitude": lat,
-                "longitude": lon,
-                "current": ["temperature_2m", "relative_humidity_2m"],
-                "hourly": ["temperature_2m"],
-                "timezone": timezone,
-                "forecast_days": 1,
-            }
+        The cache is read and written once for all names, and only misses of
+        both reach the API. Per-city failures are returned as exception values.
+        """
+        known: dict[str, GeoLocation | None] = {
+            city_name: await self._lookup_local(city_name) for city_name in city_names
+        }
+        unresolved = [city_name for city_name, location in known.items() if location is None]
+        if unresolved and self.geocode_cache is not None:
+            known.update(await self.geocode_cache.get_locations(unresolved))
+        to_geocode = [city_name for city_name, location in known.items() if location is None]
+
+        outcomes = await asyncio.gather(
+            *(geocode(city_name) for city_name in to_geocode), return_exceptions=True
+        )
+        resolved: dict[str, GeoLocation | BaseException] = dict(known)
+        geocoded = {}
+        for city_name, outcome in zip(to_geocode, outcomes, strict=True):
+            resolved[city_name] = outcome
+            if isinstance(outcome, GeoLocation):
+                geocoded[city_name] = outcome
+        if geocoded and self.geocode_cache is not None:
+            await self.geocode_cache.set_locations(geocoded)
+        return resolved
+
+    async def _resolve_location(
+        self, city_name: str, geocode: Callable[[str], Awaitable[GeoLocation]]
+    ) -> GeoLocation:
+        location = (await self._resolve_locations([city_name], geocode))[city_name]
+        if isinstance(location, BaseException):
+            raise location
+        return location
 
-            logger.info(f"Fetching weather for {city_name} at ({lat}, {lon})")
+    async def _geocode(self, city_name: str) -> GeoLocation:
+        geo_params = {"name": city_name, "count": 1, "language": "en", "format": "json"}
+        logger.info(f"Geocoding city: {city_name}")
 
-            w_data = await self._fetch_with_metrics(
-                client, self.weather_base_url, weather_params, "forecast"
+        data = await self._fetch_with_metrics(
+            self.client, self.geo_base_url, geo_params, "geocoding"
+        )
+
+        if not data.get("results"):
+            logger.warning(f"City not found: {city_name}")
+            raise CityNotFound(city_name)
+
+        result = data["results"][0]
+        return GeoLocation(
+            name=result["name"],
+            latitude=result["latitude"],
+            longitude=result["longitude"],
+            timezone=result.get("timezone", "UTC"),
+        )
+
+    def _forecast_params(self, locations: list[GeoLocation]) -> dict:
+        if len(locations) == 1:
+            latitude, longitude, timezone = (
+                locations[0].latitude,
+                locations[0].longitude,
+                locations[0].timezone,
             )
+        else:
+            # Open-Meteo accepts comma-separated coordinates (and timezones)
+            # and answers with one result object per location, in order.
+            latitude = ",".join(str(location.latitude) for location in locations)
+            longitude = ",".join(str(location.longitude) for location in locations)
+            timezone = ",".join(location.timezone for location in locations)
+
+        return {
+            "latitude": latitude,
+            "longitude": longitude,
+            "current": ["temperature_2m", "relative_humidity_2m"],
+            "hourly": [HOURLY_VARIABLES[variable] for variable in FORECAST_VARIABLES],
+            "timezone": timezone,
+            "forecast_hours": self.forecast_hours,
+        }
+
+    @staticmethod
+    def _to_entity(location: GeoLocation, w_data: dict) -> WeatherEntity:
+        current = w_data.get("current", {})
+        hourly = w_data.get("hourly", {})
 
-            # 3. Map to Entity
-            current = w_data.get("current", {})
-            hourly = w_data.get("hourly", {})
-
-            # Construct forecast list
-            forecast_list = []
-            if "time" in hourly and "temperature_2m" in hourly:
-                times = hourly["time"]
-                temps = hourly["temperature_2m"]
-                # Take next 5 hours
-                for i in range(min(5, len(times))):
-                    forecast_list.append({"time": times[i], "temperature": temps[i]})
-
-            return WeatherEntity(
-                city=location["name"],
-                temperature=current.get("temperature_2m", 0.0),
-                humidity=current.get("relative_humidity_2m", 0.0),
-                forecast=forecast_list,
+        # The upstream arrays become the forecast columns as they are (no per-hour rows)
+        forecast = Forecast()
+        if "time" in hourly and "temperature_2m" in hourly:
+            forecast = Forecast(
+                hourly["time"],
+                {
+                    variable: hourly[name]
+                    for variable, name in HOURLY_VARIABLES.items()
+                    if name in hourly
+                },
             )
 
+        return WeatherEntity(
+            city=location.name,
+            temperature=current.get("temperature_2m", 0.0),
+            humidity=current.get("relative_humidity_2m", 0.0),
+            forecast=forecast,
+            fetched_at=time.time(),
+        )
+
+    async def _fetch_forecast(self, location: GeoLocation) -> WeatherEntity:
+        logger.info(
+            f"Fetching weather for {location.name} at ({location.latitude}, {location.longitude})"
+        )
+        w_data = await self._fetch_with_metrics(
+            self.client, self.weather_base_url, self._forecast_params([location]), "forecast"
+        )
+        return self._to_entity(location, w_data)
+
+    async def _fetch_forecast_many(self, locations: list[GeoLocation]) -> list[WeatherEntity]:
+        if len(locations) == 1:
+            return [await self._fetch_forecast(locations[0])]
+
+        logger.info(f"Fetching weather for {len(locations)} locations in one request")
+        w_data = await self._fetch_with_metrics(
+            self.client, self.weather_base_url, self._forecast_params(locations), "forecast"
+        )
+        if not isinstance(w_data, list) or len(w_data) != len(locations):
+            raise ValueError("Unexpected multi-location forecast response")
+        return [
+            self._to_entity(location, item)
+            for location, item in zip(locations, w_data, strict=True)
+        ]
+
+    @open_meteo_circuit
+    async def _get_weather_impl(self, city_name: str) -> WeatherEntity:
+        # 1. Geocoding (skipped when the location is already cached). This call
+        # is already inside the breaker, so the API is called without it.
+        location = await self._resolve_location(city_name, self._geocode)
+
+        # 2. Weather Fetch
+        return await self._fetch_forecast(location)
+
+    @open_meteo_circuit
+    async def _geocode_impl(self, city_name: str) -> GeoLocation:
+        return await self._geocode(city_name)
+
+    @open_meteo_circuit
+    async def _fetch_forecast_impl(self, location: GeoLocation) -> WeatherEntity:
+        return await self._fetch_forecast(location)
+
+    @open_meteo_circuit
+    async def _get_weather_many_impl(self, locations: list[GeoLocation]) -> list[WeatherEntity]:
+        return await self._fetch_forecast_many(locations)
+
     async def get_weather(self, city_name: str) -> WeatherEntity:
         try:
             return await self._get_weather_impl(city_name)
         except CircuitBreakerError:
-            logger.error("Circuit Breaker OPEN for Provider. Service Unavailable.")
+            logger.error(
+                "Circuit Breaker OPEN for Provider. Service Unavailable.",
+                extra={"throttle_key": "provider_circuit_open"},
+            )
             raise ServiceUnavailable("Weather Provider") from None
+
+    async def geocode(self, city_name: str) -> GeoLocation:
+        # Local and cached locations stay resolvable while the provider circuit is open.
+        try:
+            return await self._resolve_location(city_name, self._geocode_impl)
+        except CircuitBreakerError as e:
+            raise self._map_error(e) from None
+
+    async def get_weather_at(self, location: GeoLocation) -> WeatherEntity:
+        try:
+            return await self._fetch_forecast_impl(location)
+        except CircuitBreakerError as e:
+            raise self._map_error(e) from None
+
+    async def get_weather_many(self, city_names: list[str]) -> dict[str, WeatherEntity | Exception]:
+        """Geocode each city, then fetch forecasts for up to `max_batch_locations` per request."""
+        results: dict[str, WeatherEntity | Exception] = {}
+        located = {}
+        for city_name, location in (
+            await self._resolve_locations(city_names, self._geocode_impl)
+        ).items():
+            if isinstance(location, GeoLocation):
+                located[city_name] = location
+            else:
+                results[city_name] = self._map_error(location)
+
+        entities = await self.get_weather_at_many(list(located.values()))
+        results.update(zip(located, entities, strict=True))
+        return results
+
+    async def get_weather_at_many(
+        self, locations: list[GeoLocation]
+    ) -> list[WeatherEntity | Exception]:
+        """Forecasts for up to `max_batch_locations` locations per request."""
+        results: list[WeatherEntity | Exception] = []
+        for chunk in itertools.batched(locations, self.max_batch_locations):
+            try:
+                results.extend(await self._get_weather_many_impl(list(chunk)))
+            except Exception as e:
+                results.extend([self._map_error(e)] * len(chunk))
+        return results
+
+    @staticmethod
+    def _map_error(error: BaseException) -> BaseException:
+        if isinstance(error, CircuitBreakerError):
+            logger.error(
+                "Circuit Breaker OPEN for Provider. Service Unavailable.",
+                extra={"throttle_key": "provider_circuit_open"},
+            )
+            return ServiceUnavailable("Weather Provider")
+        return error
+
+    async def close(self):
+        """Close the pooled HTTP client gracefully."""
+        try:
+            await self.client.aclose()
+            logger.info("Open-Meteo HTTP client closed successfully")
+        except Exception as e:
+            logger.warning(f"Error closing Open-Meteo HTTP client: {e}")
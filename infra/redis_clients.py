@@ -0,0 +1,132 @@
+from dataclasses import dataclass
+from typing import Any
+
+import redis.asyncio as redis
+from redis.asyncio.cluster import RedisCluster
+from redis.asyncio.sentinel import Sentinel
+from redis.cluster import LoadBalancingStrategy
+
+REDIS_MODES = ("standalone", "cluster", "sentinel")
+
+
+@dataclass
+class RedisClients:
+    """Clients for one Redis deployment: writes go to `primary`, reads to `reader`.
+
+    In cluster mode the single client routes by key slot (and to replicas
+    itself when `read_from_replicas` is on), so keys must use hash tags for
+    anything that has to land on one node.
+    """
+
+    primary: Any
+    replica: Any | None = None
+    cluster: bool = False
+
+    @property
+    def reader(self):
+        return self.replica if self.replica is not None else self.primary
+
+
+def create_redis_client(
+    redis_url: str,
+    *,
+    max_connections: int = 50,
+    pool_timeout: float = 5.0,
+    socket_timeout: float = 2.0,
+    socket_connect_timeout: float = 2.0,
+    health_check_interval: int = 30,
+) -> redis.Redis:
+    """Standalone client over a blocking pool, shared by every Redis-backed adapter.
+
+    When all `max_connections` are busy, callers wait up to `pool_timeout`
+    seconds for one to be released instead of failing immediately; that error
+    then surfaces like any other Redis failure (cache miss, breaker count).
+    """
+    pool = redis.BlockingConnectionPool.from_url(
+        redis_url,
+        decode_responses=False,
+        max_connections=max_connections,
+        timeout=pool_timeout,
+        socket_timeout=socket_timeout,
+        socket_connect_timeout=socket_connect_timeout,
+        health_check_interval=health_check_interval,
+    )
+    return redis.Redis.from_pool(pool)
+
+
+def _parse_sentinels(sentinels: str) -> list[tuple[str, int]]:
+    nodes = []
+    for node in sentinels.split(","):
+        host, _, port = node.strip().rpartition(":")
+        nodes.append((host, int(port)) if host else (port, 26379))
+    return nodes
+
+
+def create_redis_clients(
+    redis_url: str,
+    *,
+    mode: str = "standalone",
+    read_url: str | None = None,
+    read_from_replicas: bool = False,
+    sentinels: str | None = None,
+    sentinel_service: str = "mymaster",
+    max_connections: int = 50,
+    pool_timeout: float = 5.0,
+    socket_timeout: float = 2.0,
+    socket_connect_timeout: float = 2.0,
+    health_check_interval: int = 30,
+) -> RedisClients:
+    """Build clients for a standalone, cluster or sentinel-managed deployment.
+
+    - standalone: `redis_url` is the primary; `read_url`, if set, a replica.
+    - cluster: `redis_url` is any seed node; `read_from_replicas` spreads
+      reads over each slot's replicas.
+    - sentinel: `sentinels` is "host:port,host:port"; the primary and (with
+      `read_from_replicas`) a replica of `sentinel_service` are discovered
+      and followed across failovers.
+    """
+    if mode == "standalone":
+        options = {
+            "max_connections": max_connections,
+            "pool_timeout": pool_timeout,
+            "socket_timeout": socket_timeout,
+            "socket_connect_timeout": socket_connect_timeout,
+            "health_check_interval": health_check_interval,
+        }
+        replica = create_redis_client(read_url, **options) if read_url else None
+        return RedisClients(create_redis_client(redis_url, **options), replica)
+
+    connection_options = {
+        "decode_responses": False,
+        "socket_timeout": socket_timeout,
+        "socket_connect_timeout": socket_connect_timeout,
+        "health_check_interval": health_check_interval,
+    }
+    if mode == "cluster":
+        client = RedisCluster.from_url(
+            redis_url,
+            load_balancing_strategy=(
+                LoadBalancingStrategy.ROUND_ROBIN_REPLICAS if read_from_replicas else None
+            ),
+            max_connections=max_connections,
+            **connection_options,
+        )
+        return RedisClients(client, cluster=True)
+
+    if mode == "sentinel":
+        if not sentinels:
+            raise ValueError("Sentinel mode requires at least one sentinel address")
+        sentinel = Sentinel(
+            _parse_sentinels(sentinels),
+            sentinel_kwargs={"socket_timeout": socket_timeout},
+            **connection_options,
+        )
+        primary = sentinel.master_for(sentinel_service, max_connections=max_connections)
+        replica = (
+            sentinel.slave_for(sentinel_service, max_connections=max_connections)
+            if read_from_replicas
+            else None
+        )
+        return RedisClients(primary, replica)
+
+    raise ValueError(f"Unknown Redis mode: {mode} (expected one of {', '.join(REDIS_MODES)})")
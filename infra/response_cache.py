@@ -0,0 +1,90 @@
+import hashlib
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from core.domain.models import WeatherEntity
+from infra.lru import LRUCache
+from infra.metrics import CACHE_EVICTIONS, CACHE_REQUESTS
+
+
+@dataclass(frozen=True)
+class RenderedResponse:
+    body: bytes
+    etag: str  # Strong validator: quoted digest of the body
+
+    @classmethod
+    def from_body(cls, body: bytes) -> "RenderedResponse":
+        return cls(body, f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"')
+
+    def matches(self, if_none_match: str | None) -> bool:
+        """Whether an If-None-Match header lists this response's ETag (weak comparison)."""
+        if not if_none_match:
+            return False
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or self.etag in tags
+
+
+class ResponseCache:
+    """Serialized response bodies and ETags, built once per cached weather entry.
+
+    A body is keyed by the service's cache key and the upstream fetch time,
+    which together identify one version of a cache entry: every hit on that
+    version reuses the same bytes and ETag, and a refresh produces a new key.
+    (The entity's name is not enough: distinct places can share a name and be
+    fetched in the same request.) Entities without a fetch time cannot be told
+    apart and are rendered every time.
+
+    `ttl` and `soft_ttl` mirror the cache's hard and soft expiry and drive the
+    `Cache-Control` header, so HTTP caches keep an entry exactly as long as
+    this service would serve it.
+    """
+
+    def __init__(
+        self, maxsize: int = 1024, ttl: float | None = None, soft_ttl: float | None = None
+    ):
+        self.ttl = ttl
+        self.soft_ttl = soft_ttl
+        self._bodies = LRUCache(
+            maxsize=maxsize,
+            on_evict=lambda key: CACHE_EVICTIONS.labels(tier="response").inc(),
+        )
+
+    def get(
+        self,
+        entry_key: str,
+        weather: WeatherEntity,
+        render: Callable[[WeatherEntity], bytes],
+        variant: str = "",
+    ) -> RenderedResponse:
+        """Body of `weather`, cached under `entry_key`, as rendered by `render`.
+
+        `variant` names the response shape.
+        """
+        if weather.fetched_at is None or not self._bodies.maxsize:
+            return RenderedResponse.from_body(render(weather))
+
+        key = f"{entry_key}\0{weather.fetched_at!r}\0{variant}"
+        rendered = self._bodies.get(key)
+        if rendered is not None:
+            CACHE_REQUESTS.labels(tier="response", result="hit").inc()
+            return rendered
+        CACHE_REQUESTS.labels(tier="response", result="miss").inc()
+
+        rendered = RenderedResponse.from_body(render(weather))
+        self._bodies.set(key, rendered)
+        return rendered
+
+    def cache_control(self, weather: WeatherEntity) -> str:
+        """Fresh for the rest of the soft TTL, then usable while revalidating until hard expiry."""
+        if weather.degraded or weather.fetched_at is None or self.ttl is None:
+            return "no-cache"
+        age = time.time() - weather.fetched_at
+        remaining = max(0, int(self.ttl - age))
+        if self.soft_ttl is None or self.soft_ttl >= self.ttl:
+            return f"public, max-age={remaining}"
+        max_age = max(0, int(self.soft_ttl - age))
+        return f"public, max-age={max_age}, stale-while-revalidate={remaining - max_age}"
+
+    def __len__(self) -> int:
+        return len(self._bodies)
@@ -0,0 +1,206 @@
+import json
+import math
+import struct
+from abc import ABC, abstractmethod
+from array import array
+from dataclasses import fields
+
+from core.domain.forecast import Forecast
+from core.domain.models import WeatherEntity
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+# Binary payloads start with a version byte; legacy JSON entries start with "{".
+STRUCT_V1 = 0x01
+MSGPACK_V1 = 0x02
+STRUCT_V2 = 0x03
+
+# version, temperature, humidity, fetched_at (NaN = unknown), city length, forecast length
+_HEADER = struct.Struct("<BdddHH")
+# ... plus the length of the newline-separated forecast column names
+_HEADER_V2 = struct.Struct("<BdddHHH")
+
+
+def _nan_to_none(value: float | None) -> float | None:
+    return None if value is None or math.isnan(value) else value
+
+
+def _float_column(values) -> array:
+    """float64 array of a forecast column; None becomes NaN."""
+    if isinstance(values, array) and values.typecode == "d":
+        return values
+    return array("d", (math.nan if value is None else value for value in values))
+
+
+def _list_column(values) -> list:
+    """Plain list of a forecast column (for msgpack); NaN becomes None."""
+    if isinstance(values, list):
+        return values
+    return [_nan_to_none(value) for value in values]
+
+
+class WeatherSerializer(ABC):
+    name: str
+
+    @abstractmethod
+    def dumps(self, weather: WeatherEntity) -> bytes:
+        pass
+
+    def loads(self, data: bytes | str) -> WeatherEntity:
+        # Every serializer reads every format, so the write format can be
+        # switched without invalidating entries written by older replicas.
+        return decode_weather(data)
+
+
+class JsonSerializer(WeatherSerializer):
+    """Original format: the entity's fields as JSON, forecast as a list of row dicts."""
+
+    name = "json"
+
+    def dumps(self, weather: WeatherEntity) -> bytes:
+        payload = {field.name: getattr(weather, field.name) for field in fields(weather)}
+        payload["forecast"] = Forecast.of(weather.forecast).rows()
+        return json.dumps(payload).encode()
+
+
+class StructSerializer(WeatherSerializer):
+    """Fixed little-endian layout with a columnar forecast.
+
+    After the header come the city, the column names, one float64 array per
+    column (NaN = missing value) and the newline-separated times.
+    """
+
+    name = "struct"
+
+    def dumps(self, weather: WeatherEntity) -> bytes:
+        forecast = Forecast.of(weather.forecast)
+        city = weather.city.encode()
+        names = "\n".join(forecast.variables).encode()
+        times = "\n".join(forecast.time_values()).encode()
+        fetched_at = math.nan if weather.fetched_at is None else weather.fetched_at
+        header = _HEADER_V2.pack(
+            STRUCT_V2,
+            weather.temperature,
+            weather.humidity,
+            fetched_at,
+            len(city),
+            len(forecast),
+            len(names),
+        )
+        columns = [_float_column(forecast.column(name)) for name in forecast.variables]
+        return b"".join((header, city, names, *columns, times))
+
+
+class MsgpackSerializer(WeatherSerializer):
+    """msgpack map with the forecast stored as parallel columns."""
+
+    name = "msgpack"
+
+    def __init__(self):
+        if msgpack is None:
+            raise RuntimeError("msgpack is not installed (pip install msgpack)")
+
+    def dumps(self, weather: WeatherEntity) -> bytes:
+        forecast = Forecast.of(weather.forecast)
+        payload = {
+            "c": weather.city,
+            "t": weather.temperature,
+            "h": weather.humidity,
+            "f": weather.fetched_at,
+            "ft": list(forecast.time_values()),
+            "fv": _list_column(forecast.column("temperature")),
+            # Other variables by column; absent in entries from older replicas.
+            "fx": {
+                name: _list_column(forecast.column(name))
+                for name in forecast.variables
+                if name != "temperature"
+            },
+        }
+        return bytes([MSGPACK_V1]) + msgpack.packb(payload)
+
+
+def _decode_struct(data: bytes) -> WeatherEntity:
+    _, temperature, humidity, fetched_at, city_len, n = _HEADER.unpack_from(data)
+    offset = _HEADER.size
+    city = data[offset : offset + city_len].decode()
+    offset += city_len
+    temps = array("d")
+    temps.frombytes(memoryview(data)[offset : offset + n * 8])
+    offset += n * 8
+    times = data[offset:].decode().split("\n") if n else []
+    return WeatherEntity(
+        city=city,
+        temperature=temperature,
+        humidity=humidity,
+        forecast=Forecast(times, {"temperature": temps}),
+        fetched_at=None if math.isnan(fetched_at) else fetched_at,
+    )
+
+
+def _decode_struct_v2(data: bytes) -> WeatherEntity:
+    _, temperature, humidity, fetched_at, city_len, n, names_len = _HEADER_V2.unpack_from(data)
+    offset = _HEADER_V2.size
+    city = data[offset : offset + city_len].decode()
+    offset += city_len
+    columns = data[offset : offset + names_len].decode().split("\n") if names_len else []
+    offset += names_len
+    view = memoryview(data)
+    values = {}
+    for column in columns:
+        values[column] = array("d")
+        values[column].frombytes(view[offset : offset + n * 8])
+        offset += n * 8
+    times = data[offset:].decode().split("\n") if n else []
+    return WeatherEntity(
+        city=city,
+        temperature=temperature,
+        humidity=humidity,
+        forecast=Forecast(times, values),
+        fetched_at=_nan_to_none(fetched_at),
+    )
+
+
+def _decode_msgpack(data: bytes) -> WeatherEntity:
+    if msgpack is None:
+        raise RuntimeError("msgpack entry found but msgpack is not installed")
+    payload = msgpack.unpackb(data[1:])
+    return WeatherEntity(
+        city=payload["c"],
+        temperature=payload["t"],
+        humidity=payload["h"],
+        forecast=Forecast(payload["ft"], {"temperature": payload["fv"], **payload.get("fx", {})}),
+        fetched_at=payload["f"],
+    )
+
+
+def decode_weather(data: bytes | str) -> WeatherEntity:
+    """Decode any supported cache format, dispatching on the first byte."""
+    if isinstance(data, str):
+        data = data.encode()
+    version = data[0]
+    if version == STRUCT_V2:
+        return _decode_struct_v2(data)
+    if version == STRUCT_V1:
+        return _decode_struct(data)
+    if version == MSGPACK_V1:
+        return _decode_msgpack(data)
+    payload = json.loads(data)
+    payload["forecast"] = Forecast.from_rows(payload["forecast"])
+    return WeatherEntity(**payload)
+
+
+SERIALIZERS = {
+    JsonSerializer.name: JsonSerializer,
+    StructSerializer.name: StructSerializer,
+    MsgpackSerializer.name: MsgpackSerializer,
+}
+
+
+def get_serializer(name: str) -> WeatherSerializer:
+    try:
+        return SERIALIZERS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown cache serializer: {name}") from None
@@ -0,0 +1,125 @@
+import asyncio
+import logging
+import time
+from collections import Counter
+
+from core.domain.normalization import normalize_city
+from core.services import WeatherService
+
+logger = logging.getLogger(__name__)
+
+
+class CacheWarmer:
+    """Keeps the most requested cities warm by refreshing them before they expire.
+
+    Request counts are collected in-process (`record` is a dict increment on the
+    hot path) and merged every cycle into a Redis sorted set shared by all
+    replicas. Scores decay each cycle so popularity follows recent traffic.
+    Without a Redis client the decayed counts are kept in-process only.
+    """
+
+    def __init__(
+        self,
+        service: WeatherService,
+        redis_client=None,
+        key: str = "weather:popularity",
+        top_n: int = 100,
+        interval: float = 60.0,
+        refresh_after: float = 1500.0,
+        max_refresh_rate: float = 2.0,
+        decay: float = 0.9,
+        max_tracked: int = 10_000,
+    ):
+        self.service = service
+        self.redis = redis_client
+        self.key = key
+        self.top_n = top_n
+        self.interval = interval
+        self.refresh_after = refresh_after  # Age (seconds) at which a hot entry is refreshed
+        self.max_refresh_rate = max_refresh_rate  # Upstream refreshes per second
+        self.decay = decay
+        self.max_tracked = max_tracked
+        self._counts: Counter[str] = Counter()
+        self._scores: dict[str, float] = {}
+        self._task: asyncio.Task | None = None
+
+    def record(self, city_name: str):
+        self._counts[normalize_city(city_name)] += 1
+
+    async def _update_popularity(self) -> list[str]:
+        counts, self._counts = self._counts, Counter()
+
+        if self.redis is None:
+            for city, score in list(self._scores.items()):
+                self._scores[city] = score * self.decay
+            for city, count in counts.items():
+                self._scores[city] = self._scores.get(city, 0.0) + count
+            ranked = sorted(self._scores, key=self._scores.__getitem__, reverse=True)
+            for city in ranked[self.max_tracked :]:
+                del self._scores[city]
+            return ranked[: self.top_n]
+
+        async with self.redis.pipeline(transaction=False) as pipe:
+            # Decay existing scores, add this cycle's counts, drop the long tail.
+            pipe.zunionstore(self.key, {self.key: self.decay})
+            for city, count in counts.items():
+                pipe.zincrby(self.key, count, city)
+            pipe.zremrangebyrank(self.key, 0, -self.max_tracked - 1)
+            pipe.zrevrange(self.key, 0, self.top_n - 1)
+            results = await pipe.execute()
+
+        return [c.decode() if isinstance(c, bytes) else c for c in results[-1]]
+
+    async def warm_once(self) -> int:
+        """Refresh hot cities that are missing or close to expiry. Returns the refresh count."""
+        hot = await self._update_popularity()
+        if not hot:
+            return 0
+
+        # Looked up through the service, which knows how cities map to cache keys.
+        cached = await self.service.peek_many(hot)
+        now = time.time()
+        due = [
+            city
+            for city in hot
+            if cached.get(city) is None
+            or cached[city].fetched_at is None
+            or now - cached[city].fetched_at >= self.refresh_after
+        ]
+
+        refreshed = 0
+        for city in due:
+            try:
+                await self.service.refresh(city)
+                refreshed += 1
+            except Exception as e:
+                logger.warning(f"Cache warmer failed to refresh {city}: {e}")
+            # Bound upstream load regardless of how many entries are due.
+            await asyncio.sleep(1 / self.max_refresh_rate)
+
+        if refreshed:
+            logger.info(f"Cache warmer refreshed {refreshed}/{len(hot)} hot cities")
+        return refreshed
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.warm_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Cache warmer cycle failed: {e}")
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
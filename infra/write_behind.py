@@ -0,0 +1,142 @@
+import asyncio
+import itertools
+import logging
+
+from core.domain.models import WeatherEntity
+from core.domain.normalization import normalize_city
+from core.domain.ports import CachePort
+from infra.metrics import CACHE_WRITE_QUEUE_DEPTH, CACHE_WRITES_DROPPED
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindCache(CachePort):
+    """Queues writes for a background worker so callers never wait on the backend.
+
+    Pending entries are keyed by city, so repeated writes to one key collapse
+    into the newest value, and reads see them until they are written (a
+    replica's own misses never race its write). Up to `batch_size` entries are
+    written per `set_many` call. When `max_pending` keys are already queued,
+    new keys are dropped: the entry is simply fetched again on the next miss.
+    Failed writes are counted only if the backend raises them, so Redis
+    adapters behind this queue use `raise_write_errors=True`.
+    """
+
+    def __init__(
+        self,
+        backend: CachePort,
+        max_pending: int = 10000,
+        batch_size: int = 100,
+        tier: str = "redis",
+    ):
+        self.backend = backend
+        self.max_pending = max_pending
+        self.batch_size = batch_size
+        self.tier = tier
+        self._pending: dict[str, tuple[str, WeatherEntity]] = {}
+        self._wakeup = asyncio.Event()
+        self._worker: asyncio.Task | None = None
+        self._stopping = False
+
+    async def get_weather(self, city_name: str) -> WeatherEntity | None:
+        pending = self._pending.get(normalize_city(city_name))
+        if pending is not None:
+            return pending[1]
+        return await self.backend.get_weather(city_name)
+
+    async def get_many(self, city_names: list[str]) -> dict[str, WeatherEntity | None]:
+        results: dict[str, WeatherEntity | None] = {}
+        misses = []
+        for city_name in city_names:
+            pending = self._pending.get(normalize_city(city_name))
+            if pending is None:
+                misses.append(city_name)
+            else:
+                results[city_name] = pending[1]
+        if misses:
+            results.update(await self.backend.get_many(misses))
+        return results
+
+    async def set_weather(self, city_name: str, weather: WeatherEntity):
+        self._enqueue(city_name, weather)
+
+    async def set_many(self, items: dict[str, WeatherEntity]):
+        for city_name, weather in items.items():
+            self._enqueue(city_name, weather)
+
+    async def delete_many(self, city_names: list[str]):
+        for city_name in city_names:
+            self._pending.pop(normalize_city(city_name), None)
+        self._update_depth()
+        await self.backend.delete_many(city_names)
+
+    def _enqueue(self, city_name: str, weather: WeatherEntity):
+        key = normalize_city(city_name)
+        if key not in self._pending and len(self._pending) >= self.max_pending:
+            CACHE_WRITES_DROPPED.labels(tier=self.tier, reason="queue_full").inc()
+            logger.warning(
+                f"Cache write queue full ({self.max_pending}), dropping write for {city_name}",
+                extra={"throttle_key": f"write_queue_full:{self.tier}"},
+            )
+            return
+        self._pending[key] = (city_name, weather)
+        self._update_depth()
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._drain_loop())
+        self._wakeup.set()
+
+    async def _drain_loop(self):
+        while True:
+            if not self._pending:
+                if self._stopping:
+                    return
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            await self._write_batch()
+
+    async def _write_batch(self):
+        batch = dict(itertools.islice(self._pending.items(), self.batch_size))
+        try:
+            if len(batch) == 1:
+                [(city_name, weather)] = batch.values()
+                await self.backend.set_weather(city_name, weather)
+            else:
+                await self.backend.set_many(dict(batch.values()))
+        except Exception as e:
+            CACHE_WRITES_DROPPED.labels(tier=self.tier, reason="error").inc(len(batch))
+            logger.warning(
+                f"Cache write of {len(batch)} entries failed: {e}",
+                extra={"throttle_key": f"write_behind_error:{self.tier}"},
+            )
+        # Keys rewritten while the batch was in flight stay queued with the newer value.
+        for key, item in batch.items():
+            if self._pending.get(key) is item:
+                del self._pending[key]
+        self._update_depth()
+
+    def _update_depth(self):
+        CACHE_WRITE_QUEUE_DEPTH.labels(tier=self.tier).set(len(self._pending))
+
+    async def flush(self, timeout: float | None = None):
+        """Write everything still queued and stop the worker (it restarts on the next write)."""
+        worker = self._worker
+        if worker is None:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        try:
+            await asyncio.wait_for(worker, timeout)
+        except TimeoutError:
+            CACHE_WRITES_DROPPED.labels(tier=self.tier, reason="shutdown").inc(len(self._pending))
+            logger.warning(f"Gave up flushing {len(self._pending)} queued cache writes")
+            self._pending.clear()
+            self._update_depth()
+        finally:
+            self._worker = None
+            self._stopping = False
+
+    async def close(self, timeout: float | None = None):
+        """Flush queued writes, then close the backing cache."""
+        await self.flush(timeout)
+        await self.backend.close()
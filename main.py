@@ -2,53 +2,255 @@ import logging
 import os
 import signal
 from contextlib import asynccontextmanager
+from typing import Annotated
 
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, Header, HTTPException, Query, Response
 from prometheus_fastapi_instrumentator import Instrumentator
 
-from api.middleware import RequestLoggingMiddleware, TraceIdMiddleware
-from api.v1.schemas import ForecastItem, WeatherResponse
+from api.middleware import RequestContextMiddleware
+from api.v1.schemas import (
+    DEFAULT_FORECAST_HOURS,
+    DEFAULT_FORECAST_VARIABLES,
+    MAX_FORECAST_HOURS,
+    BatchWeatherItem,
+    BatchWeatherRequest,
+    BatchWeatherResponse,
+    WeatherResponse,
+)
 from core.domain.exceptions import CityNotFound, ServiceUnavailable
+from core.domain.forecast import Forecast
+from core.domain.models import FORECAST_VARIABLES, WeatherEntity
 from core.services import WeatherService
-from infra.cache import RedisCacheAdapter
+from infra.batching import MicroBatchingProvider
+from infra.cache import RedisCacheAdapter, TieredCacheAdapter
+from infra.coalescing import RedisLockCoalescer, SingleFlight
+from infra.geocode_cache import LRUGeocodeCache, RedisGeocodeCache
+from infra.local_geocoder import LocalGeocoder
 from infra.logging import setup_logging
+from infra.metrics import DEGRADED_RESPONSES
 from infra.open_meteo import OpenMeteoProvider
+from infra.redis_clients import create_redis_clients
+from infra.response_cache import ResponseCache
+from infra.serialization import get_serializer
+from infra.warmer import CacheWarmer
+from infra.write_behind import WriteBehindCache
 
-# Setup Logging
-setup_logging()
+# Setup Logging (records are queued and written by a background thread)
+setup_logging(
+    queue_size=int(os.getenv("LOG_QUEUE_SIZE", "10000")),
+    block_when_full=os.getenv("LOG_QUEUE_POLICY", "drop").lower() == "block",
+    sample_rates={
+        "cache_hit": float(os.getenv("LOG_SAMPLE_CACHE_HIT", "0.01")),
+        "cache_miss": float(os.getenv("LOG_SAMPLE_CACHE_MISS", "1.0")),
+        "request": float(os.getenv("LOG_SAMPLE_REQUEST", "1.0")),
+        "upstream_call": float(os.getenv("LOG_SAMPLE_UPSTREAM", "1.0")),
+    },
+    throttle_window=float(os.getenv("LOG_THROTTLE_WINDOW", "60")),
+)
 logger = logging.getLogger("api")
 
 # Application State (Dependency Injection)
 service: WeatherService = None
+warmer: CacheWarmer | None = None
+# Serialized /weather bodies and their ETags (replaced in lifespan with the configured TTLs)
+response_cache = ResponseCache()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    global service
+    global service, warmer, response_cache
     logger.info("Starting Weather Proxy...")
 
     # Initialize Adapters
-    provider = OpenMeteoProvider()
     redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
-    cache = RedisCacheAdapter(redis_url)
+    # CACHE_TTL is the hard expiry in Redis; after CACHE_SOFT_TTL entries are
+    # served stale while a background refresh runs.
+    cache_ttl = int(os.getenv("CACHE_TTL", "3600"))
+    soft_ttl = float(os.getenv("CACHE_SOFT_TTL", "1800"))
+    serializer = get_serializer(os.getenv("CACHE_SERIALIZER", "json"))
+    # One set of pooled clients shared by every Redis-backed adapter; reads can
+    # go to replicas (REDIS_READ_URL, or REDIS_READ_FROM_REPLICAS in
+    # cluster/sentinel mode) while writes stay on the primary.
+    redis_clients = create_redis_clients(
+        redis_url,
+        mode=os.getenv("REDIS_MODE", "standalone").lower(),
+        read_url=os.getenv("REDIS_READ_URL") or None,
+        read_from_replicas=os.getenv("REDIS_READ_FROM_REPLICAS", "false").lower() == "true",
+        sentinels=os.getenv("REDIS_SENTINELS"),
+        sentinel_service=os.getenv("REDIS_SENTINEL_SERVICE", "mymaster"),
+        max_connections=int(os.getenv("REDIS_MAX_CONNECTIONS", "50")),
+        pool_timeout=float(os.getenv("REDIS_POOL_TIMEOUT", "5")),
+        socket_timeout=float(os.getenv("REDIS_SOCKET_TIMEOUT", "2")),
+        socket_connect_timeout=float(os.getenv("REDIS_CONNECT_TIMEOUT", "2")),
+        health_check_interval=int(os.getenv("REDIS_HEALTH_CHECK_INTERVAL", "30")),
+    )
+    # With Redis coalescing, other replicas re-read the cache as soon as the
+    # lock is released, so the entry must be written before that: the main
+    # cache is then written through and only last-known-good copies queue.
+    distributed_coalescing = os.getenv("COALESCING_BACKEND", "local").lower() == "redis"
+    # Write-behind adapters raise write errors so the queue can count them
+    write_behind = os.getenv("CACHE_WRITE_BEHIND", "true").lower() == "true"
+    redis_cache = RedisCacheAdapter(
+        redis_url,
+        ttl=cache_ttl,
+        client=redis_clients.primary,
+        serializer=serializer,
+        read_client=redis_clients.reader,
+        cluster=redis_clients.cluster,
+        raise_write_errors=write_behind and not distributed_coalescing,
+    )
+
+    # In-process L1 in front of Redis; pub/sub keeps replicas' L1 coherent
+    invalidation = os.getenv("CACHE_L1_INVALIDATION", "true").lower() == "true"
+    cache = TieredCacheAdapter(
+        redis_cache,
+        maxsize=int(os.getenv("CACHE_L1_SIZE", "512")),
+        ttl=float(os.getenv("CACHE_L1_TTL", "60")),
+        redis_client=redis_cache.redis if invalidation else None,
+    )
+    cache.start_invalidation_listener()
+
+    # Last-known-good copies outlive the normal TTL and are only read when the
+    # provider circuit is open (CACHE_STALE_TTL=0 disables the fallback).
+    stale_ttl = int(os.getenv("CACHE_STALE_TTL", str(24 * 3600)))
+    fallback_cache = None
+    if stale_ttl:
+        fallback_cache = RedisCacheAdapter(
+            redis_url,
+            ttl=stale_ttl,
+            key_prefix="lkg:weather",
+            client=redis_cache.redis,
+            serializer=serializer,
+            tier="lkg",
+            read_client=redis_clients.reader,
+            cluster=redis_clients.cluster,
+            raise_write_errors=write_behind,
+        )
+
+    # Write-behind: a miss returns as soon as the forecast is fetched and a
+    # background worker writes the entry (queued writes are flushed on shutdown).
+    if write_behind:
+        write_options = {
+            "max_pending": int(os.getenv("CACHE_WRITE_QUEUE_SIZE", "10000")),
+            "batch_size": int(os.getenv("CACHE_WRITE_BATCH_SIZE", "100")),
+        }
+        if not distributed_coalescing:
+            cache = WriteBehindCache(cache, **write_options)
+        if fallback_cache is not None:
+            fallback_cache = WriteBehindCache(fallback_cache, tier="lkg", **write_options)
+
+    # Geocoding results barely change: long-lived Redis entries (0 = no expiry)
+    # behind an in-process LRU, so refreshes only hit the forecast endpoint.
+    geocode_ttl = int(os.getenv("GEOCODE_CACHE_TTL", str(30 * 24 * 3600)))
+    geocode_cache = LRUGeocodeCache(
+        RedisGeocodeCache(
+            redis_clients.primary,
+            ttl=geocode_ttl or None,
+            read_client=redis_clients.reader,
+            cluster=redis_clients.cluster,
+        ),
+        maxsize=int(os.getenv("GEOCODE_LRU_SIZE", "10000")),
+    )
+
+    # Optional offline index (scripts/build_geocode_index.py): known cities
+    # never reach the geocoding API.
+    geocoder_index = os.getenv("GEOCODER_INDEX_PATH")
+    local_geocoder = LocalGeocoder(geocoder_index) if geocoder_index else None
+
+    provider = OpenMeteoProvider(
+        geocode_cache=geocode_cache,
+        local_geocoder=local_geocoder,
+        max_connections=int(os.getenv("OPEN_METEO_MAX_CONNECTIONS", "100")),
+        max_keepalive_connections=int(os.getenv("OPEN_METEO_MAX_KEEPALIVE", "20")),
+        keepalive_expiry=float(os.getenv("OPEN_METEO_KEEPALIVE_EXPIRY", "30")),
+        timeout=float(os.getenv("OPEN_METEO_TIMEOUT", "10")),
+        connect_timeout=float(os.getenv("OPEN_METEO_CONNECT_TIMEOUT", "5")),
+        http2=os.getenv("OPEN_METEO_HTTP2", "true").lower() == "true",
+        max_batch_locations=int(os.getenv("OPEN_METEO_MAX_BATCH_LOCATIONS", "50")),
+        forecast_hours=int(os.getenv("FORECAST_HOURS", "48")),
+    )
+
+    # Optional micro-batching: misses arriving within the window share one
+    # multi-location forecast request (0 disables it).
+    batch_window_ms = float(os.getenv("OPEN_METEO_BATCH_WINDOW_MS", "0"))
+    if batch_window_ms > 0:
+        provider = MicroBatchingProvider(
+            provider,
+            window=batch_window_ms / 1000,
+            max_batch_size=int(os.getenv("OPEN_METEO_MAX_BATCH_LOCATIONS", "50")),
+        )
+
+    # Request coalescing: "redis" also coalesces across workers and replicas
+    if distributed_coalescing:
+        coalescer = RedisLockCoalescer(
+            redis_cache.redis,
+            lock_timeout=float(os.getenv("COALESCING_LOCK_TIMEOUT", "10")),
+            wait_timeout=float(os.getenv("COALESCING_WAIT_TIMEOUT", "5")),
+        )
+    else:
+        coalescer = SingleFlight()
 
     # Initialize Service
-    service = WeatherService(provider=provider, cache=cache)
+    service = WeatherService(
+        provider=provider,
+        cache=cache,
+        coalescer=coalescer,
+        soft_ttl=soft_ttl,
+        fallback_cache=fallback_cache,
+        batch_concurrency=int(os.getenv("BATCH_CONCURRENCY", "8")),
+        grid_precision=int(os.getenv("GEOHASH_PRECISION", "5")),
+        city_keys=os.getenv("CACHE_CITY_KEYS", "location").lower(),
+    )
+
+    # Serialized /weather bodies and ETags, reused for every hit on the same
+    # cache entry (RESPONSE_CACHE_SIZE=0 renders each response). Cache-Control
+    # follows the same soft and hard TTLs as the cache itself.
+    response_cache = ResponseCache(
+        int(os.getenv("RESPONSE_CACHE_SIZE", "1024")), ttl=cache_ttl, soft_ttl=soft_ttl
+    )
+
+    # Background warmer: refreshes the top-N requested cities before they expire
+    if os.getenv("WARMER_ENABLED", "false").lower() == "true":
+        warmer = CacheWarmer(
+            service,
+            redis_client=redis_cache.redis,
+            top_n=int(os.getenv("WARMER_TOP_N", "100")),
+            interval=float(os.getenv("WARMER_INTERVAL", "60")),
+            refresh_after=float(os.getenv("WARMER_REFRESH_AFTER", str(soft_ttl * 0.9))),
+            max_refresh_rate=float(os.getenv("WARMER_MAX_REFRESH_RATE", "2")),
+        )
+        warmer.start()
 
     yield
 
     # Graceful shutdown: close resources
     logger.info("Shutting down Weather Proxy...")
+    if warmer is not None:
+        await warmer.stop()
+    await service.close()
+    # Queued cache writes go out before the shared Redis clients are closed
+    flush_timeout = float(os.getenv("CACHE_WRITE_FLUSH_TIMEOUT", "5"))
+    for write_behind in (cache, fallback_cache):
+        if isinstance(write_behind, WriteBehindCache):
+            await write_behind.flush(timeout=flush_timeout)
     try:
         await cache.close()
     except Exception as e:
         logger.error(f"Error during cache shutdown: {e}")
+    try:
+        await provider.close()
+    except Exception as e:
+        logger.error(f"Error during provider shutdown: {e}")
+    if local_geocoder is not None:
+        local_geocoder.close()
     logger.info("Weather Proxy shutdown complete")
 
 
 app = FastAPI(title="Weather Proxy", lifespan=lifespan)
-app.add_middleware(RequestLoggingMiddleware)
-app.add_middleware(TraceIdMiddleware)
+# Request ID + request logging in a single pure-ASGI pass
+app.add_middleware(
+    RequestContextMiddleware, slow_request_ms=float(os.getenv("LOG_SLOW_REQUEST_MS", "1000"))
+)
 
 
 # Instrument the app to collect metrics
@@ -62,23 +264,75 @@ async def health_check():
     return {"status": "ok"}
 
 
+def to_response(
+    weather: WeatherEntity,
+    hours: int = DEFAULT_FORECAST_HOURS,
+    variables: tuple[str, ...] = DEFAULT_FORECAST_VARIABLES,
+) -> WeatherResponse:
+    # Map Entity to response model: the cached entry holds every variable for
+    # the full horizon, each response takes the slice it asked for. Rows are
+    # read straight from the forecast columns and validated as plain dicts.
+    return WeatherResponse(
+        city_name=weather.city,
+        current_temperature=weather.temperature,
+        current_humidity=weather.humidity,
+        hourly_forecast=Forecast.of(weather.forecast)[:hours].rows(variables),
+    )
+
+
+def parse_variables(values: list[str]) -> tuple[str, ...]:
+    """Forecast variables from repeated and/or comma-separated query values."""
+    variables = [v.strip() for value in values for v in value.split(",") if v.strip()]
+    unknown = sorted(set(variables) - set(FORECAST_VARIABLES))
+    if unknown:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Unknown forecast variables: {', '.join(unknown)} "
+            f"(expected any of {', '.join(FORECAST_VARIABLES)})",
+        )
+    return tuple(dict.fromkeys(variables)) or DEFAULT_FORECAST_VARIABLES
+
+
 @app.get("/weather", response_model=WeatherResponse)
-async def get_weather(city: str = Query(..., min_length=1)):
+async def get_weather(
+    city: str | None = Query(None, min_length=1),
+    lat: float | None = Query(None, ge=-90, le=90),
+    lon: float | None = Query(None, ge=-180, le=180),
+    hours: int = Query(DEFAULT_FORECAST_HOURS, ge=1, le=MAX_FORECAST_HOURS),
+    variables: Annotated[list[str] | None, Query()] = None,
+    if_none_match: str | None = Header(None),
+):
+    # Either a city name, or coordinates served from their grid cell
+    by_coordinates = city is None and lat is not None and lon is not None
+    if not by_coordinates and (city is None or lat is not None or lon is not None):
+        raise HTTPException(status_code=422, detail="Provide either city or both lat and lon")
+    selected = parse_variables(variables or [])
+
     try:
-        weather = await service.get_weather(city)
-
-        # Map Entity to response model
-        hourly_mapped = [
-            ForecastItem(time=item["time"], temperature=item["temperature"])
-            for item in weather.forecast
-        ]
-
-        return WeatherResponse(
-            city_name=weather.city,
-            current_temperature=weather.temperature,
-            current_humidity=weather.humidity,
-            hourly_forecast=hourly_mapped,
+        if by_coordinates:
+            key, weather = await service.lookup_at(lat, lon)
+        else:
+            key, weather = await service.lookup(city)
+            # Only names that resolved are worth keeping warm.
+            if warmer is not None:
+                warmer.record(city)
+        # Hits skip model validation and JSON encoding: the body is reused as is.
+        # Horizons past the cached one yield the same body, so share its key.
+        shown_hours = min(hours, len(weather.forecast))
+        rendered = response_cache.get(
+            key,
+            weather,
+            lambda w: to_response(w, shown_hours, selected).model_dump_json().encode(),
+            variant=f"{shown_hours}:{','.join(selected)}",
         )
+        headers = {"ETag": rendered.etag, "Cache-Control": response_cache.cache_control(weather)}
+        if weather.degraded:
+            DEGRADED_RESPONSES.inc()
+            headers["X-Weather-Degraded"] = "true"
+
+        if rendered.matches(if_none_match):
+            return Response(status_code=304, headers=headers)
+        return Response(rendered.body, media_type="application/json", headers=headers)
 
     except CityNotFound as e:
         raise HTTPException(status_code=404, detail=str(e)) from None
@@ -90,6 +344,33 @@ async def get_weather(city: str = Query(..., min_length=1)):
         raise HTTPException(status_code=500, detail="Internal Server Error") from None
 
 
+@app.post("/v1/weather/batch", response_model=BatchWeatherResponse)
+async def get_weather_batch(request: BatchWeatherRequest):
+    results = await service.get_weather_many(request.cities)
+
+    items = []
+    for city in request.cities:
+        result = results[city]
+        if isinstance(result, WeatherEntity):
+            if result.degraded:
+                DEGRADED_RESPONSES.inc()
+            item = BatchWeatherItem(
+                city=city, status=200, data=to_response(result), degraded=result.degraded
+            )
+            if warmer is not None:
+                warmer.record(city)
+        elif isinstance(result, CityNotFound):
+            item = BatchWeatherItem(city=city, status=404, error=str(result))
+        elif isinstance(result, ServiceUnavailable):
+            item = BatchWeatherItem(city=city, status=503, error=str(result))
+        else:
+            logger.error(f"Internal Error for {city}: {result}")
+            item = BatchWeatherItem(city=city, status=500, error="Internal Server Error")
+        items.append(item)
+
+    return BatchWeatherResponse(results=items)
+
+
 def setup_signal_handlers():
     """Setup signal handlers for graceful shutdown."""
 
@@ -0,0 +1,47 @@
+"""Build the local geocoding index from a GeoNames dump.
+
+Download e.g. https://download.geonames.org/export/dump/cities15000.zip, unzip
+it, then:
+
+    uv run python scripts/build_geocode_index.py cities15000.txt data/geocode.idx \\
+        [--min-population 1000] [--alternate-names]
+
+Point GEOCODER_INDEX_PATH at the output to enable offline geocoding.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add project root to sys.path to allow imports from core/infra/api
+sys.path.append(str(Path(__file__).parent.parent))
+
+from infra.local_geocoder import build_index, read_geonames
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("source", type=Path, help="GeoNames dump (tab-separated)")
+    parser.add_argument("output", type=Path, help="Index file to write")
+    parser.add_argument("--min-population", type=int, default=0)
+    parser.add_argument(
+        "--alternate-names",
+        action="store_true",
+        help="Also index GeoNames alternate names (e.g. 'Londres'); larger index",
+    )
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    places = read_geonames(args.source, args.min_population, args.alternate_names)
+    keys = build_index(places, args.output)
+    size = args.output.stat().st_size
+    print(
+        f"Indexed {keys} names into {args.output} "
+        f"({size / 1e6:.1f} MB) in {time.perf_counter() - start:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
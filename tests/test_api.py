@@ -1,12 +1,14 @@
 """Integration tests for FastAPI endpoints."""
 
-from unittest.mock import AsyncMock, patch
+import time
+from unittest.mock import AsyncMock, MagicMock, call, patch
 
 import pytest
 from fastapi.testclient import TestClient
 
 from core.domain.exceptions import CityNotFound, ServiceUnavailable
 from core.domain.models import WeatherEntity
+from infra.response_cache import ResponseCache
 from main import app
 
 
@@ -43,7 +45,7 @@ def test_get_weather_success(mock_service_global, client):
         ],
     )
     # Make the async method return the mock weather
-    mock_service_global.get_weather = AsyncMock(return_value=mock_weather)
+    mock_service_global.lookup = AsyncMock(return_value=("london", mock_weather))
 
     # Execute
     response = client.get("/weather?city=London")
@@ -61,7 +63,7 @@ def test_get_weather_success(mock_service_global, client):
 def test_get_weather_city_not_found(mock_service_global, client):
     """Test weather request for nonexistent city."""
     # Setup mock
-    mock_service_global.get_weather = AsyncMock(side_effect=CityNotFound("UnknownCity"))
+    mock_service_global.lookup = AsyncMock(side_effect=CityNotFound("UnknownCity"))
 
     # Execute
     response = client.get("/weather?city=UnknownCity")
@@ -75,7 +77,7 @@ def test_get_weather_city_not_found(mock_service_global, client):
 def test_get_weather_service_unavailable(mock_service_global, client):
     """Test weather request when service is unavailable."""
     # Setup mock
-    mock_service_global.get_weather = AsyncMock(
+    mock_service_global.lookup = AsyncMock(
         side_effect=ServiceUnavailable("Provider temporarily unavailable")
     )
 
@@ -90,3 +92,258 @@ def test_get_weather_missing_city(client):
     """Test weather request with missing city parameter."""
     response = client.get("/weather")
     assert response.status_code == 422  # Validation error
+
+
+@patch("main.service")
+def test_get_weather_degraded_header(mock_service_global, client):
+    """Test that last-known-good responses are flagged as degraded."""
+    mock_service_global.lookup = AsyncMock(
+        return_value=(
+            "london",
+            WeatherEntity(city="London", temperature=15.5, humidity=65, forecast=[], degraded=True),
+        )
+    )
+
+    response = client.get("/weather?city=London")
+
+    assert response.status_code == 200
+    assert response.headers["X-Weather-Degraded"] == "true"
+
+
+@patch("main.service")
+def test_get_weather_not_degraded_by_default(mock_service_global, client):
+    """Test that normal responses carry no degraded header."""
+    mock_service_global.lookup = AsyncMock(
+        return_value=(
+            "london",
+            WeatherEntity(city="London", temperature=15.5, humidity=65, forecast=[]),
+        )
+    )
+
+    response = client.get("/weather?city=London")
+
+    assert "X-Weather-Degraded" not in response.headers
+
+
+@patch("main.service")
+def test_get_weather_batch_reports_errors_inline(mock_service_global, client):
+    """Test that the batch endpoint returns per-city results and errors."""
+    london = WeatherEntity(city="London", temperature=15.5, humidity=65, forecast=[])
+    mock_service_global.get_weather_many = AsyncMock(
+        return_value={
+            "London": london,
+            "Atlantis": CityNotFound("Atlantis"),
+            "Paris": ServiceUnavailable("Weather Provider"),
+        }
+    )
+
+    response = client.post("/v1/weather/batch", json={"cities": ["London", "Atlantis", "Paris"]})
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [item["city"] for item in results] == ["London", "Atlantis", "Paris"]
+    assert [item["status"] for item in results] == [200, 404, 503]
+    assert results[0]["data"]["city_name"] == "London"
+    assert "Atlantis" in results[1]["error"]
+
+
+@patch("main.warmer", new_callable=MagicMock)
+@patch("main.service")
+def test_warmer_records_only_successful_lookups(mock_service_global, mock_warmer, client):
+    """Test that only cities that were served are recorded for cache warming."""
+    london = WeatherEntity(city="London", temperature=15.5, humidity=65, forecast=[])
+    mock_service_global.lookup = AsyncMock(side_effect=CityNotFound("Atlantis"))
+    mock_service_global.get_weather_many = AsyncMock(
+        return_value={"London": london, "Atlantis": CityNotFound("Atlantis")}
+    )
+
+    assert client.get("/weather?city=Atlantis").status_code == 404
+    mock_warmer.record.assert_not_called()
+
+    client.post("/v1/weather/batch", json={"cities": ["London", "Atlantis"]})
+    assert mock_warmer.record.call_args_list == [call("London")]
+
+
+def test_get_weather_batch_validation(client):
+    """Test that empty and oversized batches are rejected."""
+    assert client.post("/v1/weather/batch", json={"cities": []}).status_code == 422
+    assert client.post("/v1/weather/batch", json={"cities": [""]}).status_code == 422
+    too_many = {"cities": [f"city-{i}" for i in range(101)]}
+    assert client.post("/v1/weather/batch", json=too_many).status_code == 422
+
+
+@patch("main.service")
+def test_get_weather_by_coordinates(mock_service_global, client):
+    """Test that lat/lon requests are served from the coordinate lookup."""
+    mock_weather = WeatherEntity(city="gcpvj", temperature=15.5, humidity=65, forecast=[])
+    mock_service_global.lookup_at = AsyncMock(return_value=("cell:gcpvj", mock_weather))
+
+    response = client.get("/weather?lat=51.5074&lon=-0.1278")
+
+    assert response.status_code == 200
+    assert response.json()["city_name"] == "gcpvj"
+    mock_service_global.lookup_at.assert_called_once_with(51.5074, -0.1278)
+
+
+@pytest.mark.parametrize(
+    "query", ["lat=51.5", "city=London&lat=51.5&lon=0.1", "lat=91&lon=0", "lat=0&lon=181"]
+)
+def test_get_weather_rejects_incomplete_or_mixed_queries(client, query):
+    """Test that city and coordinates are mutually exclusive and validated."""
+    assert client.get(f"/weather?{query}").status_code == 422
+
+
+@patch("main.response_cache", new_callable=ResponseCache)
+@patch("main.service")
+def test_get_weather_serves_cached_body(mock_service_global, mock_response_cache, client):
+    """Test that repeated hits on one entry are served from the serialized body cache."""
+    weather = WeatherEntity(
+        city="London",
+        temperature=15.5,
+        humidity=65,
+        forecast=[{"time": "2026-01-09T12:00", "temperature": 14.0}],
+        fetched_at=1000.0,
+    )
+    mock_service_global.lookup = AsyncMock(return_value=("london", weather))
+
+    first = client.get("/weather?city=London")
+    with patch("main.to_response", side_effect=AssertionError("rendered twice")):
+        second = client.get("/weather?city=London")
+
+    assert first.headers["content-type"] == "application/json"
+    assert second.content == first.content
+    assert second.json() == {
+        "city_name": "London",
+        "current_temperature": 15.5,
+        "current_humidity": 65.0,
+        "hourly_forecast": [{"time": "2026-01-09T12:00", "temperature": 14.0}],
+    }
+    assert len(mock_response_cache) == 1
+
+
+@patch("main.response_cache", new_callable=ResponseCache)
+@patch("main.service")
+def test_cached_body_keeps_degraded_header(mock_service_global, mock_response_cache, client):
+    """Test that degraded responses are flagged when served from the body cache."""
+    mock_service_global.lookup = AsyncMock(
+        return_value=(
+            "london",
+            WeatherEntity(
+                city="London",
+                temperature=15.5,
+                humidity=65,
+                forecast=[],
+                fetched_at=1.0,
+                degraded=True,
+            ),
+        )
+    )
+
+    response = client.get("/weather?city=London")
+
+    assert response.status_code == 200
+    assert response.headers["X-Weather-Degraded"] == "true"
+
+
+@patch("main.service")
+def test_get_weather_sets_validators(mock_service_global, client):
+    """Test that /weather sends an ETag and a Cache-Control header."""
+    mock_service_global.lookup = AsyncMock(
+        return_value=(
+            "london",
+            WeatherEntity(city="London", temperature=15.5, humidity=65, forecast=[]),
+        )
+    )
+
+    response = client.get("/weather?city=London")
+
+    assert response.headers["ETag"].startswith('"')
+    assert "Cache-Control" in response.headers
+
+
+@patch("main.response_cache", new_callable=lambda: ResponseCache(ttl=3600, soft_ttl=1800))
+@patch("main.service")
+def test_get_weather_conditional_request(mock_service_global, mock_response_cache, client):
+    """Test that a matching If-None-Match gets an empty 304 with the same validators."""
+    mock_service_global.lookup = AsyncMock(
+        return_value=(
+            "london",
+            WeatherEntity(
+                city="London", temperature=15.5, humidity=65, forecast=[], fetched_at=time.time()
+            ),
+        )
+    )
+    first = client.get("/weather?city=London")
+
+    revalidated = client.get(
+        "/weather?city=London", headers={"If-None-Match": first.headers["ETag"]}
+    )
+    changed = client.get("/weather?city=London", headers={"If-None-Match": '"stale"'})
+
+    assert first.headers["Cache-Control"].startswith("public, max-age=")
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert revalidated.headers["ETag"] == first.headers["ETag"]
+    assert changed.status_code == 200
+    assert changed.content == first.content
+
+
+@patch("main.service")
+def test_get_weather_hours_and_variables(mock_service_global, client):
+    """Test that clients pick the horizon and variables from the same cached entry."""
+    forecast = [
+        {"time": f"2026-01-09T{hour:02d}:00", "temperature": 10.0 + hour, "humidity": 50.0}
+        for hour in range(24)
+    ]
+    mock_service_global.lookup = AsyncMock(
+        return_value=(
+            "london",
+            WeatherEntity(city="London", temperature=15.5, humidity=65, forecast=forecast),
+        )
+    )
+
+    default = client.get("/weather?city=London").json()["hourly_forecast"]
+    custom = client.get(
+        "/weather", params={"city": "London", "hours": 12, "variables": "humidity,precipitation"}
+    ).json()["hourly_forecast"]
+    repeated = client.get(
+        "/weather?city=London&hours=100&variables=temperature&variables=humidity"
+    ).json()["hourly_forecast"]
+
+    assert default[0] == {"time": "2026-01-09T00:00", "temperature": 10.0}
+    assert len(default) == 5
+    assert len(custom) == 12
+    assert custom[0] == {"time": "2026-01-09T00:00", "humidity": 50.0, "precipitation": None}
+    assert len(repeated) == 24
+    assert repeated[0] == {"time": "2026-01-09T00:00", "temperature": 10.0, "humidity": 50.0}
+    assert mock_service_global.lookup.await_count == 3
+
+
+@pytest.mark.parametrize("params", [{"variables": "temperature,snow"}, {"hours": 0}])
+def test_get_weather_rejects_bad_forecast_params(client, params):
+    """Test that unknown variables and out-of-range horizons are rejected."""
+    response = client.get("/weather", params={"city": "London", **params})
+
+    assert response.status_code == 422
+
+
+@patch("main.response_cache", new_callable=ResponseCache)
+@patch("main.service")
+def test_cached_bodies_are_per_shape(mock_service_global, mock_response_cache, client):
+    """Test that one cache entry yields a separate cached body per response shape."""
+    forecast = [{"time": f"2026-01-09T{hour:02d}:00", "temperature": 10.0} for hour in range(24)]
+    mock_service_global.lookup = AsyncMock(
+        return_value=(
+            "london",
+            WeatherEntity(
+                city="London", temperature=15.5, humidity=65, forecast=forecast, fetched_at=1.0
+            ),
+        )
+    )
+
+    client.get("/weather?city=London")
+    client.get("/weather?city=London&hours=24")
+    client.get("/weather?city=London&hours=48")  # capped at the cached 24 hours
+    client.get("/weather?city=London&hours=24&variables=humidity")
+
+    assert len(mock_response_cache) == 3
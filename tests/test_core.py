@@ -1,9 +1,16 @@
 """Unit tests for WeatherService core logic."""
 
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock
+
 import pytest
 
-from core.domain.models import WeatherEntity
+from core.domain.exceptions import CityNotFound, ServiceUnavailable
+from core.domain.models import GeoLocation, WeatherEntity
 from core.services import WeatherService
+from infra.coalescing import RedisLockCoalescer, SingleFlight
+from infra.write_behind import WriteBehindCache
 
 
 @pytest.mark.asyncio
@@ -56,3 +63,416 @@ async def test_get_weather_cache_miss(mock_cache, mock_weather_provider, sample_
     mock_cache.get_weather.assert_called_once_with("Paris")
     mock_weather_provider.get_weather.assert_called_once_with("Paris")
     mock_cache.set_weather.assert_called_once_with("Paris", provider_weather)
+
+
+@pytest.mark.asyncio
+async def test_get_weather_coalesces_concurrent_misses(
+    mock_cache, mock_weather_provider, sample_weather_data
+):
+    """Test that concurrent misses for one city share a single provider call."""
+    mock_cache.get_weather.return_value = None
+    provider_weather = WeatherEntity(
+        city="London",
+        temperature=sample_weather_data["temperature"],
+        humidity=sample_weather_data["humidity"],
+        forecast=[],
+    )
+    release = asyncio.Event()
+
+    async def slow_fetch(city_name):
+        await release.wait()
+        return provider_weather
+
+    mock_weather_provider.get_weather.side_effect = slow_fetch
+
+    service = WeatherService(
+        provider=mock_weather_provider, cache=mock_cache, coalescer=SingleFlight()
+    )
+
+    tasks = [asyncio.create_task(service.get_weather(city)) for city in ("London", "london ")]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks)
+
+    assert results == [provider_weather, provider_weather]
+    mock_weather_provider.get_weather.assert_called_once_with("London")
+    mock_cache.set_weather.assert_called_once_with("London", provider_weather)
+
+
+@pytest.mark.asyncio
+async def test_get_weather_serves_stale_and_refreshes(mock_cache, mock_weather_provider):
+    """Test that entries past the soft TTL are returned immediately and refreshed once."""
+    stale_weather = WeatherEntity(
+        city="London", temperature=10.0, humidity=50, forecast=[], fetched_at=time.time() - 120
+    )
+    fresh_weather = WeatherEntity(
+        city="London", temperature=12.0, humidity=55, forecast=[], fetched_at=time.time()
+    )
+    mock_cache.get_weather.return_value = stale_weather
+    mock_weather_provider.get_weather.return_value = fresh_weather
+
+    service = WeatherService(provider=mock_weather_provider, cache=mock_cache, soft_ttl=60)
+
+    results = await asyncio.gather(service.get_weather("London"), service.get_weather("london"))
+    assert results == [stale_weather, stale_weather]
+
+    await asyncio.gather(*service._refreshing.values())
+    mock_weather_provider.get_weather.assert_called_once_with("London")
+    mock_cache.set_weather.assert_called_once_with("London", fresh_weather)
+
+
+@pytest.mark.asyncio
+async def test_get_weather_fresh_entry_not_refreshed(mock_cache, mock_weather_provider):
+    """Test that entries within the soft TTL do not trigger a refresh."""
+    mock_cache.get_weather.return_value = WeatherEntity(
+        city="London", temperature=10.0, humidity=50, forecast=[], fetched_at=time.time()
+    )
+    service = WeatherService(provider=mock_weather_provider, cache=mock_cache, soft_ttl=60)
+
+    await service.get_weather("London")
+
+    assert service._refreshing == {}
+    mock_weather_provider.get_weather.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_background_refresh_failure_is_swallowed(mock_cache, mock_weather_provider):
+    """Test that a failed refresh leaves the stale value in place without raising."""
+    stale_weather = WeatherEntity(
+        city="London", temperature=10.0, humidity=50, forecast=[], fetched_at=0.0
+    )
+    mock_cache.get_weather.return_value = stale_weather
+    mock_weather_provider.get_weather.side_effect = Exception("upstream down")
+    service = WeatherService(provider=mock_weather_provider, cache=mock_cache, soft_ttl=60)
+
+    assert await service.get_weather("London") == stale_weather
+    await asyncio.gather(*service._refreshing.values())
+
+    mock_cache.set_weather.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_weather_falls_back_to_last_known_good(mock_cache, mock_weather_provider):
+    """Test that an open provider circuit serves the last-known-good entry as degraded."""
+    mock_cache.get_weather.return_value = None
+    mock_weather_provider.get_weather.side_effect = ServiceUnavailable("Weather Provider")
+    fallback_cache = AsyncMock()
+    fallback_cache.get_weather.return_value = WeatherEntity(
+        city="London", temperature=10.0, humidity=50, forecast=[]
+    )
+    service = WeatherService(
+        provider=mock_weather_provider, cache=mock_cache, fallback_cache=fallback_cache
+    )
+
+    result = await service.get_weather("London")
+
+    assert result.degraded is True
+    assert result.temperature == 10.0
+    fallback_cache.get_weather.assert_called_once_with("London")
+
+
+@pytest.mark.asyncio
+async def test_get_weather_unavailable_without_last_known_good(mock_cache, mock_weather_provider):
+    """Test that ServiceUnavailable propagates when there is nothing to fall back to."""
+    mock_cache.get_weather.return_value = None
+    mock_weather_provider.get_weather.side_effect = ServiceUnavailable("Weather Provider")
+    fallback_cache = AsyncMock()
+    fallback_cache.get_weather.return_value = None
+    service = WeatherService(
+        provider=mock_weather_provider, cache=mock_cache, fallback_cache=fallback_cache
+    )
+
+    with pytest.raises(ServiceUnavailable):
+        await service.get_weather("London")
+
+
+@pytest.mark.asyncio
+async def test_fetch_writes_last_known_good(mock_cache, mock_weather_provider):
+    """Test that successful fetches also refresh the last-known-good store."""
+    mock_cache.get_weather.return_value = None
+    weather = WeatherEntity(city="London", temperature=10.0, humidity=50, forecast=[])
+    mock_weather_provider.get_weather.return_value = weather
+    fallback_cache = AsyncMock()
+    service = WeatherService(
+        provider=mock_weather_provider, cache=mock_cache, fallback_cache=fallback_cache
+    )
+
+    await service.get_weather("London")
+
+    fallback_cache.set_weather.assert_called_once_with("London", weather)
+
+
+@pytest.mark.asyncio
+async def test_get_weather_many_batches_cache_and_isolates_errors(
+    mock_cache, mock_weather_provider
+):
+    """Test that batch lookups read the cache in bulk and report per-city errors."""
+    london = WeatherEntity(city="London", temperature=10.0, humidity=50, forecast=[])
+    paris = WeatherEntity(city="Paris", temperature=12.0, humidity=60, forecast=[])
+    mock_cache.get_many.return_value = {"London": london, "Paris": None, "Atlantis": None}
+
+    async def fetch(city_name):
+        if city_name == "Atlantis":
+            raise CityNotFound(city_name)
+        return paris
+
+    mock_weather_provider.get_weather.side_effect = fetch
+    service = WeatherService(provider=mock_weather_provider, cache=mock_cache)
+
+    results = await service.get_weather_many(["London", "Paris", "Atlantis", "london"])
+
+    assert results["London"] == london
+    assert results["london"] == london
+    assert results["Paris"] == paris
+    assert isinstance(results["Atlantis"], CityNotFound)
+    mock_cache.get_many.assert_called_once_with(["London", "Paris", "Atlantis"])
+    mock_cache.set_weather.assert_called_once_with("Paris", paris)
+    assert mock_weather_provider.get_weather.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_get_weather_many_bounds_concurrency(mock_cache, mock_weather_provider):
+    """Test that at most batch_concurrency upstream fetches run at once."""
+    mock_cache.get_many.side_effect = lambda names: dict.fromkeys(names)
+    running = 0
+    peak = 0
+
+    async def fetch(city_name):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return WeatherEntity(city=city_name, temperature=1.0, humidity=1, forecast=[])
+
+    mock_weather_provider.get_weather.side_effect = fetch
+    service = WeatherService(provider=mock_weather_provider, cache=mock_cache, batch_concurrency=2)
+
+    results = await service.get_weather_many([f"city-{i}" for i in range(6)])
+
+    assert len(results) == 6
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_get_weather_many_shares_location_keys(mock_cache, mock_weather_provider):
+    """Test that in location mode batch and single lookups share cache entries."""
+    store = {}
+    mock_cache.get_weather.side_effect = lambda key: store.get(key)
+    mock_cache.set_weather.side_effect = lambda key, weather: store.__setitem__(key, weather)
+    mock_cache.get_many.side_effect = lambda keys: {key: store.get(key) for key in keys}
+
+    async def geocode(city_name):
+        if city_name == "Atlantis":
+            raise CityNotFound(city_name)
+        return GeoLocation(name="London", latitude=51.5, longitude=-0.12, timezone="GMT")
+
+    mock_weather_provider.geocode.side_effect = geocode
+    mock_weather_provider.get_weather_at.return_value = WeatherEntity(
+        city="London", temperature=10.0, humidity=50, forecast=[]
+    )
+    service = WeatherService(provider=mock_weather_provider, cache=mock_cache, city_keys="location")
+
+    await service.get_weather("London")
+    results = await service.get_weather_many(["london", "Londres", "Atlantis"])
+
+    assert results["london"].city == results["Londres"].city == "London"
+    assert isinstance(results["Atlantis"], CityNotFound)
+    mock_cache.get_many.assert_called_once_with(["loc:London:51.500,-0.120"])
+    mock_weather_provider.get_weather_at.assert_called_once()
+    mock_weather_provider.get_weather.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_nearby_coordinates_share_one_cell(mock_cache, mock_weather_provider):
+    """Test that coordinates in the same grid cell share one cache key and fetch."""
+    store = {}
+    mock_cache.get_weather.side_effect = lambda key: store.get(key)
+    mock_cache.set_weather.side_effect = lambda key, weather: store.__setitem__(key, weather)
+    mock_weather_provider.get_weather_at.side_effect = lambda location: WeatherEntity(
+        city=location.name, temperature=1.0, humidity=1, forecast=[]
+    )
+    service = WeatherService(provider=mock_weather_provider, cache=mock_cache, grid_precision=5)
+
+    first = await service.get_weather_at(51.5074, -0.1278)
+    second = await service.get_weather_at(51.5080, -0.1300)
+
+    assert first.city == second.city == "gcpvj"
+    assert list(store) == ["cell:gcpvj"]
+    mock_weather_provider.get_weather_at.assert_called_once()
+    location = mock_weather_provider.get_weather_at.call_args[0][0]
+    assert location.timezone == "auto"
+
+
+@pytest.mark.asyncio
+async def test_city_cells_geocode_and_share_cell(mock_cache, mock_weather_provider):
+    """Test that, keyed by cell, aliases resolve to one cached cell entry."""
+    cell_weather = WeatherEntity(city="gcpvj", temperature=1.0, humidity=1, forecast=[])
+    mock_cache.get_weather.return_value = cell_weather
+    mock_weather_provider.geocode.return_value = GeoLocation(
+        name="London", latitude=51.5074, longitude=-0.1278, timezone="Europe/London"
+    )
+    service = WeatherService(provider=mock_weather_provider, cache=mock_cache, city_keys="cell")
+
+    weather = await service.get_weather("london, uk")
+
+    assert weather.city == "London"
+    mock_cache.get_weather.assert_called_once_with("cell:gcpvj")
+    mock_weather_provider.get_weather.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_location_keys_let_aliases_share_an_entry(mock_cache, mock_weather_provider):
+    """Test that different spellings geocoding to one place share a cache entry."""
+    store = {}
+    mock_cache.get_weather.side_effect = lambda key: store.get(key)
+    mock_cache.set_weather.side_effect = lambda key, weather: store.__setitem__(key, weather)
+    mock_cache.get_many.side_effect = lambda keys: {key: store.get(key) for key in keys}
+    london = GeoLocation(
+        name="London", latitude=51.5085, longitude=-0.1257, timezone="Europe/London"
+    )
+    mock_weather_provider.geocode.return_value = london
+    mock_weather_provider.get_weather_at.return_value = WeatherEntity(
+        city="London", temperature=1.0, humidity=1, forecast=[]
+    )
+    service = WeatherService(provider=mock_weather_provider, cache=mock_cache, city_keys="location")
+
+    await service.get_weather("Londres")
+    weather = await service.get_weather(" london ")
+
+    assert weather.city == "London"
+    assert list(store) == ["loc:London:51.508,-0.126"]
+    mock_weather_provider.get_weather_at.assert_called_once_with(london)
+    assert await service.peek_many(["LONDON"]) == {"LONDON": weather}
+
+
+def test_unknown_city_keys_mode_is_rejected(mock_cache, mock_weather_provider):
+    """Test that a misconfigured keying mode fails at startup."""
+    with pytest.raises(ValueError, match="Unknown city_keys"):
+        WeatherService(provider=mock_weather_provider, cache=mock_cache, city_keys="alias")
+
+
+@pytest.mark.asyncio
+async def test_cache_miss_does_not_wait_for_cache_write(mock_cache, mock_weather_provider):
+    """Test that a miss returns while the write-behind cache write is still pending."""
+    weather = WeatherEntity(city="London", temperature=10.0, humidity=50.0, forecast=[])
+    mock_cache.get_weather.return_value = None
+    mock_weather_provider.get_weather.return_value = weather
+    release = asyncio.Event()
+
+    async def slow_write(*_):
+        await release.wait()
+
+    mock_cache.set_weather.side_effect = slow_write
+    cache = WriteBehindCache(mock_cache)
+    service = WeatherService(provider=mock_weather_provider, cache=cache)
+
+    result = await asyncio.wait_for(service.get_weather("London"), timeout=0.1)
+
+    assert result == weather
+    # Until it is written, the queued entry is what later lookups see.
+    assert await service.get_weather("London") == weather
+    mock_weather_provider.get_weather.assert_called_once()
+    release.set()
+    await cache.flush()
+    mock_cache.set_weather.assert_awaited_once_with("London", weather)
+
+
+@pytest.mark.asyncio
+async def test_distributed_coalescing_writes_before_releasing_lock(
+    mock_cache, mock_weather_provider
+):
+    """Test that with a Redis lock the entry is cached before other replicas recheck."""
+    weather = WeatherEntity(city="London", temperature=10.0, humidity=50.0, forecast=[])
+    mock_cache.get_weather.return_value = None
+    mock_weather_provider.get_weather.return_value = weather
+    events = []
+    mock_cache.set_weather.side_effect = lambda *_: events.append("set")
+    lock = MagicMock()
+    lock.acquire = AsyncMock(return_value=True)
+    lock.release = AsyncMock(side_effect=lambda: events.append("release"))
+    redis_client = MagicMock()
+    redis_client.lock.return_value = lock
+    service = WeatherService(
+        provider=mock_weather_provider,
+        cache=mock_cache,
+        coalescer=RedisLockCoalescer(redis_client),
+    )
+
+    assert await service.get_weather("London") == weather
+    assert events == ["set", "release"]
+
+
+@pytest.mark.asyncio
+async def test_distributed_coalescing_batch_writes_before_releasing_lock(
+    mock_cache, mock_weather_provider
+):
+    """Test that batch misses are cached before the Redis lock is released too."""
+    weather = WeatherEntity(city="London", temperature=10.0, humidity=50.0, forecast=[])
+    mock_cache.get_many.side_effect = lambda keys: dict.fromkeys(keys)
+    mock_weather_provider.get_weather.return_value = weather
+    events = []
+    mock_cache.set_weather.side_effect = lambda *_: events.append("set")
+    lock = MagicMock()
+    lock.acquire = AsyncMock(return_value=True)
+    lock.release = AsyncMock(side_effect=lambda: events.append("release"))
+    redis_client = MagicMock()
+    redis_client.lock.return_value = lock
+    service = WeatherService(
+        provider=mock_weather_provider,
+        cache=mock_cache,
+        coalescer=RedisLockCoalescer(redis_client),
+    )
+
+    assert await service.get_weather_many(["London"]) == {"London": weather}
+    assert events == ["set", "release"]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_spellings_share_one_geocode(mock_cache, mock_weather_provider):
+    """Test that concurrent lookups of a new spelling geocode it once."""
+    mock_cache.get_weather.return_value = None
+    release = asyncio.Event()
+
+    async def geocode(city_name):
+        await release.wait()
+        return GeoLocation(name="London", latitude=51.5, longitude=-0.12, timezone="GMT")
+
+    mock_weather_provider.geocode.side_effect = geocode
+    mock_weather_provider.get_weather_at.return_value = WeatherEntity(
+        city="London", temperature=10.0, humidity=50, forecast=[]
+    )
+    service = WeatherService(
+        provider=mock_weather_provider,
+        cache=mock_cache,
+        coalescer=SingleFlight(),
+        city_keys="location",
+    )
+
+    lookups = asyncio.gather(service.get_weather("London"), service.get_weather("london "))
+    await asyncio.sleep(0)
+    release.set()
+    results = await lookups
+
+    assert [weather.city for weather in results] == ["London", "London"]
+    mock_weather_provider.geocode.assert_called_once()
+    mock_weather_provider.get_weather_at.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_lookup_returns_the_cache_key(mock_cache, mock_weather_provider):
+    """Test that lookups report the key of the entry, which tells same-named places apart."""
+    mock_cache.get_weather.return_value = WeatherEntity(
+        city="Springfield", temperature=10.0, humidity=50, forecast=[]
+    )
+    mock_weather_provider.geocode.return_value = GeoLocation(
+        name="Springfield", latitude=39.7990, longitude=-89.6440, timezone="America/Chicago"
+    )
+    service = WeatherService(provider=mock_weather_provider, cache=mock_cache, city_keys="location")
+
+    key, weather = await service.lookup("Springfield, IL")
+    cell_key, _ = await service.lookup_at(51.5074, -0.1278)
+
+    assert key == "loc:Springfield:39.799,-89.644"
+    assert weather.city == "Springfield"
+    assert cell_key == "cell:gcpvj"
@@ -0,0 +1,85 @@
+"""Tests for the columnar forecast."""
+
+import math
+from array import array
+
+import pytest
+
+from core.domain.forecast import Forecast
+
+TIMES = [f"2026-01-09T{hour:02d}:00" for hour in range(6)]
+TEMPERATURES = [10.0, 11.0, 12.0, 13.0, 14.0, 15.0]
+HUMIDITY = [50, 51, None, 53, 54, 55]
+
+
+@pytest.fixture
+def forecast():
+    return Forecast(TIMES, {"temperature": TEMPERATURES, "humidity": HUMIDITY})
+
+
+def test_behaves_like_list_of_rows(forecast):
+    """Test that indexing, len, iteration and equality work on row dicts."""
+    rows = [
+        {"time": t, "temperature": temp, "humidity": hum}
+        for t, temp, hum in zip(TIMES, TEMPERATURES, HUMIDITY, strict=True)
+    ]
+
+    assert len(forecast) == 6
+    assert forecast[0] == rows[0]
+    assert forecast[-1] == rows[-1]
+    assert list(forecast) == rows
+    assert forecast == rows
+    assert rows == forecast
+    assert forecast != rows[:5]
+    assert Forecast() == []
+    with pytest.raises(IndexError):
+        forecast[6]
+
+
+def test_slices_share_the_columns(forecast):
+    """Test that slicing returns a view over the same arrays."""
+    window = forecast[2:4]
+
+    assert isinstance(window, Forecast)
+    assert window.columns["temperature"] is TEMPERATURES
+    assert window == [
+        {"time": TIMES[2], "temperature": 12.0, "humidity": None},
+        {"time": TIMES[3], "temperature": 13.0, "humidity": 53},
+    ]
+    assert window[1:] == forecast[3:4]
+    assert forecast[:100] == forecast
+    assert len(forecast[5:2]) == 0
+    assert forecast[::2] == list(forecast)[::2]
+
+
+def test_columns_are_not_copied_when_whole(forecast):
+    """Test that unsliced columns are handed out as the original objects."""
+    assert forecast.column("temperature") is TEMPERATURES
+    assert forecast.time_values() is TIMES
+    assert forecast[1:3].column("temperature") == [11.0, 12.0]
+    assert forecast[1:3].column("precipitation") == [None, None]
+
+
+def test_rows_select_variables(forecast):
+    """Test that rows can be limited to some variables, with None for unknown ones."""
+    assert forecast[:1].rows(["humidity", "wind_speed"]) == [
+        {"time": TIMES[0], "humidity": 50, "wind_speed": None}
+    ]
+
+
+def test_nan_and_short_columns_read_as_none():
+    """Test that NaN (binary formats) and missing trailing values read as None."""
+    forecast = Forecast(TIMES[:3], {"temperature": array("d", [1.0, math.nan, 3.0]), "wind": [1]})
+
+    assert [row["temperature"] for row in forecast] == [1.0, None, 3.0]
+    assert [row["wind"] for row in forecast] == [1, None, None]
+    assert forecast[2:].column("wind") == [None]
+
+
+def test_from_rows_round_trip(forecast):
+    """Test that a list of row dicts converts to an equal columnar forecast."""
+    converted = Forecast.from_rows(list(forecast))
+
+    assert converted == forecast
+    assert converted.variables == ("temperature", "humidity")
+    assert Forecast.of(forecast) is forecast
@@ -0,0 +1,22 @@
+"""Tests for geohash cell snapping."""
+
+import pytest
+
+from core.domain import geohash
+
+
+def test_encode_matches_reference_value():
+    """Test against the canonical geohash example."""
+    assert geohash.encode(57.64911, 10.40744, 11) == "u4pruydqqvj"
+
+
+@pytest.mark.parametrize("precision", [3, 5, 7])
+def test_cell_center_lies_in_its_own_cell(precision):
+    """Test that snapping is stable: a cell's centre encodes back to the cell."""
+    cell = geohash.encode(-33.8688, 151.2093, precision)
+    assert geohash.encode(*geohash.cell_center(cell), precision) == cell
+
+
+def test_nearby_points_share_a_cell():
+    """Test that points a few hundred metres apart snap to the same cell."""
+    assert geohash.encode(51.5074, -0.1278, 5) == geohash.encode(51.5080, -0.1300, 5)
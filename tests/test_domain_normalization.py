@@ -0,0 +1,21 @@
+"""Tests for city name normalization."""
+
+import pytest
+
+from core.domain.normalization import normalize_city
+
+
+@pytest.mark.parametrize("variant", [" London", "london ", "LONDON", "\tLondon\n", "ＬＯＮＤＯＮ"])
+def test_variants_share_one_key(variant):
+    """Test that whitespace, case and full-width variants normalize alike."""
+    assert normalize_city(variant) == "london"
+
+
+def test_inner_whitespace_collapses():
+    """Test that runs of whitespace inside a name become one space."""
+    assert normalize_city("  New \t York ") == "new york"
+
+
+def test_casefold_handles_non_ascii():
+    """Test that casefolding goes beyond str.lower()."""
+    assert normalize_city("STRASSE") == normalize_city("straße")
@@ -0,0 +1,105 @@
+"""Tests for micro-batching of provider calls."""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from core.domain.exceptions import CityNotFound
+from core.domain.models import GeoLocation, WeatherEntity
+from infra.batching import MicroBatchingProvider
+
+
+def weather_for(city_name):
+    """Build a minimal weather entity for a city."""
+    return WeatherEntity(city=city_name, temperature=10.0, humidity=50.0, forecast=[])
+
+
+@pytest.fixture
+def inner_provider():
+    """Mock provider answering multi-city requests."""
+    provider = AsyncMock()
+
+    async def get_weather_many(city_names):
+        return {
+            name: CityNotFound(name) if name == "Atlantis" else weather_for(name)
+            for name in city_names
+        }
+
+    provider.get_weather_many.side_effect = get_weather_many
+    return provider
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_batch(inner_provider):
+    """Test that calls within the window are grouped into one upstream call."""
+    provider = MicroBatchingProvider(inner_provider, window=0.01)
+
+    results = await asyncio.gather(
+        provider.get_weather("London"),
+        provider.get_weather("Paris"),
+        provider.get_weather("London"),
+    )
+
+    assert [r.city for r in results] == ["London", "Paris", "London"]
+    inner_provider.get_weather_many.assert_called_once_with(["London", "Paris"])
+    inner_provider.get_weather.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_batch_errors_are_per_city(inner_provider):
+    """Test that one failing city does not fail the others in its batch."""
+    provider = MicroBatchingProvider(inner_provider, window=0.01)
+
+    london, atlantis = await asyncio.gather(
+        provider.get_weather("London"), provider.get_weather("Atlantis"), return_exceptions=True
+    )
+
+    assert london.city == "London"
+    assert isinstance(atlantis, CityNotFound)
+
+
+@pytest.mark.asyncio
+async def test_full_batch_flushes_immediately(inner_provider):
+    """Test that reaching max_batch_size flushes without waiting for the window."""
+    provider = MicroBatchingProvider(inner_provider, window=60, max_batch_size=2)
+
+    results = await asyncio.wait_for(
+        asyncio.gather(provider.get_weather("London"), provider.get_weather("Paris")), timeout=1
+    )
+
+    assert len(results) == 2
+
+
+@pytest.mark.asyncio
+async def test_whole_batch_failure_propagates(inner_provider):
+    """Test that an exception from the batch call reaches every caller."""
+    inner_provider.get_weather_many.side_effect = RuntimeError("boom")
+    provider = MicroBatchingProvider(inner_provider, window=0.01)
+
+    results = await asyncio.gather(
+        provider.get_weather("London"), provider.get_weather("Paris"), return_exceptions=True
+    )
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+@pytest.mark.asyncio
+async def test_coordinate_calls_share_one_batch(inner_provider):
+    """Test that get_weather_at calls within the window become one bulk call."""
+    inner_provider.get_weather_at_many.side_effect = lambda locations: [
+        weather_for(location.name) for location in locations
+    ]
+    provider = MicroBatchingProvider(inner_provider, window=0.01)
+    london = GeoLocation(name="London", latitude=51.5, longitude=-0.12, timezone="GMT")
+    paris = GeoLocation(name="Paris", latitude=48.85, longitude=2.35, timezone="CET")
+
+    results = await asyncio.gather(
+        provider.get_weather_at(london),
+        provider.get_weather_at(paris),
+        provider.get_weather_at(GeoLocation(**vars(london))),
+    )
+
+    assert [r.city for r in results] == ["London", "Paris", "London"]
+    inner_provider.get_weather_at_many.assert_called_once_with([london, paris])
+    inner_provider.get_weather_at.assert_not_called()
@@ -2,13 +2,15 @@
 
 import json
 from dataclasses import asdict
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+import redis.asyncio as redis
 from circuitbreaker import CircuitBreakerError
 
 from core.domain.models import WeatherEntity
 from infra.cache import RedisCacheAdapter
+from infra.redis_clients import create_redis_client
 
 
 @pytest.fixture
@@ -132,6 +134,19 @@ async def test_cache_set_handles_errors_gracefully(mock_redis, sample_weather):
     mock_redis.set.assert_called_once()
 
 
+@pytest.mark.asyncio
+async def test_cache_set_can_raise_write_errors(mock_redis, sample_weather):
+    """Test that write errors propagate when the adapter is asked to raise them."""
+    mock_redis.set.side_effect = ConnectionError("Redis connection error")
+    mock_redis.pipeline = MagicMock(side_effect=ConnectionError("Redis connection error"))
+    cache = RedisCacheAdapter("redis://unused", client=mock_redis, raise_write_errors=True)
+
+    with pytest.raises(ConnectionError):
+        await cache.set_weather("TestCity", sample_weather)
+    with pytest.raises(ConnectionError):
+        await cache.set_many({"TestCity": sample_weather, "Other": sample_weather})
+
+
 @pytest.mark.asyncio
 async def test_cache_set_handles_circuit_breaker_open(mock_redis, sample_weather):
     """Test cache set handles circuit breaker gracefully."""
@@ -198,3 +213,90 @@ async def test_cache_ttl_configuration(mock_redis):
 
         # Verify default TTL
         assert cache.ttl == 3600  # 1 hour
+
+
+@pytest.mark.asyncio
+async def test_cache_custom_prefix_and_shared_client(mock_redis, sample_weather):
+    """Test that a last-known-good store can share the client under its own prefix."""
+    cache = RedisCacheAdapter(
+        "redis://localhost:6379/0", ttl=86400, key_prefix="lkg:weather", client=mock_redis
+    )
+
+    await cache.set_weather("London", sample_weather)
+
+    assert mock_redis.set.call_args[0][0] == "lkg:weather:london"
+    assert mock_redis.set.call_args[1]["ex"] == 86400
+
+
+@pytest.mark.asyncio
+async def test_cache_get_many_uses_mget(mock_redis, sample_weather):
+    """Test that bulk reads are a single MGET."""
+    mock_redis.mget.return_value = [json.dumps(asdict(sample_weather)), None]
+
+    with patch("infra.cache.redis.from_url", return_value=mock_redis):
+        cache = RedisCacheAdapter("redis://localhost:6379/0")
+        result = await cache.get_many(["TestCity", "Other"])
+
+    mock_redis.mget.assert_called_once_with(["weather:testcity", "weather:other"])
+    assert result["TestCity"].city == "TestCity"
+    assert result["Other"] is None
+
+
+@pytest.mark.asyncio
+async def test_cache_get_many_error_is_miss(mock_redis):
+    """Test that MGET failures are treated as misses for every key."""
+    mock_redis.mget.side_effect = Exception("Redis connection error")
+
+    with patch("infra.cache.redis.from_url", return_value=mock_redis):
+        cache = RedisCacheAdapter("redis://localhost:6379/0")
+        result = await cache.get_many(["A", "B"])
+
+    assert result == {"A": None, "B": None}
+
+
+@pytest.mark.asyncio
+async def test_cache_set_many_pipelines_writes(mock_redis, sample_weather):
+    """Test that bulk writes go through one non-transactional pipeline."""
+    pipe = MagicMock()
+    pipe.__aenter__ = AsyncMock(return_value=pipe)
+    pipe.__aexit__ = AsyncMock(return_value=None)
+    pipe.execute = AsyncMock()
+    mock_redis.pipeline = MagicMock(return_value=pipe)
+
+    with patch("infra.cache.redis.from_url", return_value=mock_redis):
+        cache = RedisCacheAdapter("redis://localhost:6379/0")
+        await cache.set_many({"A": sample_weather, "B": sample_weather})
+
+    mock_redis.pipeline.assert_called_once_with(transaction=False)
+    assert [c[0][0] for c in pipe.set.call_args_list] == ["weather:a", "weather:b"]
+    assert all(c[1]["ex"] == 3600 for c in pipe.set.call_args_list)
+    pipe.execute.assert_called_once()
+
+
+def test_create_redis_client_uses_blocking_pool():
+    """Test that pool size, wait timeout and socket options reach the pool."""
+    client = create_redis_client(
+        "redis://localhost:6379/0",
+        max_connections=7,
+        pool_timeout=1.5,
+        socket_timeout=0.5,
+        health_check_interval=10,
+    )
+    pool = client.connection_pool
+
+    assert isinstance(pool, redis.BlockingConnectionPool)
+    assert pool.max_connections == 7
+    assert pool.timeout == 1.5
+    assert pool.connection_kwargs["socket_timeout"] == 0.5
+    assert pool.connection_kwargs["health_check_interval"] == 10
+    assert pool.connection_kwargs["decode_responses"] is False
+
+
+@pytest.mark.asyncio
+async def test_cache_delete_many_single_command(mock_redis):
+    """Test that bulk deletes are sent as one DEL."""
+    cache = RedisCacheAdapter("redis://localhost:6379/0", client=mock_redis)
+
+    await cache.delete_many(["London", "Paris"])
+
+    mock_redis.delete.assert_called_once_with("weather:london", "weather:paris")
@@ -0,0 +1,120 @@
+"""Tests for request coalescing (single-flight) infrastructure."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from infra.coalescing import RedisLockCoalescer, SingleFlight
+
+
+@pytest.fixture
+def mock_lock():
+    """Mock Redis lock that is free on the first attempt."""
+    lock = MagicMock()
+    lock.acquire = AsyncMock(return_value=True)
+    lock.release = AsyncMock()
+    return lock
+
+
+@pytest.fixture
+def mock_redis(mock_lock):
+    """Mock Redis client handing out the mock lock."""
+    client = MagicMock()
+    client.lock.return_value = mock_lock
+    return client
+
+
+@pytest.mark.asyncio
+async def test_single_flight_shares_result():
+    """Test that concurrent callers for one key await the same call."""
+    flight = SingleFlight()
+    release = asyncio.Event()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return "value"
+
+    tasks = [asyncio.create_task(flight.run("london", fetch)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*tasks) == ["value"] * 5
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_single_flight_propagates_errors_and_resets():
+    """Test that a failed fetch raises for every caller and is not cached."""
+    flight = SingleFlight()
+    fetch = AsyncMock(side_effect=[ValueError("boom"), "value"])
+
+    with pytest.raises(ValueError):
+        await flight.run("london", fetch)
+
+    assert await flight.run("london", fetch) == "value"
+    assert fetch.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_single_flight_survives_cancelled_caller():
+    """Test that cancelling one waiter does not cancel the shared fetch."""
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def fetch():
+        await release.wait()
+        return "value"
+
+    first = asyncio.create_task(flight.run("london", fetch))
+    second = asyncio.create_task(flight.run("london", fetch))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+
+    assert await second == "value"
+
+
+@pytest.mark.asyncio
+async def test_redis_coalescer_uncontended(mock_redis, mock_lock):
+    """Test that the lock holder fetches without rechecking the cache."""
+    coalescer = RedisLockCoalescer(mock_redis)
+    fetch = AsyncMock(return_value="value")
+    recheck = AsyncMock()
+
+    assert await coalescer.run("london", fetch, recheck=recheck) == "value"
+
+    mock_redis.lock.assert_called_once()
+    assert mock_redis.lock.call_args[0][0] == "lock:weather:london"
+    recheck.assert_not_called()
+    mock_lock.release.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_redis_coalescer_contended_uses_recheck(mock_redis, mock_lock):
+    """Test that a process that waited for the lock reuses the other fetch."""
+    mock_lock.acquire.side_effect = [False, True]
+    coalescer = RedisLockCoalescer(mock_redis)
+    fetch = AsyncMock(return_value="fresh")
+    recheck = AsyncMock(return_value="cached")
+
+    assert await coalescer.run("london", fetch, recheck=recheck) == "cached"
+
+    fetch.assert_not_called()
+    mock_lock.release.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_redis_coalescer_fails_open_on_lock_error(mock_redis, mock_lock):
+    """Test that Redis errors fall back to an uncoordinated fetch."""
+    mock_lock.acquire.side_effect = ConnectionError("redis down")
+    coalescer = RedisLockCoalescer(mock_redis)
+    fetch = AsyncMock(return_value="value")
+
+    assert await coalescer.run("london", fetch) == "value"
+
+    fetch.assert_called_once()
+    mock_lock.release.assert_not_called()
@@ -0,0 +1,98 @@
+"""Tests for the geocode cache tiers and the LRU helper."""
+
+import json
+from dataclasses import asdict
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from core.domain.models import GeoLocation
+from infra.geocode_cache import LRUGeocodeCache, RedisGeocodeCache
+from infra.lru import LRUCache
+
+
+@pytest.fixture
+def london():
+    """Sample geocoding result."""
+    return GeoLocation(name="London", latitude=51.5074, longitude=-0.1278, timezone="Europe/London")
+
+
+def test_lru_evicts_least_recently_used():
+    """Test that the LRU drops the oldest untouched entry when full."""
+    on_evict = MagicMock()
+    lru = LRUCache(maxsize=2, on_evict=on_evict)
+    lru.set("a", 1)
+    lru.set("b", 2)
+    lru.get("a")
+    lru.set("c", 3)
+
+    assert "a" in lru
+    assert "b" not in lru
+    on_evict.assert_called_once_with("b")
+
+
+def test_lru_expires_entries():
+    """Test that entries past their TTL are treated as misses."""
+    on_evict = MagicMock()
+    lru = LRUCache(maxsize=2, ttl=10, on_evict=on_evict)
+    with patch("infra.lru.time.monotonic", return_value=100.0):
+        lru.set("a", 1)
+    with patch("infra.lru.time.monotonic", return_value=111.0):
+        assert lru.get("a") is None
+
+    on_evict.assert_called_once_with("a")
+    assert len(lru) == 0
+
+
+@pytest.mark.asyncio
+async def test_redis_geocode_cache_roundtrip(london):
+    """Test that locations are stored under geo: keys with the configured TTL."""
+    mock_redis = AsyncMock()
+    cache = RedisGeocodeCache(mock_redis, ttl=None)
+
+    await cache.set_location("London", london)
+    key, data = mock_redis.set.call_args[0]
+    assert key == "geo:london"
+    assert mock_redis.set.call_args[1]["ex"] is None
+
+    mock_redis.get.return_value = data
+    assert await cache.get_location("LONDON") == london
+    mock_redis.get.assert_called_once_with("geo:london")
+
+
+@pytest.mark.asyncio
+async def test_redis_geocode_cache_read_error_is_miss():
+    """Test that Redis errors are treated as a miss."""
+    mock_redis = AsyncMock()
+    mock_redis.get.side_effect = Exception("Redis connection error")
+    cache = RedisGeocodeCache(mock_redis)
+
+    assert await cache.get_location("London") is None
+
+
+@pytest.mark.asyncio
+async def test_lru_geocode_cache_populates_from_backend(london):
+    """Test that backend hits are kept in-process for later lookups."""
+    backend = AsyncMock()
+    backend.get_location.return_value = london
+    cache = LRUGeocodeCache(backend)
+
+    assert await cache.get_location("London") == london
+    assert await cache.get_location("london") == london
+    backend.get_location.assert_called_once_with("London")
+
+
+@pytest.mark.asyncio
+async def test_bulk_lookup_uses_one_mget(london):
+    """Test that LRU misses are fetched from Redis with a single MGET."""
+    mock_redis = AsyncMock()
+    mock_redis.mget.return_value = [json.dumps(asdict(london)), None]
+    cache = LRUGeocodeCache(RedisGeocodeCache(mock_redis))
+
+    results = await cache.get_locations(["London", "Atlantis"])
+
+    assert results == {"London": london, "Atlantis": None}
+    mock_redis.mget.assert_called_once_with(["geo:london", "geo:atlantis"])
+    # Second lookup of London is served by the LRU.
+    assert await cache.get_locations(["London"]) == {"London": london}
+    mock_redis.mget.assert_called_once()
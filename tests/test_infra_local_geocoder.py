@@ -0,0 +1,148 @@
+"""Tests for the offline geocoding index."""
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+from core.domain.models import GeoLocation
+from infra.local_geocoder import LocalGeocoder, Place, build_index, read_geonames
+from infra.open_meteo import OpenMeteoProvider
+
+# geonameid, name, asciiname, alternatenames, lat, lon, then the remaining
+# GeoNames columns (population is column 14, timezone column 17).
+GEONAMES_ROWS = [
+    (
+        "2643743",
+        "London",
+        "London",
+        "Londres,Londra",
+        "51.50853",
+        "-0.12574",
+        8961989,
+        "Europe/London",
+    ),
+    ("6058560", "London", "London", "", "42.98339", "-81.23304", 346765, "America/Toronto"),
+    (
+        "2867714",
+        "München",
+        "Muenchen",
+        "Munich,Monaco di Baviera",
+        "48.13743",
+        "11.57549",
+        1260391,
+        "Europe/Berlin",
+    ),
+    (
+        "2643179",
+        "Londonderry",
+        "Londonderry",
+        "Derry",
+        "54.9981",
+        "-7.30934",
+        83652,
+        "Europe/London",
+    ),
+    ("2988507", "Paris", "Paris", "", "48.85341", "2.3488", 2138551, "Europe/Paris"),
+]
+
+
+@pytest.fixture
+def geonames_file(tmp_path):
+    path = tmp_path / "cities.txt"
+    lines = []
+    for geonameid, name, ascii_name, alternates, lat, lon, population, timezone in GEONAMES_ROWS:
+        columns = [geonameid, name, ascii_name, alternates, lat, lon] + [""] * 13
+        columns[14] = str(population)
+        columns[17] = timezone
+        lines.append("\t".join(columns))
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def geocoder(geonames_file, tmp_path):
+    index = tmp_path / "geocode.idx"
+    build_index(read_geonames(geonames_file, alternate_names=True), index)
+    geocoder = LocalGeocoder(index)
+    yield geocoder
+    geocoder.close()
+
+
+@pytest.mark.asyncio
+async def test_lookup_prefers_most_populous(geocoder):
+    """Test that an ambiguous name resolves to the most populous place."""
+    location = await geocoder.lookup("London")
+
+    assert location.name == "London"
+    assert location.timezone == "Europe/London"
+    assert location.latitude == pytest.approx(51.5085, abs=1e-3)
+    assert location.longitude == pytest.approx(-0.1257, abs=1e-3)
+
+
+@pytest.mark.asyncio
+async def test_lookup_normalizes_and_matches_aliases(geocoder):
+    """Test that lookups match ASCII and alternate names regardless of case and spacing."""
+    assert (await geocoder.lookup("  MÜNCHEN ")).name == "München"
+    assert (await geocoder.lookup("muenchen")).name == "München"
+    assert (await geocoder.lookup("Munich")).name == "München"
+
+
+@pytest.mark.asyncio
+async def test_lookup_miss(geocoder):
+    """Test that unknown names and bare prefixes return None."""
+    assert await geocoder.lookup("Atlantis") is None
+    assert await geocoder.lookup("Lond") is None
+
+
+@pytest.mark.asyncio
+async def test_search_ranks_by_population(geocoder):
+    """Test that prefix search lists each place once, most populous first."""
+    results = await geocoder.search("lond")
+
+    assert [(r.name, r.timezone) for r in results] == [
+        ("London", "Europe/London"),
+        ("London", "America/Toronto"),
+        ("Londonderry", "Europe/London"),
+    ]
+    assert len(await geocoder.search("lond", limit=2)) == 2
+    assert await geocoder.search("zz") == []
+
+
+def test_min_population_and_aliases_filter(geonames_file, tmp_path):
+    """Test that small places and alternate names are skipped unless requested."""
+    index = tmp_path / "small.idx"
+    # name + asciiname for London (twice), Paris and München (asciiname differs)
+    assert build_index(read_geonames(geonames_file, min_population=100000), index) == 5
+
+
+def test_rejects_foreign_file(tmp_path):
+    """Test that a file that is not an index is refused."""
+    path = tmp_path / "bogus.idx"
+    path.write_bytes(b"not an index at all")
+
+    with pytest.raises(ValueError):
+        LocalGeocoder(path)
+
+
+@pytest.mark.asyncio
+async def test_provider_skips_remote_geocoding_on_local_hit(tmp_path):
+    """Test that the provider only calls the forecast API for locally known cities."""
+    index = tmp_path / "geocode.idx"
+    build_index([Place("Paris", 48.85341, 2.3488, "Europe/Paris", 2138551)], index)
+    response = AsyncMock()
+    response.status_code = 200
+    response.raise_for_status = lambda: None
+    response.json = lambda: {"current": {"temperature_2m": 12.0, "relative_humidity_2m": 70}}
+    client = AsyncMock()
+    client.get = AsyncMock(return_value=response)
+    local_geocoder = LocalGeocoder(index)
+    provider = OpenMeteoProvider(client=client, local_geocoder=local_geocoder)
+
+    result = await provider.get_weather("paris")
+    location = await provider.geocode("PARIS")
+
+    assert result.city == "Paris"
+    assert isinstance(location, GeoLocation)
+    client.get.assert_called_once()
+    assert client.get.call_args[0][0] == provider.weather_base_url
+    local_geocoder.close()
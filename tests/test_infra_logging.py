@@ -0,0 +1,116 @@
+"""Tests for the queued JSON logging pipeline."""
+
+import json
+import logging
+import queue
+import sys
+from unittest.mock import patch
+
+from infra.logging import JsonFormatter, NonBlockingQueueHandler, SamplingFilter, ThrottleFilter
+from infra.metrics import DROPPED_LOG_RECORDS
+from infra.request_context import request_id_ctx_var
+
+
+def make_record(msg="hello %s", args=("world",), level=logging.INFO):
+    """Build a log record as a logger would."""
+    return logging.LogRecord("test", level, __file__, 1, msg, args, None)
+
+
+def test_formatter_outputs_json_with_request_id():
+    """Test that records are rendered as JSON including the request ID."""
+    token = request_id_ctx_var.set("req-123")
+    try:
+        output = json.loads(JsonFormatter().format(make_record()))
+    finally:
+        request_id_ctx_var.reset(token)
+
+    assert output["message"] == "hello world"
+    assert output["level"] == "INFO"
+    assert output["request_id"] == "req-123"
+
+
+def test_request_id_captured_at_enqueue_time():
+    """Test that the ID is taken from the emitting context, not the listener's."""
+    log_queue = queue.Queue()
+    handler = NonBlockingQueueHandler(log_queue)
+
+    token = request_id_ctx_var.set("req-456")
+    try:
+        handler.emit(make_record())
+    finally:
+        request_id_ctx_var.reset(token)
+
+    record = log_queue.get_nowait()
+    assert record.getMessage() == "hello world"
+    assert json.loads(JsonFormatter().format(record))["request_id"] == "req-456"
+
+
+def test_full_queue_drops_and_counts():
+    """Test that the drop policy never blocks and counts dropped records."""
+    log_queue = queue.Queue(maxsize=1)
+    handler = NonBlockingQueueHandler(log_queue)
+    before = DROPPED_LOG_RECORDS._value.get()
+
+    handler.emit(make_record())
+    handler.emit(make_record())
+
+    assert log_queue.qsize() == 1
+    assert DROPPED_LOG_RECORDS._value.get() == before + 1
+
+
+def test_exceptions_are_formatted_on_the_listener():
+    """Test that exception info survives the queue and is rendered."""
+    log_queue = queue.Queue()
+    handler = NonBlockingQueueHandler(log_queue)
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = logging.LogRecord(
+            "test", logging.ERROR, __file__, 1, "failed", None, sys.exc_info()
+        )
+    handler.emit(record)
+
+    output = json.loads(JsonFormatter().format(log_queue.get_nowait()))
+    assert "ValueError: boom" in output["exception"]
+
+
+def tagged_record(level=logging.INFO, **extra):
+    """Build a record carrying `extra=` attributes."""
+    record = make_record(level=level)
+    record.__dict__.update(extra)
+    return record
+
+
+def test_sampling_filter_keeps_fraction_of_tagged_records():
+    """Test that tagged records are kept according to their configured rate."""
+    sampler = SamplingFilter({"cache_hit": 0.0, "cache_miss": 1.0})
+
+    assert not sampler.filter(tagged_record(sample_key="cache_hit"))
+    assert sampler.filter(tagged_record(sample_key="cache_miss"))
+    # Unknown keys and untagged records are always kept.
+    assert sampler.filter(tagged_record(sample_key="other"))
+    assert sampler.filter(make_record())
+
+
+def test_sampling_filter_never_drops_warnings():
+    """Test that WARNING and above bypass sampling."""
+    sampler = SamplingFilter({"cache_hit": 0.0})
+    assert sampler.filter(tagged_record(level=logging.WARNING, sample_key="cache_hit"))
+
+
+def test_throttle_filter_collapses_repeats_into_summary():
+    """Test that repeats within the window are suppressed and then summarized."""
+    throttle = ThrottleFilter(window=60)
+
+    with patch("infra.logging.time.monotonic", return_value=100.0):
+        assert throttle.filter(tagged_record(throttle_key="circuit"))
+        assert not throttle.filter(tagged_record(throttle_key="circuit"))
+        assert not throttle.filter(tagged_record(throttle_key="circuit"))
+        # Other keys are throttled independently.
+        assert throttle.filter(tagged_record(throttle_key="other"))
+
+    with patch("infra.logging.time.monotonic", return_value=161.0):
+        record = tagged_record(throttle_key="circuit")
+        assert throttle.filter(record)
+
+    assert record.getMessage() == "hello world (2 similar messages suppressed in the last 60s)"
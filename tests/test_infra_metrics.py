@@ -0,0 +1,90 @@
+"""Tests for the Prometheus metrics exported by the infrastructure adapters."""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+from circuitbreaker import CircuitBreakerError, circuit
+from prometheus_client import REGISTRY
+
+from infra.cache import RedisCacheAdapter
+from infra.coalescing import SingleFlight
+
+
+def sample(metric, **labels):
+    """Current value of a sample on the default registry (0 when absent)."""
+    return REGISTRY.get_sample_value(metric, labels) or 0.0
+
+
+@pytest.mark.asyncio
+async def test_redis_cache_counts_hits_misses_and_errors():
+    """Test that each lookup outcome is counted under the adapter's tier."""
+    redis_client = AsyncMock()
+    cache = RedisCacheAdapter("redis://unused", client=redis_client, tier="metrics_test")
+    before = {
+        result: sample("weather_cache_requests_total", tier="metrics_test", result=result)
+        for result in ("hit", "miss", "error")
+    }
+
+    redis_client.get.return_value = None
+    await cache.get_weather("Paris")
+    redis_client.get.side_effect = ConnectionError("down")
+    await cache.get_weather("Paris")
+
+    assert sample("weather_cache_requests_total", tier="metrics_test", result="miss") == (
+        before["miss"] + 1
+    )
+    assert sample("weather_cache_requests_total", tier="metrics_test", result="error") == (
+        before["error"] + 1
+    )
+    assert sample("weather_cache_requests_total", tier="metrics_test", result="hit") == 0
+    assert sample("redis_command_duration_seconds_count", command="get") > 0
+
+
+def test_circuit_breaker_state_is_exported():
+    """Test that registered breakers report their current state."""
+    assert sample("circuit_breaker_state", name="open_meteo", state="closed") == 1.0
+    assert sample("circuit_breaker_state", name="open_meteo", state="open") == 0.0
+    assert (
+        REGISTRY.get_sample_value(
+            "circuit_breaker_state", {"name": "redis_cache_get", "state": "closed"}
+        )
+        is not None
+    )
+
+
+@pytest.mark.asyncio
+async def test_open_breaker_is_reported_as_open():
+    """Test that the gauge follows a breaker that trips."""
+
+    @circuit(failure_threshold=1, recovery_timeout=60, name="metrics_test")
+    async def failing():
+        raise ConnectionError("down")
+
+    with pytest.raises(ConnectionError):
+        await failing()
+    with pytest.raises(CircuitBreakerError):
+        await failing()
+
+    assert sample("circuit_breaker_state", name="metrics_test", state="open") == 1.0
+    assert sample("circuit_breaker_failures", name="metrics_test") == 1.0
+
+
+@pytest.mark.asyncio
+async def test_coalescing_inflight_gauge_tracks_running_fetches():
+    """Test that the in-flight gauge rises during a fetch and returns afterwards."""
+    coalescer = SingleFlight()
+    release = asyncio.Event()
+    before = sample("weather_coalescing_inflight")
+
+    async def fetch():
+        await release.wait()
+        return "ok"
+
+    waiters = [asyncio.create_task(coalescer.run("paris", fetch)) for _ in range(3)]
+    await asyncio.sleep(0)
+    assert sample("weather_coalescing_inflight") == before + 1
+
+    release.set()
+    assert await asyncio.gather(*waiters) == ["ok", "ok", "ok"]
+    assert sample("weather_coalescing_inflight") == before
@@ -7,7 +7,8 @@ import pytest
 from circuitbreaker import CircuitBreakerError
 
 from core.domain.exceptions import CityNotFound, ServiceUnavailable
-from core.domain.models import WeatherEntity
+from core.domain.models import GeoLocation, WeatherEntity
+from infra.geocode_cache import LRUGeocodeCache
 from infra.open_meteo import OpenMeteoProvider
 
 
@@ -325,5 +326,249 @@ async def test_weather_api_parameters(mock_geo_response, mock_async_client):
     assert weather_params["longitude"] == -0.1278
     assert weather_params["timezone"] == "Europe/London"
     assert weather_params["current"] == ["temperature_2m", "relative_humidity_2m"]
-    assert weather_params["hourly"] == ["temperature_2m"]
-    assert weather_params["forecast_days"] == 1
+    assert weather_params["hourly"] == [
+        "temperature_2m",
+        "relative_humidity_2m",
+        "precipitation",
+        "wind_speed_10m",
+    ]
+    assert weather_params["forecast_hours"] == 48
+
+
+@pytest.mark.asyncio
+async def test_forecast_rows_carry_every_variable(mock_async_client):
+    """Test that the whole fetched horizon is kept, with all hourly variables per row."""
+    mock_async_client.get = AsyncMock(
+        return_value=mock_async_client.create_mock_response(
+            {
+                "current": {"temperature_2m": 15.0, "relative_humidity_2m": 60},
+                "hourly": {
+                    "time": [f"2026-01-09T{hour:02d}:00" for hour in range(12)],
+                    "temperature_2m": [float(hour) for hour in range(12)],
+                    "relative_humidity_2m": [50] * 12,
+                    "precipitation": [0.0] * 11 + [None],
+                    "wind_speed_10m": [3.5] * 12,
+                },
+            }
+        )
+    )
+    provider = OpenMeteoProvider(client=mock_async_client, forecast_hours=12)
+
+    result = await provider.get_weather_at(GeoLocation("London", 51.5, -0.1, "Europe/London"))
+
+    hourly = mock_async_client.get.return_value.json.return_value["hourly"]
+    assert mock_async_client.get.call_args[1]["params"]["forecast_hours"] == 12
+    assert len(result.forecast) == 12
+    # The upstream arrays are kept as the forecast columns, not copied into rows.
+    assert result.forecast.column("temperature") is hourly["temperature_2m"]
+    assert result.forecast[11] == {
+        "time": "2026-01-09T11:00",
+        "temperature": 11.0,
+        "humidity": 50,
+        "precipitation": None,
+        "wind_speed": 3.5,
+    }
+
+
+@pytest.mark.asyncio
+async def test_client_reused_across_requests(
+    mock_geo_response, mock_weather_response, mock_async_client
+):
+    """Test that one pooled client is shared across cache misses."""
+    responses = [
+        mock_async_client.create_mock_response(mock_geo_response),
+        mock_async_client.create_mock_response(mock_weather_response),
+        mock_async_client.create_mock_response(mock_geo_response),
+        mock_async_client.create_mock_response(mock_weather_response),
+    ]
+    mock_async_client.get = AsyncMock(side_effect=responses)
+
+    with patch("httpx.AsyncClient", return_value=mock_async_client) as client_cls:
+        provider = OpenMeteoProvider()
+        await provider.get_weather("London")
+        await provider.get_weather("London")
+
+    client_cls.assert_called_once()
+    assert mock_async_client.get.call_count == 4
+
+
+def test_client_pool_configuration():
+    """Test that pool limits and timeouts are passed to the HTTP client."""
+    with patch("httpx.AsyncClient") as client_cls:
+        OpenMeteoProvider(
+            max_connections=10,
+            max_keepalive_connections=5,
+            timeout=3.0,
+            connect_timeout=1.0,
+            http2=False,
+        )
+
+    kwargs = client_cls.call_args[1]
+    assert kwargs["http2"] is False
+    assert kwargs["limits"].max_connections == 10
+    assert kwargs["limits"].max_keepalive_connections == 5
+    assert kwargs["timeout"].read == 3.0
+    assert kwargs["timeout"].connect == 1.0
+
+
+@pytest.mark.asyncio
+async def test_provider_close(mock_async_client):
+    """Test that closing the provider closes the pooled client."""
+    mock_async_client.aclose = AsyncMock()
+
+    provider = OpenMeteoProvider(client=mock_async_client)
+    await provider.close()
+
+    mock_async_client.aclose.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_cached_location_skips_geocoding(mock_weather_response, mock_async_client):
+    """Test that a known city costs a single forecast request."""
+    weather_resp = mock_async_client.create_mock_response(mock_weather_response)
+    mock_async_client.get = AsyncMock(return_value=weather_resp)
+
+    geocode_cache = LRUGeocodeCache()
+    await geocode_cache.set_location(
+        "London",
+        GeoLocation(name="London", latitude=51.5074, longitude=-0.1278, timezone="Europe/London"),
+    )
+    provider = OpenMeteoProvider(client=mock_async_client, geocode_cache=geocode_cache)
+
+    result = await provider.get_weather("London")
+
+    assert result.city == "London"
+    mock_async_client.get.assert_called_once()
+    assert mock_async_client.get.call_args[0][0] == provider.weather_base_url
+
+
+@pytest.mark.asyncio
+async def test_geocoding_result_is_cached(
+    mock_geo_response, mock_weather_response, mock_async_client
+):
+    """Test that a remote geocoding result is stored in the geocode cache."""
+    mock_async_client.get = AsyncMock(
+        side_effect=[
+            mock_async_client.create_mock_response(mock_geo_response),
+            mock_async_client.create_mock_response(mock_weather_response),
+        ]
+    )
+    geocode_cache = LRUGeocodeCache()
+    provider = OpenMeteoProvider(client=mock_async_client, geocode_cache=geocode_cache)
+
+    await provider.get_weather("London")
+
+    location = await geocode_cache.get_location("london")
+    assert location.timezone == "Europe/London"
+
+
+@pytest.mark.asyncio
+async def test_get_weather_many_single_forecast_request(mock_weather_response, mock_async_client):
+    """Test that several known cities are fetched with one multi-location request."""
+    geocode_cache = LRUGeocodeCache()
+    await geocode_cache.set_location(
+        "London", GeoLocation("London", 51.5074, -0.1278, "Europe/London")
+    )
+    await geocode_cache.set_location("Paris", GeoLocation("Paris", 48.8566, 2.3522, "Europe/Paris"))
+    paris_response = dict(mock_weather_response, current={"temperature_2m": 20.0})
+    mock_async_client.get = AsyncMock(
+        return_value=mock_async_client.create_mock_response([mock_weather_response, paris_response])
+    )
+    provider = OpenMeteoProvider(client=mock_async_client, geocode_cache=geocode_cache)
+
+    results = await provider.get_weather_many(["London", "Paris"])
+
+    mock_async_client.get.assert_called_once()
+    params = mock_async_client.get.call_args[1]["params"]
+    assert params["latitude"] == "51.5074,48.8566"
+    assert params["longitude"] == "-0.1278,2.3522"
+    assert params["timezone"] == "Europe/London,Europe/Paris"
+    assert results["London"].temperature == 15.5
+    assert results["Paris"].city == "Paris"
+    assert results["Paris"].temperature == 20.0
+
+
+@pytest.mark.asyncio
+async def test_get_weather_many_reports_unknown_cities(
+    mock_geo_response, mock_weather_response, mock_async_client
+):
+    """Test that a geocoding miss is reported per city and not fetched."""
+    mock_async_client.get = AsyncMock(
+        side_effect=[
+            mock_async_client.create_mock_response(mock_geo_response),
+            mock_async_client.create_mock_response({"results": []}),
+            mock_async_client.create_mock_response(mock_weather_response),
+        ]
+    )
+    provider = OpenMeteoProvider(client=mock_async_client)
+
+    results = await provider.get_weather_many(["London", "Atlantis"])
+
+    assert results["London"].city == "London"
+    assert isinstance(results["Atlantis"], CityNotFound)
+    assert mock_async_client.get.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_get_weather_many_chunks_locations(mock_weather_response, mock_async_client):
+    """Test that large groups are split into max_batch_locations per request."""
+    geocode_cache = LRUGeocodeCache()
+    for name in ("A", "B", "C"):
+        await geocode_cache.set_location(name, GeoLocation(name, 1.0, 2.0, "UTC"))
+    mock_async_client.get = AsyncMock(
+        side_effect=[
+            mock_async_client.create_mock_response([mock_weather_response] * 2),
+            mock_async_client.create_mock_response(mock_weather_response),
+        ]
+    )
+    provider = OpenMeteoProvider(
+        client=mock_async_client, geocode_cache=geocode_cache, max_batch_locations=2
+    )
+
+    results = await provider.get_weather_many(["A", "B", "C"])
+
+    assert mock_async_client.get.call_count == 2
+    assert [results[name].city for name in ("A", "B", "C")] == ["A", "B", "C"]
+
+
+@pytest.mark.asyncio
+async def test_get_weather_at_many_single_forecast_request(
+    mock_weather_response, mock_async_client
+):
+    """Test that coordinate lookups are fetched together without geocoding."""
+    mock_async_client.get = AsyncMock(
+        return_value=mock_async_client.create_mock_response([mock_weather_response] * 2)
+    )
+    provider = OpenMeteoProvider(client=mock_async_client)
+    locations = [
+        GeoLocation("London", 51.5074, -0.1278, "Europe/London"),
+        GeoLocation("Paris", 48.8566, 2.3522, "Europe/Paris"),
+    ]
+
+    results = await provider.get_weather_at_many(locations)
+
+    mock_async_client.get.assert_called_once()
+    assert mock_async_client.get.call_args[1]["params"]["latitude"] == "51.5074,48.8566"
+    assert [weather.city for weather in results] == ["London", "Paris"]
+
+
+@pytest.mark.asyncio
+async def test_geocode_and_batch_share_location_lookup(
+    mock_geo_response, mock_weather_response, mock_async_client
+):
+    """Test that a location geocoded by geocode() is reused by get_weather_many."""
+    geocode_cache = LRUGeocodeCache()
+    mock_async_client.get = AsyncMock(
+        side_effect=[
+            mock_async_client.create_mock_response(mock_geo_response),
+            mock_async_client.create_mock_response(mock_weather_response),
+        ]
+    )
+    provider = OpenMeteoProvider(client=mock_async_client, geocode_cache=geocode_cache)
+
+    location = await provider.geocode("London")
+    results = await provider.get_weather_many(["london"])
+
+    assert await geocode_cache.get_location("London") == location
+    assert results["london"].city == location.name
+    assert mock_async_client.get.call_count == 2
@@ -0,0 +1,98 @@
+"""Tests for Redis topology selection and replica/cluster-aware adapters."""
+
+from unittest.mock import AsyncMock
+
+import pytest
+from redis.asyncio.cluster import RedisCluster
+from redis.asyncio.sentinel import SentinelConnectionPool
+
+from core.domain.models import WeatherEntity
+from infra.cache import RedisCacheAdapter
+from infra.geocode_cache import RedisGeocodeCache
+from infra.redis_clients import create_redis_clients
+
+
+def test_standalone_with_read_replica():
+    """Test that a read URL yields a separate reader client."""
+    clients = create_redis_clients(
+        "redis://primary:6379/0", read_url="redis://replica:6379/0", max_connections=5
+    )
+
+    assert clients.primary.connection_pool.connection_kwargs["host"] == "primary"
+    assert clients.reader.connection_pool.connection_kwargs["host"] == "replica"
+    assert clients.reader.connection_pool.max_connections == 5
+    assert not clients.cluster
+
+
+def test_standalone_without_replica_reads_from_primary():
+    """Test that reads fall back to the primary."""
+    clients = create_redis_clients("redis://primary:6379/0")
+    assert clients.reader is clients.primary
+
+
+def test_cluster_mode():
+    """Test that cluster mode builds a cluster client and flags hash tagging."""
+    clients = create_redis_clients("redis://seed:7000", mode="cluster", read_from_replicas=True)
+
+    assert isinstance(clients.primary, RedisCluster)
+    assert clients.reader is clients.primary
+    assert clients.cluster
+
+
+def test_sentinel_mode():
+    """Test that sentinel mode follows the named primary and a replica."""
+    clients = create_redis_clients(
+        "redis://unused",
+        mode="sentinel",
+        sentinels="s1:26379, s2",
+        sentinel_service="weather",
+        read_from_replicas=True,
+    )
+
+    pool = clients.primary.connection_pool
+    assert isinstance(pool, SentinelConnectionPool)
+    assert pool.service_name == "weather"
+    assert pool.is_master
+    assert not clients.reader.connection_pool.is_master
+    sentinel_hosts = [
+        s.connection_pool.connection_kwargs["host"] for s in pool.sentinel_manager.sentinels
+    ]
+    assert sentinel_hosts == ["s1", "s2"]
+
+
+def test_unknown_mode_is_rejected():
+    """Test that a typo in REDIS_MODE fails at startup."""
+    with pytest.raises(ValueError, match="Unknown Redis mode"):
+        create_redis_clients("redis://localhost", mode="clustered")
+
+
+@pytest.mark.asyncio
+async def test_reads_go_to_replica_and_writes_to_primary():
+    """Test that the adapter splits reads and writes between clients."""
+    primary, replica = AsyncMock(), AsyncMock()
+    replica.get.return_value = None
+    cache = RedisCacheAdapter("redis://unused", client=primary, read_client=replica)
+    weather = WeatherEntity(city="London", temperature=15.0, humidity=60.0, forecast=[])
+
+    await cache.get_weather("London")
+    await cache.set_weather("London", weather)
+
+    replica.get.assert_called_once_with("weather:london")
+    primary.get.assert_not_called()
+    primary.set.assert_called_once()
+    replica.set.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_cluster_keys_are_hash_tagged_and_mget_split_by_slot():
+    """Test that cluster mode tags keys by city and avoids cross-slot MGET."""
+    client = AsyncMock()
+    client.mget_nonatomic.return_value = [None, None]
+    cache = RedisCacheAdapter("redis://unused", client=client, cluster=True)
+    geocode = RedisGeocodeCache(client, cluster=True)
+
+    await cache.get_many(["London", "Paris"])
+
+    client.mget_nonatomic.assert_called_once_with(["weather:{london}", "weather:{paris}"])
+    client.mget.assert_not_called()
+    assert geocode._key("London") == "geo:{london}"
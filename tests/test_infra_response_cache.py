@@ -0,0 +1,122 @@
+"""Tests for the serialized response cache."""
+
+import time
+from dataclasses import replace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from core.domain.models import WeatherEntity
+from infra.response_cache import RenderedResponse, ResponseCache
+
+
+def weather(city: str = "London", fetched_at: float | None = 1000.0, **kwargs) -> WeatherEntity:
+    return WeatherEntity(
+        city=city, temperature=10.0, humidity=50.0, forecast=[], fetched_at=fetched_at, **kwargs
+    )
+
+
+def test_body_rendered_once_per_entry():
+    """Test that hits on the same entry version reuse the rendered bytes and ETag."""
+    render = MagicMock(return_value=b"{}")
+    cache = ResponseCache()
+
+    first = cache.get("london", weather(), render)
+    second = cache.get("london", weather(), render)
+
+    assert first.body == b"{}"
+    assert second is first
+    render.assert_called_once()
+
+
+def test_new_version_or_place_is_rendered_again():
+    """Test that a refreshed entry or another place with the same name gets its own body."""
+    render = MagicMock(side_effect=lambda w: f"{w.city}@{w.fetched_at}:{w.humidity}".encode())
+    cache = ResponseCache()
+    illinois = "loc:Springfield:39.799,-89.644"
+    massachusetts = "loc:Springfield:42.101,-72.590"
+
+    first = cache.get(illinois, weather("Springfield"), render)
+    refreshed = cache.get(illinois, weather("Springfield", fetched_at=2000.0), render)
+    other = cache.get(massachusetts, replace(weather("Springfield"), humidity=80.0), render)
+
+    assert first.body == b"Springfield@1000.0:50.0"
+    assert refreshed.body == b"Springfield@2000.0:50.0"
+    assert other.body == b"Springfield@1000.0:80.0"
+    assert other.etag != first.etag
+    assert render.call_count == 3
+
+
+def test_entries_without_fetch_time_are_not_cached():
+    """Test that entities without a fetch time are always rendered."""
+    render = MagicMock(return_value=b"{}")
+    cache = ResponseCache()
+
+    cache.get("london", weather(fetched_at=None), render)
+    cache.get("london", weather(fetched_at=None), render)
+
+    assert render.call_count == 2
+    assert len(cache) == 0
+
+
+def test_size_is_bounded():
+    """Test that the least recently used bodies are evicted, and size 0 stores nothing."""
+    cache = ResponseCache(maxsize=2)
+    disabled = ResponseCache(maxsize=0)
+    for fetched_at in (1.0, 2.0, 3.0):
+        cache.get("london", weather(fetched_at=fetched_at), lambda w: b"{}")
+        disabled.get("london", weather(fetched_at=fetched_at), lambda w: b"{}")
+
+    assert len(cache) == 2
+    assert len(disabled) == 0
+
+
+def test_etag_is_strong_digest_of_body():
+    """Test that equal bodies share an ETag and different bodies do not."""
+    etag = RenderedResponse.from_body(b'{"a":1}').etag
+
+    assert etag.startswith('"') and etag.endswith('"')
+    assert RenderedResponse.from_body(b'{"a":1}').etag == etag
+    assert RenderedResponse.from_body(b'{"a":2}').etag != etag
+
+
+@pytest.mark.parametrize(
+    "header, matches",
+    [
+        (None, False),
+        ('"other"', False),
+        ("{etag}", True),
+        ('"other", {etag}', True),
+        ("W/{etag}", True),
+        ("*", True),
+    ],
+)
+def test_if_none_match(header, matches):
+    """Test that If-None-Match lists, weak tags and the wildcard are recognised."""
+    rendered = RenderedResponse.from_body(b"{}")
+    header = header.format(etag=rendered.etag) if header else header
+
+    assert rendered.matches(header) is matches
+
+
+def test_cache_control_follows_soft_and_hard_ttl():
+    """Test that max-age runs to the soft TTL and stale-while-revalidate to the hard TTL."""
+    cache = ResponseCache(ttl=3600, soft_ttl=1800)
+
+    with patch("infra.response_cache.time.time", return_value=10000.0):
+        fresh = cache.cache_control(weather(fetched_at=9400.0))
+        stale = cache.cache_control(weather(fetched_at=7600.0))
+        hard_only = ResponseCache(ttl=3600).cache_control(weather(fetched_at=10000.0))
+
+    assert fresh == "public, max-age=1200, stale-while-revalidate=1800"
+    assert stale == "public, max-age=0, stale-while-revalidate=1200"
+    assert hard_only == "public, max-age=3600"
+
+
+def test_cache_control_no_cache_for_unknown_or_degraded():
+    """Test that entries of unknown age and degraded entries must be revalidated."""
+    cache = ResponseCache(ttl=3600, soft_ttl=1800)
+
+    assert cache.cache_control(weather(fetched_at=None)) == "no-cache"
+    assert cache.cache_control(weather(fetched_at=time.time(), degraded=True)) == "no-cache"
+    assert ResponseCache().cache_control(weather(fetched_at=time.time())) == "no-cache"
@@ -0,0 +1,125 @@
+"""Tests for cache serialization formats."""
+
+import json
+import struct
+from array import array
+from dataclasses import asdict
+from unittest.mock import AsyncMock
+
+import pytest
+
+from core.domain.models import WeatherEntity
+from infra.cache import RedisCacheAdapter
+from infra.serialization import (
+    STRUCT_V1,
+    STRUCT_V2,
+    JsonSerializer,
+    MsgpackSerializer,
+    StructSerializer,
+    decode_weather,
+    get_serializer,
+)
+
+
+@pytest.fixture
+def sample_weather():
+    """Sample weather entity with a forecast."""
+    return WeatherEntity(
+        city="São Paulo",
+        temperature=20.5,
+        humidity=65.0,
+        forecast=[
+            {"time": "2026-01-09T12:00", "temperature": 21.0},
+            {"time": "2026-01-09T13:00", "temperature": 22.5},
+        ],
+        fetched_at=1767960000.25,
+    )
+
+
+@pytest.mark.parametrize("serializer_cls", [JsonSerializer, StructSerializer, MsgpackSerializer])
+def test_roundtrip(serializer_cls, sample_weather):
+    """Test that every format decodes back to an equal entity."""
+    serializer = serializer_cls()
+    assert serializer.loads(serializer.dumps(sample_weather)) == sample_weather
+
+
+@pytest.mark.parametrize("serializer_cls", [StructSerializer, MsgpackSerializer])
+def test_roundtrip_without_forecast_or_timestamp(serializer_cls):
+    """Test edge cases: empty forecast and unknown fetch time."""
+    weather = WeatherEntity(city="X", temperature=0.0, humidity=0.0, forecast=[])
+    serializer = serializer_cls()
+    assert serializer.loads(serializer.dumps(weather)) == weather
+
+
+def test_binary_formats_are_smaller(sample_weather):
+    """Test that the compact formats beat JSON on size."""
+    json_size = len(JsonSerializer().dumps(sample_weather))
+    assert len(StructSerializer().dumps(sample_weather)) < json_size
+    assert len(MsgpackSerializer().dumps(sample_weather)) < json_size
+
+
+def test_struct_payload_starts_with_version(sample_weather):
+    """Test that binary payloads are tagged with their format version."""
+    assert StructSerializer().dumps(sample_weather)[0] == STRUCT_V2
+
+
+@pytest.mark.parametrize("serializer_cls", [JsonSerializer, StructSerializer, MsgpackSerializer])
+def test_roundtrip_all_forecast_variables(serializer_cls, sample_weather):
+    """Test that every hourly variable survives, including missing (None) values."""
+    sample_weather.forecast = [
+        {"time": "2026-01-09T12:00", "temperature": 21.0, "humidity": 60.0, "wind_speed": None},
+        {"time": "2026-01-09T13:00", "temperature": 22.5, "humidity": 58.0, "wind_speed": 4.0},
+    ]
+    serializer = serializer_cls()
+    assert serializer.loads(serializer.dumps(sample_weather)) == sample_weather
+
+
+def test_struct_v1_entries_still_readable(sample_weather):
+    """Test that entries written in the temperature-only struct layout are decoded."""
+    city = sample_weather.city.encode()
+    legacy = b"".join(
+        (
+            struct.pack(
+                "<BdddHH",
+                STRUCT_V1,
+                sample_weather.temperature,
+                sample_weather.humidity,
+                sample_weather.fetched_at,
+                len(city),
+                2,
+            ),
+            city,
+            array("d", [21.0, 22.5]).tobytes(),
+            b"2026-01-09T12:00\n2026-01-09T13:00",
+        )
+    )
+    assert decode_weather(legacy) == sample_weather
+
+
+def test_legacy_json_entries_still_readable(sample_weather):
+    """Test that entries written before the rollout (JSON str) are decoded."""
+    legacy = json.dumps(asdict(sample_weather))
+    assert decode_weather(legacy) == sample_weather
+    assert StructSerializer().loads(legacy.encode()) == sample_weather
+
+
+def test_unknown_serializer_rejected():
+    """Test that a misconfigured serializer name fails fast."""
+    with pytest.raises(ValueError):
+        get_serializer("xml")
+
+
+@pytest.mark.asyncio
+async def test_cache_adapter_uses_configured_serializer(sample_weather):
+    """Test that the Redis adapter writes with its serializer and reads it back."""
+    mock_redis = AsyncMock()
+    cache = RedisCacheAdapter(
+        "redis://localhost:6379/0", client=mock_redis, serializer=StructSerializer()
+    )
+
+    await cache.set_weather("Sao Paulo", sample_weather)
+    stored = mock_redis.set.call_args[0][1]
+    assert stored[0] == STRUCT_V2
+
+    mock_redis.get.return_value = stored
+    assert await cache.get_weather("Sao Paulo") == sample_weather
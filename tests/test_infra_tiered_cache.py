@@ -0,0 +1,136 @@
+"""Tests for the in-process L1 cache tier."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from core.domain.models import WeatherEntity
+from infra.cache import TieredCacheAdapter
+from infra.metrics import CACHE_EVICTIONS
+
+
+@pytest.fixture
+def sample_weather():
+    """Sample weather entity for testing."""
+    return WeatherEntity(city="London", temperature=15.5, humidity=65.0, forecast=[])
+
+
+@pytest.fixture
+def backend():
+    """Mock L2 cache."""
+    backend = AsyncMock()
+    backend.get_weather.return_value = None
+    return backend
+
+
+@pytest.mark.asyncio
+async def test_l1_hit_skips_backend(backend, sample_weather):
+    """Test that a warmed L1 entry is served without touching L2."""
+    backend.get_weather.return_value = sample_weather
+    cache = TieredCacheAdapter(backend)
+
+    assert await cache.get_weather("London") == sample_weather
+    assert await cache.get_weather("LONDON") == sample_weather
+
+    backend.get_weather.assert_called_once_with("London")
+
+
+@pytest.mark.asyncio
+async def test_l1_miss_falls_through(backend):
+    """Test that a miss in both tiers returns None and caches nothing."""
+    cache = TieredCacheAdapter(backend)
+
+    assert await cache.get_weather("Nowhere") is None
+    assert len(cache.l1) == 0
+
+
+@pytest.mark.asyncio
+async def test_set_writes_both_tiers(backend, sample_weather):
+    """Test that writes populate L1 and are passed through to L2."""
+    cache = TieredCacheAdapter(backend)
+
+    await cache.set_weather("London", sample_weather)
+
+    backend.set_weather.assert_called_once_with("London", sample_weather)
+    assert await cache.get_weather("london") == sample_weather
+    backend.get_weather.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_l1_size_and_ttl_eviction(backend, sample_weather):
+    """Test that L1 is bounded in size and entries expire."""
+    evictions = CACHE_EVICTIONS.labels(tier="l1")
+    before = evictions._value.get()
+    cache = TieredCacheAdapter(backend, maxsize=1, ttl=10)
+
+    with patch("infra.lru.time.monotonic", return_value=100.0):
+        await cache.set_weather("London", sample_weather)
+        await cache.set_weather("Paris", sample_weather)
+    assert "london" not in cache.l1
+
+    with patch("infra.lru.time.monotonic", return_value=111.0):
+        await cache.get_weather("Paris")
+    backend.get_weather.assert_called_once_with("Paris")
+    assert evictions._value.get() == before + 2
+
+
+@pytest.mark.asyncio
+async def test_set_publishes_invalidation(backend, sample_weather):
+    """Test that writes are announced to other replicas."""
+    redis_client = AsyncMock()
+    cache = TieredCacheAdapter(backend, redis_client=redis_client)
+
+    await cache.set_weather("London", sample_weather)
+
+    redis_client.publish.assert_called_once_with(
+        "weather:invalidate", f"{cache.instance_id}:london"
+    )
+
+
+@pytest.mark.asyncio
+async def test_invalidation_from_other_replica_evicts(backend, sample_weather):
+    """Test that only invalidations from other instances drop L1 entries."""
+    cache = TieredCacheAdapter(backend, redis_client=AsyncMock())
+    await cache.set_weather("London", sample_weather)
+
+    cache._handle_invalidation(f"{cache.instance_id}:london")
+    assert "london" in cache.l1
+
+    cache._handle_invalidation(b"other-replica:london")
+    assert "london" not in cache.l1
+
+
+@pytest.mark.asyncio
+async def test_get_many_only_forwards_l1_misses(backend, sample_weather):
+    """Test that bulk reads serve L1 hits locally and batch the rest."""
+    paris = WeatherEntity(city="Paris", temperature=12.0, humidity=60.0, forecast=[])
+    backend.get_many.return_value = {"Paris": paris}
+    cache = TieredCacheAdapter(backend)
+    await cache.set_weather("London", sample_weather)
+
+    result = await cache.get_many(["London", "Paris"])
+
+    assert result == {"London": sample_weather, "Paris": paris}
+    backend.get_many.assert_called_once_with(["Paris"])
+    assert "paris" in cache.l1
+
+
+@pytest.mark.asyncio
+async def test_bulk_invalidation_is_one_message(backend, sample_weather):
+    """Test that a batch of writes or deletes is announced in a single publish."""
+    redis_client = AsyncMock()
+    cache = TieredCacheAdapter(backend, redis_client=redis_client)
+    await cache.set_many({"London": sample_weather, "Paris": sample_weather})
+
+    redis_client.publish.assert_called_once_with(
+        "weather:invalidate", f"{cache.instance_id}:london\nparis"
+    )
+
+    other = TieredCacheAdapter(backend)
+    await other.set_many({"London": sample_weather, "Paris": sample_weather})
+    other._handle_invalidation(redis_client.publish.call_args[0][1])
+    assert "london" not in other.l1 and "paris" not in other.l1
+
+    await cache.delete_many(["London"])
+    assert "london" not in cache.l1
+    backend.delete_many.assert_called_once_with(["London"])
@@ -0,0 +1,109 @@
+"""Tests for the hot-city cache warmer."""
+
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from core.domain.models import WeatherEntity
+from infra.warmer import CacheWarmer
+
+
+def weather(age):
+    """Weather entity fetched `age` seconds ago."""
+    return WeatherEntity(
+        city="x", temperature=1.0, humidity=1.0, forecast=[], fetched_at=time.time() - age
+    )
+
+
+@pytest.fixture
+def service():
+    """Mock WeatherService with nothing cached by default."""
+    service = AsyncMock()
+    service.peek_many.side_effect = lambda names: dict.fromkeys(names)
+    return service
+
+
+@pytest.mark.asyncio
+async def test_refreshes_top_cities_only(service):
+    """Test that only the top-N requested cities are refreshed."""
+    warmer = CacheWarmer(service, top_n=2, max_refresh_rate=1000)
+    for city, hits in (("London", 5), ("Paris", 3), ("Oslo", 1)):
+        for _ in range(hits):
+            warmer.record(city)
+
+    refreshed = await warmer.warm_once()
+
+    assert refreshed == 2
+    assert [c[0][0] for c in service.refresh.call_args_list] == ["london", "paris"]
+
+
+@pytest.mark.asyncio
+async def test_skips_entries_that_are_still_fresh(service):
+    """Test that hot entries are refreshed only once they are close to expiry."""
+    service.peek_many.side_effect = lambda names: {"london": weather(10), "paris": weather(1000)}
+    warmer = CacheWarmer(service, refresh_after=500, max_refresh_rate=1000)
+    warmer.record("London")
+    warmer.record("Paris")
+
+    await warmer.warm_once()
+
+    service.refresh.assert_called_once_with("paris")
+
+
+@pytest.mark.asyncio
+async def test_scores_decay_between_cycles(service):
+    """Test that popularity follows recent traffic."""
+    warmer = CacheWarmer(service, top_n=1, decay=0.1, max_refresh_rate=1000)
+    for _ in range(5):
+        warmer.record("London")
+    await warmer.warm_once()
+
+    warmer.record("Paris")
+    warmer.record("Paris")
+    await warmer.warm_once()
+
+    assert service.refresh.call_args_list[-1][0][0] == "paris"
+
+
+@pytest.mark.asyncio
+async def test_refresh_rate_is_bounded(service):
+    """Test that refreshes are spaced according to max_refresh_rate."""
+    warmer = CacheWarmer(service, max_refresh_rate=4)
+    warmer.record("London")
+    warmer.record("Paris")
+
+    with patch("infra.warmer.asyncio.sleep", new=AsyncMock()) as sleep:
+        await warmer.warm_once()
+
+    assert [c[0][0] for c in sleep.call_args_list] == [0.25, 0.25]
+
+
+@pytest.mark.asyncio
+async def test_popularity_shared_through_redis(service):
+    """Test that counts are merged into the shared sorted set in one pipeline."""
+    pipe = MagicMock()
+    pipe.__aenter__ = AsyncMock(return_value=pipe)
+    pipe.__aexit__ = AsyncMock(return_value=None)
+    pipe.execute = AsyncMock(return_value=[1, 3.0, 0, [b"london"]])
+    redis_client = MagicMock()
+    redis_client.pipeline.return_value = pipe
+    warmer = CacheWarmer(service, redis_client=redis_client, max_refresh_rate=1000)
+    warmer.record("London")
+
+    await warmer.warm_once()
+
+    pipe.zunionstore.assert_called_once_with("weather:popularity", {"weather:popularity": 0.9})
+    pipe.zincrby.assert_called_once_with("weather:popularity", 1, "london")
+    service.refresh.assert_called_once_with("london")
+
+
+@pytest.mark.asyncio
+async def test_refresh_failures_do_not_stop_the_cycle(service):
+    """Test that one failed refresh does not prevent the others."""
+    service.refresh.side_effect = [Exception("upstream down"), None]
+    warmer = CacheWarmer(service, max_refresh_rate=1000)
+    warmer.record("London")
+    warmer.record("Paris")
+
+    assert await warmer.warm_once() == 1
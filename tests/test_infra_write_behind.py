@@ -0,0 +1,165 @@
+"""Tests for the write-behind cache decorator."""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from core.domain.models import WeatherEntity
+from infra.cache import RedisCacheAdapter
+from infra.metrics import CACHE_WRITE_QUEUE_DEPTH, CACHE_WRITES_DROPPED
+from infra.write_behind import WriteBehindCache
+
+
+def weather(city: str, temperature: float = 10.0) -> WeatherEntity:
+    return WeatherEntity(city=city, temperature=temperature, humidity=50.0, forecast=[])
+
+
+@pytest.fixture
+def backend():
+    backend = AsyncMock()
+    backend.get_weather.return_value = None
+    backend.get_many.side_effect = lambda names: dict.fromkeys(names)
+    return backend
+
+
+@pytest.mark.asyncio
+async def test_set_returns_before_backend_write(backend):
+    """Test that a write is queued and only reaches the backend in the background."""
+    release = asyncio.Event()
+
+    async def slow_write(*_):
+        await release.wait()
+
+    backend.set_weather.side_effect = slow_write
+    cache = WriteBehindCache(backend)
+
+    await asyncio.wait_for(cache.set_weather("London", weather("London")), timeout=0.1)
+    release.set()
+    await cache.flush()
+
+    backend.set_weather.assert_awaited_once_with("London", weather("London"))
+
+
+@pytest.mark.asyncio
+async def test_pending_writes_are_readable(backend):
+    """Test that reads see queued writes before they are written."""
+    cache = WriteBehindCache(backend)
+    await cache.set_weather("London", weather("London"))
+
+    assert await cache.get_weather(" LONDON ") == weather("London")
+    assert await cache.get_many(["london", "Paris"]) == {
+        "london": weather("London"),
+        "Paris": None,
+    }
+    backend.get_weather.assert_not_called()
+    backend.get_many.assert_awaited_once_with(["Paris"])
+    await cache.flush()
+
+
+@pytest.mark.asyncio
+async def test_writes_collapse_and_batch(backend):
+    """Test that rewrites of a key keep the newest value and queued keys go out in bulk."""
+    cache = WriteBehindCache(backend, batch_size=2)
+    await cache.set_weather("London", weather("London", 1.0))
+    await cache.set_many({"london": weather("London", 2.0), "Paris": weather("Paris")})
+    await cache.set_weather("Rome", weather("Rome"))
+
+    await cache.flush()
+
+    backend.set_many.assert_awaited_once_with(
+        {"london": weather("London", 2.0), "Paris": weather("Paris")}
+    )
+    backend.set_weather.assert_awaited_once_with("Rome", weather("Rome"))
+    assert CACHE_WRITE_QUEUE_DEPTH.labels(tier="redis")._value.get() == 0
+
+
+@pytest.mark.asyncio
+async def test_full_queue_drops_new_keys(backend):
+    """Test that writes beyond max_pending are dropped and counted."""
+    dropped = CACHE_WRITES_DROPPED.labels(tier="test", reason="queue_full")
+    before = dropped._value.get()
+    cache = WriteBehindCache(backend, max_pending=1, tier="test")
+
+    await cache.set_weather("London", weather("London"))
+    await cache.set_weather("Paris", weather("Paris"))
+    await cache.set_weather("London", weather("London", 5.0))  # queued key: replaced
+    await cache.flush()
+
+    assert dropped._value.get() == before + 1
+    backend.set_weather.assert_awaited_once_with("London", weather("London", 5.0))
+
+
+@pytest.mark.asyncio
+async def test_backend_errors_are_counted(backend):
+    """Test that a failed write is dropped without stopping the worker."""
+    failed = CACHE_WRITES_DROPPED.labels(tier="redis", reason="error")
+    before = failed._value.get()
+    backend.set_weather.side_effect = [ConnectionError("down"), None]
+    cache = WriteBehindCache(backend)
+
+    await cache.set_weather("London", weather("London"))
+    await cache.flush()
+    await cache.set_weather("Paris", weather("Paris"))
+    await cache.flush()
+
+    assert failed._value.get() == before + 1
+    assert backend.set_weather.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_redis_write_errors_are_counted():
+    """Test that failed writes to a Redis adapter are counted as dropped."""
+    failed = CACHE_WRITES_DROPPED.labels(tier="redis", reason="error")
+    before = failed._value.get()
+    redis_client = AsyncMock()
+    redis_client.set.side_effect = ConnectionError("down")
+    backend = RedisCacheAdapter("redis://unused", client=redis_client, raise_write_errors=True)
+    cache = WriteBehindCache(backend)
+
+    await cache.set_weather("London", weather("London"))
+    await cache.flush()
+
+    redis_client.set.assert_awaited_once()
+    assert failed._value.get() == before + 1
+
+
+@pytest.mark.asyncio
+async def test_flush_timeout_gives_up(backend):
+    """Test that a flush that takes too long drops what is left."""
+
+    async def stuck_write(*_):
+        await asyncio.sleep(10)
+
+    backend.set_weather.side_effect = stuck_write
+    cache = WriteBehindCache(backend)
+    await cache.set_weather("London", weather("London"))
+
+    await cache.flush(timeout=0.01)
+
+    assert await cache.get_weather("London") is None
+
+
+@pytest.mark.asyncio
+async def test_close_flushes_then_closes_backend(backend):
+    """Test that close writes queued entries before closing the backend."""
+    cache = WriteBehindCache(backend)
+    await cache.set_weather("London", weather("London"))
+
+    await cache.close()
+
+    backend.set_weather.assert_awaited_once()
+    backend.close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_delete_drops_pending_write(backend):
+    """Test that deleting a key also discards its queued write."""
+    cache = WriteBehindCache(backend)
+    await cache.set_weather("London", weather("London"))
+
+    await cache.delete_many(["london"])
+    await cache.flush()
+
+    backend.set_weather.assert_not_called()
+    backend.delete_many.assert_awaited_once_with(["london"])
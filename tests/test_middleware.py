@@ -4,10 +4,11 @@ import json
 from unittest.mock import patch
 
 import pytest
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
 from fastapi.testclient import TestClient
 
-from api.middleware import RequestLoggingMiddleware, TraceIdMiddleware
+from api.middleware import RequestContextMiddleware, RequestLoggingMiddleware, TraceIdMiddleware
+from infra.request_context import request_id_ctx_var
 
 
 @pytest.fixture
@@ -125,3 +126,62 @@ def test_middleware_integration(client):
 
     assert response.status_code == 200
     assert response.headers["X-Request-ID"] == custom_id
+
+
+@pytest.fixture
+def merged_client():
+    """Test client for an app using the single-pass middleware."""
+    app = FastAPI()
+    app.add_middleware(RequestContextMiddleware)
+
+    @app.get("/test")
+    async def test_endpoint(request: Request):
+        return {"state_id": request.state.request_id, "ctx_id": request_id_ctx_var.get()}
+
+    return TestClient(app)
+
+
+@patch("api.middleware.logger")
+def test_request_context_middleware_single_pass(mock_logger, merged_client):
+    """Test that the merged middleware sets the ID everywhere and logs once."""
+    custom_id = "merged-test-id"
+    response = merged_client.get("/test", headers={"X-Request-ID": custom_id})
+
+    assert response.status_code == 200
+    assert response.headers["X-Request-ID"] == custom_id
+    assert response.json() == {"state_id": custom_id, "ctx_id": custom_id}
+
+    mock_logger.info.assert_called_once()
+    log_data = json.loads(mock_logger.info.call_args[0][0])
+    assert log_data["request_id"] == custom_id
+    assert log_data["status_code"] == 200
+
+
+def test_request_context_is_reset_after_request(merged_client):
+    """Test that the ContextVar does not leak past the request."""
+    merged_client.get("/test", headers={"X-Request-ID": "leak-check"})
+    assert request_id_ctx_var.get() is None
+
+
+@pytest.mark.parametrize(
+    ("path", "slow_request_ms", "sampled"),
+    [("/test", 1000.0, True), ("/test", 0.0, False), ("/server-error", 1000.0, False)],
+)
+@patch("api.middleware.logger")
+def test_only_fast_successful_requests_are_sampled(mock_logger, path, slow_request_ms, sampled):
+    """Test that slow and 5xx requests are never tagged for sampling."""
+    app = FastAPI()
+    app.add_middleware(RequestContextMiddleware, slow_request_ms=slow_request_ms)
+
+    @app.get("/test")
+    async def test_endpoint():
+        return {"status": "ok"}
+
+    @app.get("/server-error")
+    async def server_error_endpoint():
+        return Response(status_code=503)
+
+    TestClient(app).get(path)
+
+    extra = mock_logger.info.call_args.kwargs["extra"]
+    assert (extra == {"sample_key": "request"}) is sampled